@@ -9,6 +9,7 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 utils.apply_theme()
+utils.start_background_refresh()
 
 
 def require_login():
@@ -116,6 +117,9 @@ if not utils.check_login():
     st.stop()
 
 # ----------- Logged-in home -----------
+utils.perf_start_run("Ana Sayfa")
+utils.profile_controls("Ana Sayfa")
+
 st.sidebar.markdown("### 📌 Menü")
 st.sidebar.caption("Sayfalar için sol menüyü kullanın.")
 st.sidebar.markdown("---")
@@ -132,8 +136,10 @@ st.markdown(
 
 # Özet metrikler
 try:
-    df = utils.get_all_forecasts(limit=20000)
-    df_k = utils.get_participants()
+    loaded = utils.load_page_data(tahmin=True, katilimci=True)
+    if loaded["hata"]:
+        raise RuntimeError("; ".join(loaded["hata"].values()))
+    df, df_k = loaded["veri"]["tahmin"], loaded["veri"]["katilimci"]
 
     c1, c2, c3, c4 = st.columns(4)
     c1.metric("Toplam Tahmin", f"{len(df):,}")
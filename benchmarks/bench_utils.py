@@ -0,0 +1,357 @@
+"""
+bench_utils.py — utils.py veri fonksiyonları için mikro-benchmark.
+
+Her fonksiyon 10k / 100k / 1M satırlık sentetik tablolarda çalıştırılır;
+EVDS ve BIS yanıtları `benchmarks/fixtures/` altındaki dosyalardan gelir
+(ağ ve secrets gerekmez). Süre (en iyi / medyan) ve tracemalloc tepe
+belleği JSON olarak yazılır; iki çalıştırma `--compare` ile kıyaslanır.
+
+    python benchmarks/bench_utils.py                       # tüm boyutlar
+    python benchmarks/bench_utils.py --sizes 10000 --only latest
+    python benchmarks/bench_utils.py --out once.json
+    python benchmarks/bench_utils.py --out sonra.json --compare once.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import types
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+sys.path.insert(0, ROOT)
+
+import streamlit as st  # noqa: E402
+
+# Streamlit runtime dışında cache uyarıları her çağrıda loglanır
+for _name in list(logging.root.manager.loggerDict):
+    if _name.startswith("streamlit"):
+        logging.getLogger(_name).setLevel(logging.ERROR)
+
+import utils  # noqa: E402
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+# ---------------------------------------------------------------------------
+# Fixture'lar — EVDS istemcisi ve BIS HTTP yanıtı
+# ---------------------------------------------------------------------------
+def _evds_fixture(series_code: str) -> pd.DataFrame:
+    path = os.path.join(FIXTURES, f"evds_{series_code}.json")
+    with open(path, encoding="utf-8") as fh:
+        return pd.DataFrame(json.load(fh))
+
+
+def _bis_fixture() -> bytes:
+    with open(os.path.join(FIXTURES, "bis_WS_CBPOL_D.TR.csv"), "rb") as fh:
+        return fh.read()
+
+
+def _tile(df: pd.DataFrame, n: int) -> pd.DataFrame:
+    """Fixture satırlarını n satıra kadar tekrarlar (n küçükse olduğu gibi)."""
+    if len(df) >= n:
+        return df
+    reps = -(-n // len(df))
+    return pd.concat([df] * reps, ignore_index=True).iloc[:n]
+
+
+class _FixtureEvds:
+    """evds.evdsAPI yerine: seri kodu → fixture DataFrame (n satıra çoğaltılmış)."""
+
+    def __init__(self, n: int):
+        self.n = n
+
+    def get_data(self, series, startdate=None, enddate=None, frequency=None):
+        return _tile(_evds_fixture(series[0]), self.n).copy()
+
+
+class _FixtureResponse:
+    status_code = 200
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+
+def _install_market_fixtures(n: int) -> None:
+    """fetch_market_data_adapter'ın dış bağımlılıklarını fixture'lara yönlendirir."""
+    evds_mod = types.ModuleType("evds")
+    evds_mod.evdsAPI = lambda key: _FixtureEvds(n)
+    sys.modules["evds"] = evds_mod
+
+    bis = pd.read_csv(pd.io.common.BytesIO(_bis_fixture()))
+    content = _tile(bis, n).to_csv(index=False).encode("utf-8")
+    utils.http_get = lambda url, **kwargs: _FixtureResponse(content)
+    utils.get_evds_key = lambda: "fixture"
+    # İstemci anahtar başına cache'lenir; yeni fixture boyutu yeni istemci ister
+    utils._evds_client.clear()
+
+
+def _raw(fn):
+    """st.cache_data sarmalayıcısını atlayıp asıl fonksiyonu döner."""
+    return getattr(fn, "__wrapped__", fn)
+
+
+# ---------------------------------------------------------------------------
+# Sentetik tablolar
+# ---------------------------------------------------------------------------
+_FRAMES: dict = {}
+
+
+def forecasts_raw(n: int) -> pd.DataFrame:
+    """Supabase'den gelen biçimde n satır: tarihler metin, sayılar float."""
+    if n not in _FRAMES:
+        rows_per_participant = 130  # 24 ay, varsayılan ufuklar ≈ 130 satır/katılımcı
+        df = utils.synthetic_forecasts(
+            n_participants=max(16, -(-n // rows_per_participant) + 1),
+            n_months=24, seed=7, end_month="2025-12",
+        ).iloc[:n]
+        df = df.assign(
+            tahmin_tarihi=df["tahmin_tarihi"].dt.strftime("%Y-%m-%d"),
+            created_at=(df["tahmin_tarihi"] + pd.Timedelta(hours=9)).dt.strftime(
+                "%Y-%m-%dT%H:%M:%S+00:00"
+            ),
+        )
+        _FRAMES[n] = df.reset_index(drop=True)
+    return _FRAMES[n].copy()
+
+
+def forecasts_clean(n: int) -> pd.DataFrame:
+    return utils.clean_numeric_and_dates(forecasts_raw(n))
+
+
+def _use_forecasts(n: int) -> int:
+    """Dashboard zincirini bu boyuta bağlar; veri sürümü olarak n kullanılır."""
+    df = forecasts_clean(n)
+    utils.get_all_forecasts = lambda limit=20000: df
+    st.cache_data.clear()
+    utils.frame_cache_clear()
+    return n
+
+
+# ---------------------------------------------------------------------------
+# Durumlar: ad → (hazırlık(n) → argümanlar, ölçülen fonksiyon)
+# Hazırlık süresi ölçüme dahil değildir.
+# ---------------------------------------------------------------------------
+def _setup_strip(n):
+    cols = ["kategori", *utils.TAHMIN_SAYISAL_KOLONLARI]
+    records = utils._to_payloads(
+        forecasts_clean(n)[cols + ["tahmin_tarihi"]]
+    )
+    return (records,)
+
+
+def _run_strip(records):
+    strip = utils._strip_minmax_if_not_allowed
+    return [strip(r["kategori"], r) for r in records]
+
+
+def _setup_csv(n):
+    """PostgREST `.csv()` yanıtı biçiminde metin (NULL = boş alan)."""
+    return (forecasts_raw(n).to_csv(index=False),)
+
+
+def _setup_evds(n):
+    _install_market_fixtures(n)
+    return (_FixtureEvds(n), utils.EVDS_TUFE_OLD, "01-01-2003", "01-12-2025")
+
+
+def _setup_market(n):
+    _install_market_fixtures(n)
+    return (pd.Timestamp("2022-01-01").date(), pd.Timestamp("2026-09-30").date())
+
+
+def _setup_view(n):
+    v = _use_forecasts(n)
+    utils.get_forecasts_view(v)  # taban tablo cache'te; yalnızca hedef adım ölçülür
+    return (v,)
+
+
+def _setup_heatmap(n):
+    v = _use_forecasts(n)
+    utils.get_latest_view(v, None)
+    return (v, None, "tahmin_ppk_faiz", tuple(utils.KATEGORILER))
+
+
+def _setup_consensus(n):
+    v = _use_forecasts(n)
+    utils.get_forecasts_view(v)
+    _install_market_fixtures(0)
+    span = (pd.Timestamp("2022-01-01").date(), pd.Timestamp("2026-09-30").date())
+    utils.fetch_market_data_adapter(*span)
+    return (v, utils.market_data_key(*span), "tahmin_ppk_faiz")
+
+
+def _run_median_iqr(df):
+    """Dashboard zaman serisi: hedef dönem bazında medyan + IQR."""
+    grp = df.groupby("hedef_donemi")["tahmin_ppk_faiz"]
+    return pd.DataFrame({
+        "median": grp.median(),
+        "q1": grp.quantile(0.25),
+        "q3": grp.quantile(0.75),
+    })
+
+
+def _build_figure(df):
+    """Dashboard zaman serisine benzer: IQR bandı, medyan ve tahmin noktaları."""
+    stats = _run_median_iqr(df)
+    x = stats.index.tolist()
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x, y=stats["q3"], line=dict(width=0), showlegend=False))
+    fig.add_trace(go.Scatter(x=x, y=stats["q1"], fill="tonexty", line=dict(width=0), name="IQR"))
+    fig.add_trace(go.Scatter(x=x, y=stats["median"], mode="lines+markers", name="Medyan"))
+    fig.add_trace(go.Scatter(
+        x=df["hedef_donemi"], y=df["tahmin_ppk_faiz"], mode="markers", opacity=0.3, name="Tahmin",
+    ))
+    fig.update_layout(height=420, template="plotly_white")
+    return fig
+
+
+def _chart_spec(figure_or_dict) -> str:
+    """st.plotly_chart'ın her çizimde yaptığı iş: doğrulama + JSON."""
+    import plotly.io
+    import plotly.tools
+
+    figure = plotly.tools.return_figure_from_figure_or_data(figure_or_dict, validate_figure=True)
+    return plotly.io.to_json(figure, validate=False)
+
+
+CASES = {
+    "clean_numeric_and_dates": (lambda n: (forecasts_raw(n),), utils.clean_numeric_and_dates),
+    "read_forecasts_csv": (_setup_csv, utils.read_forecasts_csv),
+    "get_latest_per_user_period": (lambda n: (forecasts_clean(n),), utils.get_latest_per_user_period),
+    "get_latest_as_of": (lambda n: (forecasts_clean(n), "2025-06"), utils.get_latest_as_of),
+    "_strip_minmax_if_not_allowed": (_setup_strip, _run_strip),
+    "_evds_to_pct": (_setup_evds, utils._evds_to_pct),
+    "fetch_market_data_adapter": (_setup_market, _raw(utils.fetch_market_data_adapter)),
+    "get_forecasts_view": (lambda n: (_use_forecasts(n),), _raw(utils.get_forecasts_view)),
+    "get_latest_view": (_setup_view, _raw(utils.get_latest_view)),
+    "get_forecast_meta": (_setup_view, _raw(utils.get_forecast_meta)),
+    "build_heatmap_matrix": (_setup_heatmap, _raw(utils.build_heatmap_matrix)),
+    "median_iqr": (lambda n: (forecasts_clean(n),), _run_median_iqr),
+    "compute_revision_analytics": (_setup_view, _raw(utils.compute_revision_analytics)),
+    "compute_consensus": (_setup_consensus, _raw(utils.compute_consensus)),
+    # plotly_chart_cached: ıskalama / eski sözlük cache'i isabeti / figür cache'i isabeti
+    "figur_kur": (lambda n: (forecasts_clean(n),), lambda df: _chart_spec(_build_figure(df))),
+    "figur_isabet_sozluk": (lambda n: (_build_figure(forecasts_clean(n)).to_plotly_json(),), _chart_spec),
+    "figur_isabet": (lambda n: (_build_figure(forecasts_clean(n)),), _chart_spec),
+}
+
+
+# ---------------------------------------------------------------------------
+# Ölçüm
+# ---------------------------------------------------------------------------
+def measure(name: str, n: int, repeat: int) -> dict:
+    setup, fn = CASES[name]
+    times = []
+    for _ in range(repeat):
+        args = setup(n)
+        gc.collect()
+        t0 = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - t0)
+
+    # Bellek ayrı turda: tracemalloc süreyi bozar
+    args = setup(n)
+    gc.collect()
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "case": name,
+        "n": n,
+        "repeat": repeat,
+        "best_s": round(min(times), 6),
+        "median_s": round(statistics.median(times), 6),
+        "peak_mb": round(peak / 2**20, 3),
+    }
+
+
+def _meta() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "tarih": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def compare(current: list, baseline_path: str) -> None:
+    """Aynı (durum, n) için süre ve bellek oranlarını yazdırır (<1 = iyileşme)."""
+    with open(baseline_path, encoding="utf-8") as fh:
+        base = {(r["case"], r["n"]): r for r in json.load(fh)["results"]}
+    print(f"\n{'durum':34} {'n':>9} {'süre (önce→sonra)':>26} {'oran':>6} {'bellek oranı':>13}")
+    for r in current:
+        b = base.get((r["case"], r["n"]))
+        if b is None:
+            continue
+        t_ratio = r["median_s"] / b["median_s"] if b["median_s"] else float("nan")
+        m_ratio = r["peak_mb"] / b["peak_mb"] if b["peak_mb"] else float("nan")
+        print(
+            f"{r['case']:34} {r['n']:>9,} "
+            f"{b['median_s']:>11.4f}s → {r['median_s']:>9.4f}s {t_ratio:>6.2f} {m_ratio:>13.2f}"
+        )
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    ap.add_argument("--only", nargs="+", default=None,
+                    help="Yalnızca adı bu parçaları içeren durumlar")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", default=os.path.join(ROOT, "benchmarks", "results.json"))
+    ap.add_argument("--compare", default=None, help="Kıyaslanacak önceki JSON")
+    args = ap.parse_args(argv)
+
+    names = [
+        c for c in CASES
+        if not args.only or any(part in c for part in args.only)
+    ]
+    results = []
+    for n in args.sizes:
+        for name in names:
+            r = measure(name, n, args.repeat)
+            results.append(r)
+            print(
+                f"{name:34} n={n:>9,}  median {r['median_s']:.4f}s  "
+                f"best {r['best_s']:.4f}s  peak {r['peak_mb']:.1f} MB",
+                flush=True,
+            )
+        _FRAMES.pop(n, None)
+
+    with open(args.out, "w", encoding="utf-8") as fh:
+        json.dump({"meta": _meta(), "results": results}, fh, indent=2, ensure_ascii=False)
+    print(f"\n→ {args.out}")
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
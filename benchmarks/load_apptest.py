@@ -0,0 +1,558 @@
+"""
+load_apptest.py — sayfa yeniden çalıştırma (rerun) yük testi.
+
+Streamlit `AppTest` ile giriş yapılmış oturumlar açar ve widget
+etkileşimlerini (görünüm, metrik, hedef dönem, kategori/katılımcı filtresi,
+sayfalama, tarih aralığı) eşzamanlı oturumlarda sürer. Gerçek sunucudaki gibi
+tüm oturumlar tek süreçte, ayrı thread'lerde çalışır: `st.cache_*`, paylaşılan
+çerçeve cache'i ve Supabase taklidi ortaktır. Her oturum kendi tohumuyla farklı
+seçimler yapar, böylece rerun'lar cache'i gerçekten ıskalar. Supabase yerine
+bellekte çalışan bir PostgREST taklidi, EVDS/BIS yerine `benchmarks/fixtures/`
+kullanılır; ağ ve secrets gerekmez.
+
+Her faz soğuk cache ile başlar. Rapor (faz × sayfa × veri boyutu): ilk yükleme
+dahil tüm rerun'ların gecikmesi p50/p95/p99, rerun başına Supabase
+gidiş-dönüşü ve dönen satır, faz sonu süreç RSS'i. Sayfa başına fazlardan
+sonra tüm sayfalar aynı anda "karma" fazda koşar. JSON olarak da yazılır.
+
+    python benchmarks/load_apptest.py --sessions 20
+    python benchmarks/load_apptest.py --rows 5000 50000 200000 --sessions 10
+    python benchmarks/load_apptest.py --pages Dashboard --out yuk.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+# Anlık görüntüler ve sürüm dosyası bu koşuya özel dizinde; utils import
+# edilmeden önce ayarlanmalı
+_SNAP_DIR = tempfile.mkdtemp(prefix="yuk_testi_")
+os.environ["TAHMIN_SNAPSHOT_DIR"] = _SNAP_DIR
+
+# Fixture'lar, sentetik veri ve log susturma bench_utils'ten
+from bench_utils import _install_market_fixtures, _meta, forecasts_raw  # noqa: E402
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+import streamlit as st  # noqa: E402
+
+import utils  # noqa: E402
+
+DEFAULT_ROWS = [20_000]
+
+
+# ---------------------------------------------------------------------------
+# Supabase taklidi — utils'in kullandığı PostgREST alt kümesi
+# ---------------------------------------------------------------------------
+class _Response:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class _Query:
+    def __init__(self, db: "FakeSupabase", table: str):
+        self.db, self.table = db, table
+        self.op, self.payload = "select", None
+        self.columns, self.count, self.head = None, None, False
+        self.filters, self.orders = [], []
+        self.lo, self.hi = 0, None
+        self._negate = False
+        self.fmt = "json"
+
+    # --- işlemler ---
+    def select(self, columns: str = "*", count=None, head=False):
+        self.op, self.count, self.head = "select", count, head
+        if columns.strip() != "*":
+            self.columns = [c.strip() for c in columns.split(",")]
+        return self
+
+    def insert(self, payload, **kwargs):
+        self.op, self.payload = "insert", payload
+        return self
+
+    def upsert(self, payload, **kwargs):
+        self.op, self.payload = "insert", payload
+        return self
+
+    def update(self, payload, **kwargs):
+        self.op, self.payload = "update", payload
+        return self
+
+    def delete(self, count=None, **kwargs):
+        self.op, self.count = "delete", count
+        return self
+
+    # --- filtreler ---
+    @property
+    def not_(self):
+        self._negate = True
+        return self
+
+    def _filter(self, fn):
+        neg, self._negate = self._negate, False
+        self.filters.append((lambda s: ~fn(s)) if neg else fn)
+        return self
+
+    def eq(self, col, val):
+        return self._filter(lambda d: d[col].astype(str) == str(val))
+
+    def neq(self, col, val):
+        return self._filter(lambda d: d[col].astype(str) != str(val))
+
+    def in_(self, col, values):
+        vals = {str(v) for v in values}
+        return self._filter(lambda d: d[col].astype(str).isin(vals))
+
+    def gt(self, col, val):
+        return self._filter(lambda d: d[col].astype(str) > str(val))
+
+    def gte(self, col, val):
+        return self._filter(lambda d: d[col].astype(str) >= str(val))
+
+    def lt(self, col, val):
+        return self._filter(lambda d: d[col].astype(str) < str(val))
+
+    def lte(self, col, val):
+        return self._filter(lambda d: d[col].astype(str) <= str(val))
+
+    def is_(self, col, val):
+        return self._filter(lambda d: d[col].isna())
+
+    def order(self, col, desc=False, **kwargs):
+        self.orders.append((col, not desc))
+        return self
+
+    def limit(self, n):
+        self.hi = self.lo + int(n)
+        return self
+
+    def range(self, start, end):
+        self.lo, self.hi = int(start), int(end) + 1
+        return self
+
+    def csv(self):
+        self.fmt = "csv"
+        return self
+
+    def execute(self) -> _Response:
+        return self.db._execute(self)
+
+
+class FakeSupabase:
+    """Bellekte tablo (DataFrame) tutan, gidiş-dönüş sayan Supabase istemcisi."""
+
+    def __init__(self, tables: dict):
+        self.tables = {k: v.reset_index(drop=True) for k, v in tables.items()}
+        self.lock = threading.Lock()
+        self.round_trips = 0
+        self.rows_out = 0
+        self._next_id = 0
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    def _new_id(self) -> str:
+        self._next_id += 1
+        return f"00000000-0000-4000-8000-{self._next_id:012d}"
+
+    def _execute(self, q: _Query) -> _Response:
+        with self.lock:
+            self.round_trips += 1
+            df = self.tables.get(q.table, pd.DataFrame())
+            mask = pd.Series(True, index=df.index)
+            for f in q.filters:
+                if not df.empty:
+                    mask &= f(df)
+
+            if q.op == "insert":
+                rows = q.payload if isinstance(q.payload, list) else [q.payload]
+                rows = [{"id": self._new_id(), **r} for r in rows]
+                self.tables[q.table] = pd.concat([df, pd.DataFrame(rows)], ignore_index=True)
+                return _Response(rows)
+            if q.op == "update":
+                for k, v in q.payload.items():
+                    df.loc[mask, k] = v
+                return _Response(df[mask].to_dict("records"))
+            if q.op == "delete":
+                n = int(mask.sum())
+                self.tables[q.table] = df[~mask].reset_index(drop=True)
+                return _Response([], count=n)
+
+            out = df[mask]
+            total = len(out)
+            if q.orders:
+                cols = [c for c, _ in q.orders]
+                out = out.sort_values(cols, ascending=[a for _, a in q.orders], kind="mergesort")
+            out = out.iloc[q.lo:q.hi]
+            if q.columns:
+                out = out[[c for c in q.columns if c in out.columns]]
+            if q.fmt == "csv":
+                # PostgREST gibi: NULL tırnaksız boş alan
+                self.rows_out += len(out)
+                return _Response(out.to_csv(index=False) if len(out) else "")
+            data = [] if q.head else out.astype(object).where(out.notna(), None).to_dict("records")
+            self.rows_out += len(data)
+            return _Response(data, count=total if q.count else None)
+
+
+def seed_backend(n_rows: int) -> FakeSupabase:
+    """Sentetik tahminler (Supabase satır biçiminde) + katılımcı listesi."""
+    tahmin = forecasts_raw(n_rows)
+    tahmin.insert(0, "id", [f"00000000-0000-4000-a000-{i:012d}" for i in range(len(tahmin))])
+    kat = (
+        tahmin[["kullanici_adi", "kategori"]].drop_duplicates("kullanici_adi")
+        .rename(columns={"kullanici_adi": "ad_soyad"}).reset_index(drop=True)
+    )
+    kat.insert(0, "id", [f"00000000-0000-4000-b000-{i:012d}" for i in range(len(kat))])
+    return FakeSupabase({utils.TABLE_TAHMIN: tahmin, utils.TABLE_KATILIMCI: kat})
+
+
+# ---------------------------------------------------------------------------
+# Senaryolar: her adım bir rerun tetikler; seçimler oturumun tohumundan gelir
+# ---------------------------------------------------------------------------
+def _widget(at, kind: str, label: str):
+    return next(w for w in getattr(at, kind) if w.label == label)
+
+
+def _pick_some(rng: random.Random, options, k_max: int = 3) -> list:
+    options = list(options)
+    return rng.sample(options, rng.randint(1, min(k_max, len(options)))) if options else []
+
+
+def _dashboard_steps(at, rng):
+    yield "ilk yükleme", lambda: at.run()
+
+    def heatmap():
+        at.radio(key="dash_view").set_value("🔥 Isı Haritası").run()
+        _widget(at, "selectbox", "Metrik").set_value(rng.choice(list(utils.TAHMIN_METRIKLERI))).run()
+        _widget(at, "multiselect", "Kategori filtresi").set_value(_pick_some(rng, utils.KATEGORILER)).run()
+
+    def revision():
+        at.radio(key="dash_view").set_value("📈 Tahmin Revizyonu").run()
+        user = at.selectbox(key="rev_user")
+        user.set_value(rng.choice(user.options)).run()
+        targets = [s for s in at.selectbox if s.key == "rev_target"]
+        if targets and targets[0].options:
+            targets[0].set_value(rng.choice(targets[0].options)).run()
+
+    def analytics():
+        at.radio(key="dash_view").set_value("🔁 Revizyon Analitiği").run()
+        at.selectbox(key="mom_metric").set_value(rng.choice(list(utils.TAHMIN_METRIKLERI))).run()
+        at.multiselect(key="mom_cats").set_value(_pick_some(rng, utils.KATEGORILER)).run()
+
+    def as_of():
+        _widget(at, "radio", "Tahmin görünümü").set_value("Belirli bir aya göre").run()
+        month = _widget(at, "selectbox", "As-of ayı (bu ayın sonunda piyasa ne bekliyordu?)")
+        month.set_value(rng.choice(month.options[:12])).run()
+
+    steps = [("ısı haritası", heatmap), ("tahmin revizyonu", revision),
+             ("revizyon analitiği", analytics), ("as-of ayı", as_of)]
+    rng.shuffle(steps)
+    yield from steps
+
+
+def _havuz_steps(at, rng):
+    yield "ilk yükleme", lambda: at.run()
+    steps = [
+        ("kategori filtresi", lambda: _widget(at, "multiselect", "Kategori").set_value(
+            _pick_some(rng, utils.KATEGORILER, 2)).run()),
+        ("katılımcı filtresi", lambda: _widget(at, "multiselect", "Katılımcı").set_value(
+            _pick_some(rng, _widget(at, "multiselect", "Katılımcı").options, 4)).run()),
+        ("hedef dönem filtresi", lambda: _widget(at, "multiselect", "Hedef Dönem").set_value(
+            _pick_some(rng, _widget(at, "multiselect", "Hedef Dönem").options[:36], 6)).run()),
+        ("sıralama", lambda: _widget(at, "selectbox", "Sırala").set_value(
+            rng.choice(list(utils.SIRALANABILIR_KOLONLAR))).run()),
+        ("sayfa", lambda: at.number_input(key="havuz_page").set_value(rng.randint(2, 20)).run()),
+    ]
+    rng.shuffle(steps)
+    yield from steps
+
+
+def _piyasa_steps(at, rng):
+    yield "ilk yükleme", lambda: at.run()
+
+    def fetch():
+        start = utils.PIYASA_SAYFA_BASLANGIC.replace(year=rng.choice(range(2015, 2024)))
+        at.date_input[0].set_value(start)
+        at.button[0].click().run()
+
+    yield "verileri getir", fetch
+    yield "verileri getir", fetch
+
+
+def _home_steps(at, rng):
+    yield "ilk yükleme", lambda: at.run()
+
+
+PAGES = {
+    "Ana Sayfa": ("app.py", _home_steps),
+    "Dashboard": ("pages/Dashboard.py", _dashboard_steps),
+    "Veri_Havuzu": ("pages/Veri_Havuzu.py", _havuz_steps),
+    "Piyasa_Verileri": ("pages/Piyasa_Verileri.py", _piyasa_steps),
+}
+
+
+SECRETS = {
+    "SUPABASE_URL": "http://localhost",
+    "SUPABASE_KEY": "yuk-testi",
+    "APP_PASSWORD": "yuk-testi",
+    # Arka plan yenileme ölçülen gidiş-dönüşlere karışmasın
+    "refresh": {"etkin": False},
+}
+
+
+def share_runtime() -> None:
+    """
+    AppTest her çalıştırmada `Runtime._instance`'ı kendi taklidiyle değiştirip
+    sonunda None yapar, secrets'ı ve `global.appTest`'i de süreç genelinde
+    değiştirip geri alır; eşzamanlı oturumlar birbirinin çalışmasını bozar.
+    Gerçek sunucudaki gibi tek bir runtime paylaşılır: ilk oturumun taklidi
+    sabitlenir, secrets ve config bir kez ayarlanır, derlenmiş script'ler
+    ortak önbellekte tutulur (her çalıştırmada yeni ScriptCache eşzamanlı
+    `ast.parse` çağırır; CPython 3.11 bunda hata verebiliyor).
+    """
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.runtime.secrets import Secrets
+
+    bytecode, get_bytecode = {}, ScriptCache.get_bytecode
+    compile_lock = threading.Lock()
+
+    def shared_bytecode(self, script_path):
+        with compile_lock:
+            if script_path not in bytecode:
+                bytecode[script_path] = get_bytecode(self, script_path)
+            return bytecode[script_path]
+
+    ScriptCache.get_bytecode = shared_bytecode
+
+    shared = {}
+    lock = threading.Lock()
+
+    def instance(cls):
+        with lock:
+            rt = shared.get("rt") or cls._instance
+            if rt is None:
+                raise RuntimeError("Runtime hasn't been created!")
+            shared.setdefault("rt", rt)
+            return shared["rt"]
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: "rt" in shared or cls._instance is not None)
+    secrets = Secrets()
+    secrets._secrets = SECRETS
+    st.secrets = secrets
+    config.set_option("global.appTest", True)
+
+
+def _new_session(script: str, timeout: float) -> AppTest:
+    at = AppTest.from_file(os.path.join(ROOT, script), default_timeout=timeout)
+    at.session_state["giris_yapildi"] = True
+    return at
+
+
+def _session_requests(at) -> tuple[int, int]:
+    """Oturumun şimdiye kadarki Supabase isteği ve dönen satırı (perf sayaçları)."""
+    counts = at.session_state["_supabase_sayac"] if "_supabase_sayac" in at.session_state else {}
+    return sum(r[0] for r in counts.values()), sum(r[1] for r in counts.values())
+
+
+def run_session(page: str, timeout: float, seed: int) -> list[dict]:
+    """Tek oturum: sayfanın senaryosunu oturumun tohumuyla baştan sona yürütür."""
+    script, steps = PAGES[page]
+    at = _new_session(script, timeout)
+    out = []
+    for label, step in steps(at, random.Random(seed)):
+        req0, rows0 = _session_requests(at)
+        t0 = time.perf_counter()
+        err = None
+        try:
+            step()
+            if at.exception:
+                err = at.exception[0].message
+        except Exception as e:
+            err = f"{type(e).__name__}: {e}"
+        req1, rows1 = _session_requests(at)
+        out.append({
+            "sayfa": page, "adim": label, "sure_s": time.perf_counter() - t0,
+            "gidis_donus": req1 - req0, "satir": rows1 - rows0, "hata": err,
+        })
+        if err and label == "ilk yükleme":
+            break
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Çalıştırıcı
+# ---------------------------------------------------------------------------
+def rss_mb() -> float:
+    """Anlık RSS (Linux /proc); yoksa ömür boyu tepe değer."""
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2**20 if sys.platform == "darwin" else 1024)
+
+
+_BACKEND: FakeSupabase | None = None
+
+
+def install_backend(n_rows: int) -> None:
+    global _BACKEND
+    _install_market_fixtures(0)
+    _BACKEND = seed_backend(n_rows)
+    # İstemcinin altı değişir; _TimedQuery ölçümleri yükte de çalışsın
+    utils._supabase_client = lambda: _BACKEND
+
+
+def reset_caches() -> None:
+    """Faz başında sunucu yeni açılmış gibi: bellek cache'leri ve anlık görüntüler boş."""
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    for path in glob.glob(os.path.join(utils.SNAPSHOT_DIR, "*.arrow")):
+        os.remove(path)
+
+
+def _pct(values, q):
+    return round(float(np.percentile(values, q)), 1) if len(values) else None
+
+
+def _stats(steps: list[dict]) -> dict:
+    lat = np.array([s["sure_s"] for s in steps]) * 1000
+    n = len(steps)
+    first = [s["sure_s"] * 1000 for s in steps if s["adim"] == "ilk yükleme"]
+    return {
+        "rerun": n,
+        "p50_ms": _pct(lat, 50),
+        "p95_ms": _pct(lat, 95),
+        "p99_ms": _pct(lat, 99),
+        "max_ms": round(float(lat.max()), 1) if n else None,
+        "ilk_yukleme_p50_ms": _pct(first, 50),
+        "gidis_donus_per_rerun": round(sum(s["gidis_donus"] for s in steps) / max(1, n), 2),
+        "satir_per_rerun": round(sum(s["satir"] for s in steps) / max(1, n), 1),
+        "adimlar": {
+            label: {
+                "p50_ms": _pct([s["sure_s"] * 1000 for s in steps if s["adim"] == label], 50),
+                "gidis_donus": sum(s["gidis_donus"] for s in steps if s["adim"] == label),
+            }
+            for label in dict.fromkeys(s["adim"] for s in steps)
+        },
+    }
+
+
+def run_phase(pages: list[str], sessions: int, timeout: float, seed: int = 0) -> list[dict]:
+    """
+    `sessions` oturumu tek süreçte eşzamanlı çalıştırır; oturumlar sayfalara
+    sırayla dağıtılır. Sayfa başına istatistik listesi döner.
+    """
+    reset_caches()
+    rt0 = _BACKEND.round_trips
+    assigned = [pages[i % len(pages)] for i in range(sessions)]
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix="oturum") as ex:
+        runs = list(ex.map(
+            run_session, assigned, [timeout] * sessions, range(seed, seed + sessions),
+        ))
+    wall = time.perf_counter() - t0
+    rss = rss_mb()
+
+    steps = [s for r in runs for s in r]
+    total_rt = _BACKEND.round_trips - rt0
+    results = []
+    for page in dict.fromkeys(assigned):
+        page_steps = [s for s in steps if s["sayfa"] == page]
+        errors = [f"{s['adim']}: {s['hata']}" for s in page_steps if s["hata"]]
+        results.append({
+            "faz": "karma" if len(pages) > 1 else "tek sayfa",
+            "sayfa": page,
+            "oturum": assigned.count(page),
+            **_stats(page_steps),
+            "faz_gidis_donus": total_rt,
+            "sure_s": round(wall, 2),
+            "rss_mb": round(rss, 1),
+            "hata_sayisi": len(errors),
+            "hatalar": sorted(set(errors))[:5],
+        })
+    return results
+
+
+def _print(r: dict, n: int) -> None:
+    print(
+        f"{r['faz']:9} {r['sayfa']:16} satır={n:>9,} oturum={r['oturum']:>3}  "
+        f"ilk {r['ilk_yukleme_p50_ms'] or 0:>8.1f} ms  "
+        f"p50 {r['p50_ms'] or 0:>8.1f} ms  p95 {r['p95_ms'] or 0:>8.1f} ms  "
+        f"gidiş-dönüş/rerun {r['gidis_donus_per_rerun']:>5.2f}  "
+        f"RSS {r['rss_mb']:>7.1f} MB  hata {r['hata_sayisi']}",
+        flush=True,
+    )
+    for h in r["hatalar"]:
+        print(f"    ! {h}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS,
+                    help="Tahmin tablosu satır sayıları (her biri ayrı tur)")
+    ap.add_argument("--sessions", type=int, default=20, help="Eşzamanlı oturum sayısı")
+    ap.add_argument("--pages", nargs="+", default=list(PAGES), choices=list(PAGES))
+    ap.add_argument("--no-mixed", action="store_true",
+                    help="Tüm sayfaların birlikte koştuğu karma fazı atla")
+    ap.add_argument("--seed", type=int, default=0, help="Oturum seçimlerinin başlangıç tohumu")
+    ap.add_argument("--timeout", type=float, default=300.0, help="Rerun başına zaman aşımı (sn)")
+    ap.add_argument("--out", default=os.path.join(HERE, "results_load.json"))
+    args = ap.parse_args(argv)
+
+    phases = [[p] for p in args.pages]
+    if len(args.pages) > 1 and not args.no_mixed:
+        phases.append(list(args.pages))
+
+    share_runtime()
+    results = []
+    try:
+        for n in args.rows:
+            install_backend(n)
+            for pages in phases:
+                try:
+                    rs = run_phase(pages, args.sessions, args.timeout, args.seed)
+                except Exception:
+                    traceback.print_exc()
+                    continue
+                for r in rs:
+                    r["satir"] = n
+                    results.append(r)
+                    _print(r, n)
+    finally:
+        shutil.rmtree(_SNAP_DIR, ignore_errors=True)
+
+    with open(args.out, "w", encoding="utf-8") as fh:
+        json.dump({"meta": _meta(), "results": results}, fh, indent=2, ensure_ascii=False)
+    print(f"\n→ {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
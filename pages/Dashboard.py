@@ -1,4 +1,3 @@
-import datetime
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
@@ -8,41 +7,42 @@ import utils
 
 st.set_page_config(page_title="Dashboard", layout="wide")
 utils.apply_theme()
+utils.start_background_refresh()
 
 utils.require_login_page()
+utils.perf_start_run("Dashboard")
+utils.profile_controls("Dashboard")
 
 utils.page_header("📈 Piyasa Analiz Dashboardu", "Tahminler, gerçekleşen veriler ve performans kıyaslamaları")
 
 # =============================================================
 # Veriler
 # =============================================================
-with st.spinner("Veriler yükleniyor..."):
-    df_all = utils.get_all_forecasts()
-    df_k = utils.get_participants()
-
-    start_date = datetime.date(datetime.date.today().year - 3, 1, 1)
-    end_date = datetime.date.today()
-    realized_df, real_err = utils.fetch_market_data_adapter(start_date, end_date)
+# Veri sürümü her yazmada artar; türetilmiş tablolar (sürüm, parametre) ile cache'li
+data_version = utils.get_data_version()
 
-if df_all.empty:
+with st.spinner("Veriler yükleniyor..."):
+    # Tahmin tablosu (Supabase) ve piyasa verisi (EVDS + BIS) eşzamanlı gelir
+    market_range = utils.dashboard_market_range()
+    loaded = utils.load_page_data(tahmin=True, piyasa=market_range)
+    if "tahmin" in loaded["hata"]:
+        st.error(f"Tahminler yüklenemedi: {loaded['hata']['tahmin']}")
+        st.stop()
+    all_forecast_months, _, _ = utils.get_forecast_meta(data_version)
+
+    realized_df, real_err = loaded["veri"]["piyasa"] or (None, loaded["hata"].get("piyasa"))
+    # Türetilmiş tablolar gerçekleşme verisini DataFrame yerine bu anahtarla tanır
+    market_key = utils.market_data_key(*market_range) if realized_df is not None else None
+
+if not all_forecast_months:
     st.info("Henüz tahmin verisi yok. **Sistem Yönetimi** sayfasından demo verisi üretebilirsiniz.")
     st.stop()
 
-# Görünen isim kolonu
-df_all["gorunen_isim"] = df_all["kullanici_adi"]
-
 # =============================================================
 # KONTROL PANELİ: As-of tarihi seçimi
 # =============================================================
 st.markdown("### 🎛️ Görünüm Ayarları")
 
-# Mevcut tahminlerin olduğu ayları bul (as-of seçimi için)
-df_all_dates = df_all.dropna(subset=["tahmin_tarihi"])
-all_forecast_months = sorted(
-    df_all_dates["tahmin_tarihi"].dt.strftime("%Y-%m").unique(),
-    reverse=True,
-)
-
 ctrl1, ctrl2 = st.columns([1, 2])
 with ctrl1:
     as_of_mode = st.radio(
@@ -59,135 +59,147 @@ with ctrl2:
             all_forecast_months,
             index=0,
         )
-        df_latest = utils.get_latest_as_of(df_all, as_of_month)
         st.caption(f"💡 {as_of_month} sonuna kadar girilen tahminlerin en son hali gösteriliyor.")
     else:
         as_of_month = None
-        df_latest = utils.get_latest_per_user_period(df_all)
+
+df_latest = utils.get_latest_view(data_version, as_of_month)
 
 st.markdown("---")
 
 # =============================================================
 # 🏆 LİDERLİK TABLOSU
 # =============================================================
-st.markdown("### 🏆 Performans Liderleri")
-
-if realized_df is None or realized_df.empty:
-    if real_err:
-        st.warning(f"Piyasa verisi çekilemedi: {real_err}")
-    else:
-        st.warning("Piyasa verileri boş.")
-else:
-    valid_periods = (
-        realized_df.dropna(subset=["Aylık TÜFE", "PPK Faizi"], how="all")["Donem"]
-        .sort_values(ascending=False).unique().tolist()
-    )
-
-    if not valid_periods:
-        st.warning("Henüz karşılaştırma yapılabilecek gerçekleşme verisi yok.")
+@st.fragment
+def render_leaderboard(df_latest, realized_df, real_err):
+    """Dönem seçimi yalnızca bu bölümü yeniden çalıştırır."""
+    st.markdown("### 🏆 Performans Liderleri")
+
+    if realized_df is None or realized_df.empty:
+        if real_err:
+            st.warning(f"Piyasa verisi çekilemedi: {real_err}")
+        else:
+            st.warning("Piyasa verileri boş.")
     else:
-        col_sel, col_info = st.columns([1, 3])
-        with col_sel:
-            sel_period = st.selectbox("📅 Dönem", valid_periods, index=0, key="leader_period")
-        with col_info:
-            st.markdown(
-                f"<div style='padding-top:30px;color:#94A3B8;font-size:13px;'>"
-                f"Seçilen dönem için gerçekleşen değerler ile tahminler karşılaştırılıyor. "
-                f"Her katılımcının <b>o döneme verdiği en son tahmin</b> kullanılır."
-                f"</div>",
-                unsafe_allow_html=True,
-            )
-
-        target_real = realized_df[realized_df["Donem"] == sel_period].iloc[0]
-        period_forecasts = df_latest[df_latest["hedef_donemi"] == sel_period].copy()
-
-        def leaderboard_card(col_obj, title, forecast_col, real_val_col):
-            real_val = target_real.get(real_val_col)
-            with col_obj:
-                st.markdown(f"#### {title}")
-                if pd.isna(real_val):
-                    st.info("Gerçekleşen veri henüz yok.")
-                    return
+        valid_periods = (
+            realized_df.dropna(subset=["Aylık TÜFE", "PPK Faizi"], how="all")["Donem"]
+            .sort_values(ascending=False).unique().tolist()
+        )
 
+        if not valid_periods:
+            st.warning("Henüz karşılaştırma yapılabilecek gerçekleşme verisi yok.")
+        else:
+            col_sel, col_info = st.columns([1, 3])
+            with col_sel:
+                sel_period = st.selectbox("📅 Dönem", valid_periods, index=0, key="leader_period")
+            with col_info:
                 st.markdown(
-                    f"<div class='actual-box'><b>Gerçekleşen:</b> "
-                    f"<span style='font-size:20px;font-weight:700;'>{real_val:.2f}%</span></div>",
+                    f"<div style='padding-top:30px;color:#94A3B8;font-size:13px;'>"
+                    f"Seçilen dönem için gerçekleşen değerler ile tahminler karşılaştırılıyor. "
+                    f"Her katılımcının <b>o döneme verdiği en son tahmin</b> kullanılır."
+                    f"</div>",
                     unsafe_allow_html=True,
                 )
 
-                valid = period_forecasts.dropna(subset=[forecast_col]).copy()
-                if valid.empty:
-                    st.caption("Bu metrik için tahmin yok.")
-                    return
+            target_real = realized_df[realized_df["Donem"] == sel_period].iloc[0]
+            period_forecasts = df_latest[df_latest["hedef_donemi"] == sel_period].copy()
 
-                valid["sapma"] = (valid[forecast_col] - real_val).abs()
-                leaders = valid.sort_values("sapma").head(5)
+            def leaderboard_card(col_obj, title, forecast_col, real_val_col):
+                real_val = target_real.get(real_val_col)
+                with col_obj:
+                    st.markdown(f"#### {title}")
+                    if pd.isna(real_val):
+                        st.info("Gerçekleşen veri henüz yok.")
+                        return
 
-                medals = ["🥇", "🥈", "🥉", "4️⃣", "5️⃣"]
-                for i, (_, row) in enumerate(leaders.iterrows()):
-                    medal = medals[i] if i < 5 else f"{i+1}."
-                    kat = row.get("kategori", "")
                     st.markdown(
-                        f"""
-                        <div class="leader-card">
-                          <span class="leader-rank">{medal}</span>
-                          <span class="leader-name">{row['gorunen_isim']}</span>
-                          {utils.category_badge(kat) if kat else ''}
-                          <div class="leader-meta">
-                            Tahmin: <b>{row[forecast_col]:.2f}</b> &nbsp;•&nbsp;
-                            Sapma: <b>{row['sapma']:.2f}</b>
-                          </div>
-                        </div>
-                        """,
+                        f"<div class='actual-box'><b>Gerçekleşen:</b> "
+                        f"<span style='font-size:20px;font-weight:700;'>{real_val:.2f}%</span></div>",
                         unsafe_allow_html=True,
                     )
 
-        if period_forecasts.empty:
-            st.info(f"{sel_period} dönemi için sistemde tahmin bulunamadı.")
-        else:
-            lc1, lc2, lc3 = st.columns(3)
-            leaderboard_card(lc1, "🏦 PPK Faizi", "tahmin_ppk_faiz", "PPK Faizi")
-            leaderboard_card(lc2, "📅 Aylık Enflasyon", "tahmin_aylik_enf", "Aylık TÜFE")
-            leaderboard_card(lc3, "📆 Yıllık Enflasyon", "tahmin_yilsonu_enf", "Yıllık TÜFE")
+                    valid = period_forecasts.dropna(subset=[forecast_col]).copy()
+                    if valid.empty:
+                        st.caption("Bu metrik için tahmin yok.")
+                        return
+
+                    valid["sapma"] = (valid[forecast_col] - real_val).abs()
+                    leaders = valid.sort_values("sapma").head(5)
+
+                    medals = ["🥇", "🥈", "🥉", "4️⃣", "5️⃣"]
+                    for i, (_, row) in enumerate(leaders.iterrows()):
+                        medal = medals[i] if i < 5 else f"{i+1}."
+                        kat = row.get("kategori", "")
+                        st.markdown(
+                            f"""
+                            <div class="leader-card">
+                              <span class="leader-rank">{medal}</span>
+                              <span class="leader-name">{row['gorunen_isim']}</span>
+                              {utils.category_badge(kat) if kat else ''}
+                              <div class="leader-meta">
+                                Tahmin: <b>{row[forecast_col]:.2f}</b> &nbsp;•&nbsp;
+                                Sapma: <b>{row['sapma']:.2f}</b>
+                              </div>
+                            </div>
+                            """,
+                            unsafe_allow_html=True,
+                        )
+
+            if period_forecasts.empty:
+                st.info(f"{sel_period} dönemi için sistemde tahmin bulunamadı.")
+            else:
+                lc1, lc2, lc3 = st.columns(3)
+                leaderboard_card(lc1, "🏦 PPK Faizi", "tahmin_ppk_faiz", "PPK Faizi")
+                leaderboard_card(lc2, "📅 Aylık Enflasyon", "tahmin_aylik_enf", "Aylık TÜFE")
+                leaderboard_card(lc3, "📆 Yıllık Enflasyon", "tahmin_yilsonu_enf", "Yıllık TÜFE")
+
+
+render_leaderboard(df_latest, realized_df, real_err)
 
 st.markdown("---")
 
 # =============================================================
 # 📊 GRAFİKLER
 # =============================================================
-tab1, tab2, tab3 = st.tabs(["📊 Zaman Serisi", "🔥 Isı Haritası", "📈 Tahmin Revizyonu"])
+# Sekmeler yerine seçici: yalnızca görünen bölüm hesaplanır. Her bölüm kendi
+# fragment'ı — ör. ısı haritası metriği değişince zaman serileri yeniden çizilmez.
 
-# ----------- TAB 1: Zaman Serisi -----------
-with tab1:
+# ----------- Zaman Serisi -----------
+@st.fragment
+def render_timeseries(data_version, df_latest, realized_df, as_of_month):
     with st.expander("🔍 Grafik Filtreleri", expanded=False):
         c1, c2 = st.columns(2)
-        users = c1.multiselect(
-            "Katılımcılar (boşsa medyan)",
-            sorted(df_all["gorunen_isim"].unique()),
-        )
-        all_periods = sorted(df_all["hedef_donemi"].dropna().unique().tolist())
+        _, all_periods, all_names = utils.get_forecast_meta(data_version)
+        users = c1.multiselect("Katılımcılar (boşsa medyan)", all_names)
         default_periods = all_periods[-12:] if len(all_periods) > 12 else all_periods
         selected_periods = c2.multiselect(
             "Hedef Dönemler", all_periods, default=default_periods
         )
+        cons_methods = st.multiselect(
+            "Alternatif konsensüsler (medyan görünümünde)",
+            utils.KONSENSUS_YONTEMLERI,
+            help="Ters-MSE: katılımcıların son 12 gerçekleşmiş hedefteki hatalarına göre ağırlıklandırılır.",
+        )
 
-    df_filtered = df_latest[df_latest["hedef_donemi"].isin(selected_periods)]
+    df_filtered = utils.get_period_slice(data_version, as_of_month, tuple(selected_periods))
+
+    CONSENSUS_COLORS = {
+        "Eşit Ağırlık": "#A78BFA",
+        "Ters-MSE": "#10B981",
+        "Budanmış Ort.": "#F59E0B",
+        "Kategori Ağırlıklı": "#EC4899",
+    }
 
     def plot_metric(forecast_col: str, realized_col: str, title: str):
         fig = go.Figure()
 
         if users:
-            user_data = df_filtered[df_filtered["gorunen_isim"].isin(users)]
-            for u in users:
-                d = user_data[user_data["gorunen_isim"] == u].sort_values("hedef_donemi")
-                if not d.empty:
-                    fig.add_trace(
-                        go.Scatter(
-                            x=d["hedef_donemi"], y=d[forecast_col],
-                            mode="lines+markers", name=u,
-                            line=dict(width=2), marker=dict(size=7),
-                        )
-                    )
+            # Tek groupby geçişi; çok noktada Scattergl + seyreltme
+            fig.add_traces(utils.build_group_traces(
+                df_filtered, "gorunen_isim", "hedef_donemi", forecast_col,
+                groups=users, mode="lines+markers",
+                line=dict(width=2), marker=dict(size=7),
+            ))
         else:
             # Medyan + IQR bandı
             grp = df_filtered.groupby("hedef_donemi")[forecast_col]
@@ -211,6 +223,22 @@ with tab1:
                 line=dict(color="#3B82F6", width=3), marker=dict(size=8),
             ))
 
+            # Alternatif konsensüsler: önceden hesaplanmış küpten as-of dilimi
+            if cons_methods:
+                cons = utils.compute_consensus(data_version, market_key, forecast_col)
+                if not cons.empty:
+                    cons_ay = as_of_month or cons["ay"].max()
+                    cons = cons[
+                        (cons["ay"] == cons_ay) & cons["hedef_donemi"].isin(selected_periods)
+                    ].sort_values("hedef_donemi")
+                    for method in cons_methods:
+                        fig.add_trace(go.Scatter(
+                            x=cons["hedef_donemi"], y=cons[method],
+                            mode="lines+markers", name=method,
+                            line=dict(color=CONSENSUS_COLORS.get(method), width=2, dash="dash"),
+                            marker=dict(size=6),
+                        ))
+
         # Gerçekleşen
         if realized_df is not None and not realized_df.empty and realized_col in realized_df.columns:
             real_data = (
@@ -240,32 +268,31 @@ with tab1:
         )
         return fig
 
-    c1, c2 = st.columns(2)
-    with c1:
-        st.plotly_chart(
-            plot_metric("tahmin_ppk_faiz", "PPK Faizi", "PPK Faiz Beklentisi"),
+    def metric_chart(forecast_col: str, realized_col, title: str):
+        # Aynı girdilerle figür yeniden kurulmaz
+        utils.plotly_chart_cached(
+            lambda: plot_metric(forecast_col, realized_col, title),
+            "zaman_serisi", data_version, as_of_month, tuple(selected_periods),
+            tuple(users), tuple(cons_methods), market_key, forecast_col, realized_col, title,
             use_container_width=True,
         )
+
+    c1, c2 = st.columns(2)
+    with c1:
+        metric_chart("tahmin_ppk_faiz", "PPK Faizi", "PPK Faiz Beklentisi")
     with c2:
-        st.plotly_chart(
-            plot_metric("tahmin_yilsonu_enf", "Yıllık TÜFE", "Yıl Sonu Enflasyon"),
-            use_container_width=True,
-        )
+        metric_chart("tahmin_yilsonu_enf", "Yıllık TÜFE", "Yıl Sonu Enflasyon")
 
     c3, c4 = st.columns(2)
     with c3:
-        st.plotly_chart(
-            plot_metric("tahmin_aylik_enf", "Aylık TÜFE", "Aylık Enflasyon"),
-            use_container_width=True,
-        )
+        metric_chart("tahmin_aylik_enf", "Aylık TÜFE", "Aylık Enflasyon")
     with c4:
-        st.plotly_chart(
-            plot_metric("tahmin_yilsonu_faiz", None, "Yıl Sonu Faiz Beklentisi"),
-            use_container_width=True,
-        )
+        metric_chart("tahmin_yilsonu_faiz", None, "Yıl Sonu Faiz Beklentisi")
 
-# ----------- TAB 2: Isı Haritası -----------
-with tab2:
+
+# ----------- Isı Haritası -----------
+@st.fragment
+def render_heatmap(data_version, df_latest, realized_df, as_of_month):
     st.subheader("Beklenti Isı Haritası")
     st.caption(
         "Her hücre, satırdaki katılımcının sütundaki hedef döneme verdiği "
@@ -273,13 +300,8 @@ with tab2:
            else f"**{as_of_month} sonuna kadar** verdiği en son tahmini gösterir.")
     )
 
-    metric_opts = {
-        "PPK Faizi": "tahmin_ppk_faiz",
-        "Yıl Sonu Enflasyon": "tahmin_yilsonu_enf",
-        "Aylık Enflasyon": "tahmin_aylik_enf",
-        "Yıl Sonu Faiz": "tahmin_yilsonu_faiz",
-    }
-    hc1, hc2 = st.columns([1, 2])
+    metric_opts = utils.TAHMIN_METRIKLERI
+    hc1, hc2, hc3 = st.columns([1, 2, 1])
     metric_label = hc1.selectbox("Metrik", list(metric_opts.keys()))
     metric = metric_opts[metric_label]
 
@@ -288,23 +310,18 @@ with tab2:
         utils.KATEGORILER,
         default=utils.KATEGORILER,
     )
+    heat_mode = hc3.radio(
+        "Görünüm", ["Isı haritası", "Tablo"], horizontal=True, key="heat_mode",
+        help="Isı haritası büyük matrislerde hızlıdır; tablo modu küçük matrislerde renklidir.",
+    )
 
-    if metric not in df_latest.columns:
-        st.info("Bu metrik için veri yok.")
-    else:
-        df_heat = df_latest[df_latest["kategori"].isin(cat_filter)].copy()
-        pivot = df_heat.pivot_table(
-            index="gorunen_isim", columns="hedef_donemi",
-            values=metric, aggfunc="last",
-        )
-
-        if pivot.empty:
-            st.info("Gösterilecek veri yok.")
-        else:
-            pivot = pivot.reindex(columns=sorted(pivot.columns))
-            # Satırları alfabetik sırala
-            pivot = pivot.sort_index()
+    pivot = utils.build_heatmap_matrix(data_version, as_of_month, metric, tuple(cat_filter))
 
+    if pivot.empty:
+        st.info("Gösterilecek veri yok.")
+    elif heat_mode == "Tablo":
+        n_cells = pivot.shape[0] * pivot.shape[1]
+        if n_cells <= utils.HEATMAP_STYLER_MAX_CELLS:
             st.dataframe(
                 pivot.style.background_gradient(cmap="RdYlGn_r", axis=None).format(
                     "{:.2f}", na_rep="—"
@@ -312,29 +329,99 @@ with tab2:
                 use_container_width=True,
                 height=min(600, 50 + 35 * len(pivot)),
             )
+        else:
+            # Büyük matris: Styler yok, satırlar st.dataframe tarafından sanallaştırılır
+            st.dataframe(
+                pivot,
+                column_config={
+                    c: st.column_config.NumberColumn(c, format="%.2f")
+                    for c in pivot.columns
+                },
+                use_container_width=True,
+                height=600,
+            )
+            st.caption("ℹ️ Matris büyük olduğu için renklendirme kapalı; renkli görünüm için ısı haritası modunu kullanın.")
+    else:
+        n_pages = max(1, -(-len(pivot) // utils.HEATMAP_PAGE_SIZE))
+        page = 1
+        if n_pages > 1:
+            page = st.number_input(
+                "Sayfa", min_value=1, max_value=n_pages, value=1, step=1,
+                key="heat_page", help=f"Toplam {n_pages} sayfa, sayfa başına {utils.HEATMAP_PAGE_SIZE} katılımcı.",
+            )
+        start = (int(page) - 1) * utils.HEATMAP_PAGE_SIZE
+        page_df = pivot.iloc[start:start + utils.HEATMAP_PAGE_SIZE]
+
+        # Renk ölçeği tüm matristen — sayfalar arası karşılaştırılabilir kalsın
+        fig = go.Figure(go.Heatmap(
+            z=page_df.to_numpy(),
+            x=list(page_df.columns),
+            y=list(page_df.index),
+            colorscale="RdYlGn",
+            reversescale=True,
+            zmin=float(np.nanmin(pivot.to_numpy())),
+            zmax=float(np.nanmax(pivot.to_numpy())),
+            texttemplate="%{z:.2f}" if page_df.size <= 1500 else None,
+            hovertemplate="%{y}<br>%{x}: <b>%{z:.2f}</b><extra></extra>",
+            xgap=1, ygap=1,
+        ))
+        fig.update_layout(
+            height=max(300, 80 + 24 * len(page_df)),
+            margin=dict(l=10, r=10, t=20, b=40),
+            plot_bgcolor="rgba(0,0,0,0)",
+            paper_bgcolor="rgba(0,0,0,0)",
+            xaxis=dict(type="category", side="top"),
+            yaxis=dict(type="category", autorange="reversed"),
+        )
+        with utils.perf_span("render.isi_haritasi", "grafik"):
+            st.plotly_chart(fig, use_container_width=True)
 
-            # Altına özet
-            st.caption(
-                f"📊 {len(pivot)} katılımcı × {len(pivot.columns)} dönem • "
-                f"Renk: **kırmızı = yüksek**, **yeşil = düşük**"
+    if not pivot.empty:
+        # Altına özet
+        st.caption(
+            f"📊 {len(pivot)} katılımcı × {len(pivot.columns)} dönem • "
+            f"Renk: **kırmızı = yüksek**, **yeşil = düşük**"
+        )
+        dc1, dc2 = st.columns([1, 3])
+        exp_fmt = dc1.selectbox(
+            "İndirme formatı", list(utils.EXPORT_FORMATLARI), key="heat_exp_fmt",
+            label_visibility="collapsed",
+        )
+        ext, mime = utils.EXPORT_FORMATLARI[exp_fmt]
+        # Dosya yalnız istenince yazılır; hazırlanan anahtar filtreler değişene dek geçerli
+        exp_key = (data_version, as_of_month, metric, tuple(cat_filter), ext)
+        if st.session_state.get("heat_export") != exp_key:
+            if dc2.button("Matrisi hazırla", key="heat_exp_hazirla"):
+                st.session_state["heat_export"] = exp_key
+        if st.session_state.get("heat_export") == exp_key:
+            dc2.download_button(
+                "📥 Matrisi indir",
+                utils.export_heatmap_matrix(*exp_key),
+                file_name=f"isi_haritasi_{metric}.{ext}",
+                mime=mime,
             )
 
-# ----------- TAB 3: Tahmin Revizyonu -----------
-with tab3:
+
+# ----------- Tahmin Revizyonu -----------
+@st.fragment
+def render_revision(data_version, df_latest, realized_df, as_of_month):
     st.subheader("Bir Katılımcının Tahmin Revizyonu")
     st.caption(
         "Seçilen katılımcının aynı hedef dönem için zaman içinde verdiği "
         "tahminlerin nasıl değiştiğini gösterir."
     )
 
+    metric_opts = utils.TAHMIN_METRIKLERI
+    rev_all, _, _ = utils.compute_revision_analytics(data_version)
+
     rc1, rc2, rc3 = st.columns([2, 1, 1])
-    user_sel = rc1.selectbox(
-        "Katılımcı",
-        sorted(df_all["gorunen_isim"].unique()),
-        key="rev_user",
+    _, _, all_names = utils.get_forecast_meta(data_version)
+    user_sel = rc1.selectbox("Katılımcı", all_names, key="rev_user")
+    rev_user = rev_all[rev_all["gorunen_isim"] == user_sel] if not rev_all.empty else rev_all
+    available_targets = (
+        sorted(rev_user["hedef_donemi"].dropna().unique().tolist())
+        if not rev_user.empty else []
     )
-    user_df = df_all[df_all["gorunen_isim"] == user_sel]
-    available_targets = sorted(user_df["hedef_donemi"].dropna().unique().tolist())
     if not available_targets:
         st.info("Bu katılımcı için hedef dönem bulunamadı.")
     else:
@@ -344,67 +431,245 @@ with tab3:
         )
         metric_sel = metric_opts[metric_sel_label]
 
-        rev_df = (
-            user_df[user_df["hedef_donemi"] == target_sel]
-            .dropna(subset=[metric_sel])
-            .sort_values("tahmin_tarihi")
-        )
+        # Revizyon motorunun önceden hesapladığı satırlar (tarihe göre sıralı)
+        rev_df = rev_user[
+            (rev_user["hedef_donemi"] == target_sel) & (rev_user["metrik"] == metric_sel)
+        ]
 
         if rev_df.empty:
             st.info("Bu kombinasyon için veri yok.")
         else:
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=rev_df["tahmin_tarihi"], y=rev_df[metric_sel],
-                mode="lines+markers+text",
-                name=user_sel,
-                line=dict(color="#3B82F6", width=2),
-                marker=dict(size=9),
-                text=[f"{v:.2f}" for v in rev_df[metric_sel]],
-                textposition="top center",
-            ))
+            def build_revision_fig() -> go.Figure:
+                fig = go.Figure()
+                fig.add_trace(go.Scatter(
+                    x=rev_df["tahmin_tarihi"], y=rev_df["deger"],
+                    mode="lines+markers+text",
+                    name=user_sel,
+                    line=dict(color="#3B82F6", width=2),
+                    marker=dict(size=9),
+                    text=[f"{v:.2f}" for v in rev_df["deger"]],
+                    textposition="top center",
+                ))
+
+                # Gerçekleşeni ekle
+                if realized_df is not None and not realized_df.empty:
+                    real_col = utils.GERCEKLESEN_KOLONLARI.get(metric_sel)
+                    if real_col:
+                        real_row = realized_df[realized_df["Donem"] == target_sel]
+                        if not real_row.empty and real_col in real_row.columns:
+                            real_val = real_row[real_col].iloc[0]
+                            if not pd.isna(real_val):
+                                fig.add_hline(
+                                    y=real_val, line_dash="dot", line_color="#EF4444",
+                                    annotation_text=f"Gerçekleşen: {real_val:.2f}",
+                                    annotation_position="right",
+                                )
+
+                fig.update_layout(
+                    title=f"{user_sel} — {target_sel} için {metric_sel_label} revizyonu",
+                    hovermode="x unified",
+                    showlegend=False,
+                    height=400,
+                    margin=dict(l=10, r=10, t=60, b=40),
+                    plot_bgcolor="rgba(0,0,0,0)",
+                    paper_bgcolor="rgba(0,0,0,0)",
+                    xaxis=dict(title="Tahmin Tarihi", gridcolor="rgba(148,163,184,0.12)"),
+                    yaxis=dict(title=metric_sel_label, gridcolor="rgba(148,163,184,0.12)"),
+                )
+                return fig
 
-            # Gerçekleşeni ekle
-            if realized_df is not None and not realized_df.empty:
-                realized_map = {
-                    "tahmin_ppk_faiz": "PPK Faizi",
-                    "tahmin_aylik_enf": "Aylık TÜFE",
-                    "tahmin_yilsonu_enf": "Yıllık TÜFE",
-                }
-                real_col = realized_map.get(metric_sel)
-                if real_col:
-                    real_row = realized_df[realized_df["Donem"] == target_sel]
-                    if not real_row.empty and real_col in real_row.columns:
-                        real_val = real_row[real_col].iloc[0]
-                        if not pd.isna(real_val):
-                            fig.add_hline(
-                                y=real_val, line_dash="dot", line_color="#EF4444",
-                                annotation_text=f"Gerçekleşen: {real_val:.2f}",
-                                annotation_position="right",
-                            )
-
-            fig.update_layout(
-                title=f"{user_sel} — {target_sel} için {metric_sel_label} revizyonu",
-                hovermode="x unified",
-                showlegend=False,
-                height=400,
-                margin=dict(l=10, r=10, t=60, b=40),
-                plot_bgcolor="rgba(0,0,0,0)",
-                paper_bgcolor="rgba(0,0,0,0)",
-                xaxis=dict(title="Tahmin Tarihi", gridcolor="rgba(148,163,184,0.12)"),
-                yaxis=dict(title=metric_sel_label, gridcolor="rgba(148,163,184,0.12)"),
+            utils.plotly_chart_cached(
+                build_revision_fig, "revizyon", data_version,
+                user_sel, target_sel, metric_sel, realized_df,
+                use_container_width=True,
             )
-            st.plotly_chart(fig, use_container_width=True)
 
             st.markdown("**Tüm revizyonlar:**")
-            show_cols = ["tahmin_tarihi", metric_sel, "kaynak_link"]
+            show_cols = ["tahmin_tarihi", "deger", "revizyon", "gun_arasi", "kaynak_link"]
             show_cols = [c for c in show_cols if c in rev_df.columns]
             st.dataframe(
                 rev_df[show_cols].rename(columns={
                     "tahmin_tarihi": "Tarih",
-                    metric_sel: metric_sel_label,
+                    "deger": metric_sel_label,
+                    "revizyon": "Değişim",
+                    "gun_arasi": "Gün",
                     "kaynak_link": "Kaynak",
                 }),
                 use_container_width=True,
                 hide_index=True,
             )
+
+
+# ----------- Revizyon Analitiği -----------
+@st.fragment
+def render_revision_analytics(data_version, df_latest, realized_df, as_of_month):
+    st.subheader("Piyasa Geneli Revizyon Analitiği")
+    st.caption(
+        "Tüm katılımcıların ardışık tahminleri arasındaki farklar. Yayılma endeksi: "
+        "(yukarı − aşağı revizyon) / toplam revizyon × 100."
+    )
+
+    _, rev_summary, _ = utils.compute_revision_analytics(data_version)
+
+    ma1, ma2 = st.columns([1, 2])
+    mom_label = ma1.selectbox("Metrik", list(utils.TAHMIN_METRIKLERI.keys()), key="mom_metric")
+    mom_metric = utils.TAHMIN_METRIKLERI[mom_label]
+    mom_cats = ma2.multiselect(
+        "Kategori filtresi", utils.KATEGORILER, default=utils.KATEGORILER, key="mom_cats"
+    )
+
+    mom = utils.compute_revision_momentum(data_version, mom_metric, tuple(mom_cats))
+    if mom.empty:
+        st.info("Bu metrik ve kategoriler için revizyon verisi yok.")
+    else:
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            x=mom["ay"], y=mom["ort_revizyon"], name="Ort. revizyon",
+            marker_color=np.where(mom["ort_revizyon"] >= 0, "#EF4444", "#10B981"),
+        ))
+        fig.add_trace(go.Scatter(
+            x=mom["ay"], y=mom["momentum_3a"], name="3 aylık momentum",
+            mode="lines", line=dict(color="#F59E0B", width=2),
+        ))
+        fig.add_trace(go.Scatter(
+            x=mom["ay"], y=mom["yayilma_endeksi"], name="Yayılma endeksi",
+            mode="lines+markers", line=dict(color="#3B82F6", width=2, dash="dot"),
+            yaxis="y2",
+        ))
+        fig.update_layout(
+            title=dict(
+                text=f"{mom_label} — aylık revizyon momentumu "
+                     f"({len(mom_cats)}/{len(utils.KATEGORILER)} kategori)",
+                font=dict(size=16),
+            ),
+            hovermode="x unified",
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, x=0),
+            height=420,
+            margin=dict(l=10, r=10, t=60, b=40),
+            plot_bgcolor="rgba(0,0,0,0)",
+            paper_bgcolor="rgba(0,0,0,0)",
+            xaxis=dict(type="category", gridcolor="rgba(148,163,184,0.12)"),
+            yaxis=dict(title="Ort. revizyon", gridcolor="rgba(148,163,184,0.12)"),
+            yaxis2=dict(title="Yayılma endeksi", overlaying="y", side="right",
+                        range=[-100, 100], showgrid=False),
+        )
+        with utils.perf_span("render.revizyon_momentumu", "grafik"):
+            st.plotly_chart(fig, use_container_width=True)
+
+    summ = (
+        rev_summary[
+            (rev_summary["metrik"] == mom_metric) & rev_summary["kategori"].isin(mom_cats)
+        ]
+        if not rev_summary.empty else rev_summary
+    )
+    if not summ.empty:
+        st.markdown("**Katılımcı bazında revizyon davranışı:**")
+        st.dataframe(
+            summ.drop(columns=["metrik"])
+            .sort_values("ort_mutlak_revizyon", ascending=False)
+            .rename(columns={
+                "kullanici_adi": "Katılımcı",
+                "kategori": "Kategori",
+                "tahmin_sayisi": "Tahmin",
+                "revizyon_sayisi": "Revizyon",
+                "ort_mutlak_revizyon": "Ort. |Δ|",
+                "ort_revizyon": "Ort. Δ",
+                "yukari_orani": "Yukarı oranı",
+                "ort_gun_arasi": "Ort. gün arası",
+            }),
+            column_config={
+                "Ort. |Δ|": st.column_config.NumberColumn(format="%.2f"),
+                "Ort. Δ": st.column_config.NumberColumn(format="%.2f"),
+                "Yukarı oranı": st.column_config.ProgressColumn(
+                    format="%.2f", min_value=0.0, max_value=1.0
+                ),
+                "Ort. gün arası": st.column_config.NumberColumn(format="%.0f"),
+            },
+            use_container_width=True,
+            hide_index=True,
+        )
+
+
+VIEWS = {
+    "📊 Zaman Serisi": render_timeseries,
+    "🔥 Isı Haritası": render_heatmap,
+    "📈 Tahmin Revizyonu": render_revision,
+    "🔁 Revizyon Analitiği": render_revision_analytics,
+}
+
+
+@st.fragment
+def render_views(data_version, df_latest, realized_df, as_of_month):
+    view = st.radio(
+        "Görünüm", list(VIEWS), horizontal=True, key="dash_view",
+        label_visibility="collapsed",
+    )
+    VIEWS[view](data_version, df_latest, realized_df, as_of_month)
+
+
+render_views(data_version, df_latest, realized_df, as_of_month)
+
+st.markdown("---")
+
+# =============================================================
+# 📦 RAPOR PAKETİ
+# =============================================================
+@st.fragment(run_every=2)
+def report_progress(key):
+    """Rapor hazırlanırken yalnızca bu küçük parça periyodik yenilenir."""
+    state, _ = utils.report_status(key)
+    if state == "hazırlanıyor":
+        st.info("⏳ Rapor arka planda hazırlanıyor; sayfayı kullanmaya devam edebilirsiniz.")
+    else:
+        st.rerun()
+
+
+@st.fragment
+def render_report(data_version, market_key):
+    st.markdown("### 📦 Aylık Rapor Paketi")
+    st.caption(
+        "Tüm dönemlerin liderlik tabloları, ısı haritaları, konsensüs patikaları ve "
+        "revizyon istatistikleri tek Excel dosyasında; grafikler PNG olarak eklenir. "
+        "Aynı veri sürümü için rapor bir kez üretilir."
+    )
+
+    key = st.session_state.get("report_key")
+    state, result = utils.report_status(key)
+    if state in ("hazır", "hazırlanıyor") and result is not None and result["version"] != data_version:
+        state = "yok"  # veri değişti; eski rapor yerine yenisi hazırlanmalı
+
+    if state == "hazırlanıyor":
+        report_progress(key)
+        return
+
+    if state == "hata":
+        st.error(f"Rapor hazırlanamadı: {result}")
+
+    if state != "hazır":
+        if st.button("📦 Raporu hazırla"):
+            st.session_state["report_key"] = utils.submit_report(data_version, market_key)
+            st.rerun(scope="fragment")
+        return
+
+    st.caption(
+        f"✅ {result['olusturma']} • {len(result['sayfalar'])} sayfa • "
+        f"{result['grafik_sayisi']} grafik"
+    )
+    try:
+        rc1, rc2 = st.columns(2)
+        with open(result["xlsx"], "rb") as fh:
+            rc1.download_button(
+                "📥 Excel", fh, file_name=f"tahmin_raporu_v{data_version}.xlsx",
+                mime=utils.EXPORT_FORMATLARI["Excel"][1],
+            )
+        with open(result["zip"], "rb") as fh:
+            rc2.download_button(
+                "📥 Excel + grafikler (zip)", fh,
+                file_name=f"tahmin_raporu_v{data_version}.zip", mime="application/zip",
+            )
+    except FileNotFoundError:
+        st.session_state.pop("report_key", None)
+        st.warning("Rapor dosyası bulunamadı; yeniden hazırlayın.")
+
+
+render_report(data_version, market_key)
@@ -5,8 +5,11 @@ import utils
 
 st.set_page_config(page_title="Excel Yükleme", layout="wide")
 utils.apply_theme()
+utils.start_background_refresh()
 
 utils.require_login_page()
+utils.perf_start_run("Excel_Yukleme")
+utils.profile_controls("Excel_Yukleme")
 
 utils.page_header("📥 Toplu Excel Yükleme", "Bir Excel dosyasıyla toplu tahmin ekle")
 
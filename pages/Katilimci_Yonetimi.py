@@ -5,8 +5,11 @@ import utils
 
 st.set_page_config(page_title="Katılımcı Yönetimi", layout="wide")
 utils.apply_theme()
+utils.start_background_refresh()
 
 utils.require_login_page()
+utils.perf_start_run("Katilimci_Yonetimi")
+utils.profile_controls("Katilimci_Yonetimi")
 
 utils.page_header("👥 Katılımcı Yönetimi", "Kurumsal, anket ve bireysel katılımcıları düzenle")
 
@@ -4,8 +4,11 @@ import utils
 
 st.set_page_config(page_title="Veri Girişi", layout="wide")
 utils.apply_theme()
+utils.start_background_refresh()
 
 utils.require_login_page()
+utils.perf_start_run("Manuel_Veri_Girisi")
+utils.profile_controls("Manuel_Veri_Girisi")
 
 utils.page_header("➕ Manuel Veri Girişi", "Tek bir tahmin kaydı ekle veya güncelle")
 
@@ -7,8 +7,11 @@ import utils
 
 st.set_page_config(page_title="Piyasa Verileri", layout="wide")
 utils.apply_theme()
+utils.start_background_refresh()
 
 utils.require_login_page()
+utils.perf_start_run("Piyasa_Verileri")
+utils.profile_controls("Piyasa_Verileri")
 
 utils.page_header(
     "📊 Resmi Piyasa Verileri",
@@ -17,7 +20,7 @@ utils.page_header(
 
 # Tarih seçimi
 c1, c2, c3 = st.columns([1, 1, 2])
-start_date = c1.date_input("Başlangıç", datetime.date(2023, 1, 1))
+start_date = c1.date_input("Başlangıç", utils.PIYASA_SAYFA_BASLANGIC)
 end_date = c2.date_input("Bitiş", datetime.date.today())
 
 if start_date > end_date:
@@ -35,44 +38,49 @@ if st.button("🔄 Verileri Getir", type="primary"):
     else:
         st.success(f"✅ {len(df)} aylık gözlem getirildi.")
 
-        # Grafik
-        fig = go.Figure()
-        if "Aylık TÜFE" in df.columns:
-            fig.add_trace(go.Scatter(
-                x=df["Donem"], y=df["Aylık TÜFE"],
-                mode="lines+markers", name="Aylık TÜFE (%)",
-                line=dict(color="#F59E0B", width=2),
-            ))
-        if "Yıllık TÜFE" in df.columns:
-            fig.add_trace(go.Scatter(
-                x=df["Donem"], y=df["Yıllık TÜFE"],
-                mode="lines+markers", name="Yıllık TÜFE (%)",
-                line=dict(color="#EF4444", width=2),
-                yaxis="y2",
-            ))
-        if "PPK Faizi" in df.columns:
-            fig.add_trace(go.Scatter(
-                x=df["Donem"], y=df["PPK Faizi"],
-                mode="lines+markers", name="PPK Faizi (%)",
-                line=dict(color="#3B82F6", width=2, dash="dash"),
-                yaxis="y2",
-            ))
+        # Grafik — aynı veriyle figür yeniden kurulmaz
+        def build_market_fig() -> go.Figure:
+            fig = go.Figure()
+            # Uzun aralıklarda WebGL + uç değerleri koruyan seyreltme
+            n_total = len(df) * 3
+            if "Aylık TÜFE" in df.columns:
+                fig.add_trace(utils.fast_trace(
+                    df["Donem"], df["Aylık TÜFE"], n_total=n_total,
+                    mode="lines+markers", name="Aylık TÜFE (%)",
+                    line=dict(color="#F59E0B", width=2),
+                ))
+            if "Yıllık TÜFE" in df.columns:
+                fig.add_trace(utils.fast_trace(
+                    df["Donem"], df["Yıllık TÜFE"], n_total=n_total,
+                    mode="lines+markers", name="Yıllık TÜFE (%)",
+                    line=dict(color="#EF4444", width=2),
+                    yaxis="y2",
+                ))
+            if "PPK Faizi" in df.columns:
+                fig.add_trace(utils.fast_trace(
+                    df["Donem"], df["PPK Faizi"], n_total=n_total,
+                    mode="lines+markers", name="PPK Faizi (%)",
+                    line=dict(color="#3B82F6", width=2, dash="dash"),
+                    yaxis="y2",
+                ))
 
-        fig.update_layout(
-            title="TÜFE ve Politika Faizi",
-            hovermode="x unified",
-            legend=dict(orientation="h", y=1.1),
-            yaxis=dict(title="Aylık TÜFE (%)", side="left"),
-            yaxis2=dict(
-                title="Yıllık TÜFE / PPK Faizi (%)",
-                side="right", overlaying="y",
-            ),
-            height=450,
-            plot_bgcolor="rgba(0,0,0,0)",
-            paper_bgcolor="rgba(0,0,0,0)",
-            margin=dict(l=10, r=10, t=60, b=40),
-        )
-        st.plotly_chart(fig, use_container_width=True)
+            fig.update_layout(
+                title="TÜFE ve Politika Faizi",
+                hovermode="x unified",
+                legend=dict(orientation="h", y=1.1),
+                yaxis=dict(title="Aylık TÜFE (%)", side="left"),
+                yaxis2=dict(
+                    title="Yıllık TÜFE / PPK Faizi (%)",
+                    side="right", overlaying="y",
+                ),
+                height=450,
+                plot_bgcolor="rgba(0,0,0,0)",
+                paper_bgcolor="rgba(0,0,0,0)",
+                margin=dict(l=10, r=10, t=60, b=40),
+            )
+            return fig
+
+        utils.plotly_chart_cached(build_market_fig, "piyasa", df, use_container_width=True)
 
         # Tablo
         st.markdown("#### Aylık Veri Tablosu")
@@ -1,11 +1,16 @@
+import os
 import time
+import plotly.graph_objects as go
 import streamlit as st
 import utils
 
 st.set_page_config(page_title="Sistem Yönetimi", layout="wide")
 utils.apply_theme()
+utils.start_background_refresh()
 
 utils.require_login_page()
+utils.perf_start_run("Sistem_Yonetimi")
+utils.profile_controls("Sistem_Yonetimi")
 
 utils.page_header(
     "⚙️ Sistem Yönetimi",
@@ -39,9 +44,44 @@ with col_demo2:
         unsafe_allow_html=True,
     )
 
+with st.expander("⚙️ Hacim ayarları (yük testi)", expanded=False):
+    vc1, vc2, vc3, vc4 = st.columns(4)
+    n_participants = vc1.number_input(
+        "Katılımcı", min_value=1, max_value=100_000, value=len(utils.DEMO_KATILIMCILAR), step=1,
+        help="İlk 16'sı sabit demo listesi; fazlası 'Sentetik Katılımcı' olarak eklenir.",
+    )
+    n_months = vc2.number_input("Ay", min_value=1, max_value=240, value=12, step=1)
+    revizyon = vc3.number_input(
+        "Aylık revizyon (bireysel, en fazla)", min_value=1, max_value=27, value=3, step=1,
+    )
+    ufuklar = vc4.multiselect(
+        "Ufuklar (ay)", list(range(0, 25)), default=list(utils.DEMO_UFUKLAR),
+        help="Tahmin ayına göre hedef ay farkları; yıl sonu hedefi her zaman eklenir.",
+    )
+    gen_kwargs = dict(
+        n_participants=int(n_participants), n_months=int(n_months),
+        revizyon=int(revizyon), ufuklar=tuple(sorted(ufuklar)),
+    )
+
+    if st.button("📦 Veritabanına yazmadan Parquet üret"):
+        with st.spinner("Parquet yazılıyor..."):
+            os.makedirs(utils.EXPORT_DIR, exist_ok=True)
+            path = os.path.join(utils.EXPORT_DIR, f"sentetik_{int(seed)}.parquet")
+            n_rows = utils.write_synthetic_parquet(path, seed=int(seed), **gen_kwargs)
+        st.session_state["synth_parquet"] = (path, n_rows)
+
+    synth = st.session_state.get("synth_parquet")
+    if synth and os.path.exists(synth[0]):
+        with open(synth[0], "rb") as fh:
+            st.download_button(
+                f"📥 sentetik.parquet ({synth[1]:,} satır)", fh,
+                file_name=os.path.basename(synth[0]),
+                mime=utils.EXPORT_FORMATLARI["Parquet"][1],
+            )
+
 if st.button("🚀 Demo Verisi Üret", type="primary", use_container_width=True):
-    with st.spinner("Demo verisi oluşturuluyor... (bu 30-60 saniye sürebilir)"):
-        added_p, added_f, msg = utils.generate_demo_data(seed=int(seed))
+    with st.spinner("Demo verisi oluşturuluyor..."):
+        added_p, added_f, msg = utils.generate_demo_data(seed=int(seed), **gen_kwargs)
     st.success(f"✅ {msg}")
     st.balloons()
     time.sleep(0.5)
@@ -127,8 +167,10 @@ st.markdown("---")
 st.markdown("### 📊 Mevcut Durum")
 
 try:
-    df = utils.get_all_forecasts()
-    df_k = utils.get_participants()
+    loaded = utils.load_page_data(tahmin=True, katilimci=True)
+    if loaded["hata"]:
+        raise RuntimeError("; ".join(loaded["hata"].values()))
+    df, df_k = loaded["veri"]["tahmin"], loaded["veri"]["katilimci"]
 
     c1, c2, c3, c4 = st.columns(4)
     c1.metric("Toplam Tahmin", f"{len(df):,}")
@@ -144,3 +186,177 @@ try:
             )
 except Exception as e:
     st.error(f"Durum alınamadı: {e}")
+
+st.markdown("---")
+
+# =================================================================
+# BÖLÜM 5: PERFORMANS
+# =================================================================
+st.markdown("### ⏱️ Performans")
+st.caption(
+    "Son sayfa çalıştırmalarında ağ (Supabase, EVDS, BIS), pandas ve grafik adımlarına "
+    "harcanan süre. Cache'ten dönen çağrılar ölçülmez; yalnızca gerçekten çalışan adımlar görünür."
+)
+
+runs = utils.perf_runs()
+if runs.empty:
+    st.info("Henüz ölçüm yok. Diğer sayfaları gezdikten sonra burayı yenileyin.")
+else:
+    kat_cols = [f"{k} (ms)" for k in utils.PERF_KATEGORILER]
+    ms_fmt = {c: "{:,.0f}" for c in ["Toplam (ms)", *kat_cols]}
+    over = runs["Supabase istek"] > utils.SUPABASE_ISTEK_UYARI
+    st.dataframe(
+        runs.style.format(ms_fmt).apply(
+            lambda col: ["color:#FCA5A5;font-weight:600" if o else "" for o in over],
+            subset=["Supabase istek"],
+        ),
+        hide_index=True, use_container_width=True, height=280,
+    )
+    if over.any():
+        st.warning(
+            f"⚠️ {int(over.sum())} çalıştırma Supabase'e {utils.SUPABASE_ISTEK_UYARI}'den fazla "
+            "istek yaptı — döngü içinde sorgu (N+1) olabilir. Detayda tablo/işlem dökümüne bakın."
+        )
+
+    pc1, pc2 = st.columns([3, 1])
+    run_no = pc1.selectbox(
+        "Çalıştırma detayı",
+        runs["no"].tolist(),
+        format_func=lambda i: f"{runs.at[i, 'Zaman']} — {runs.at[i, 'Sayfa']} "
+                              f"({runs.at[i, 'Toplam (ms)']:,.0f} ms)",
+        key="perf_run_no",
+    )
+    if pc2.button("🧹 Ölçümleri temizle", use_container_width=True):
+        utils.perf_reset()
+        st.rerun()
+
+    spans = utils.perf_run_spans(run_no)
+    if spans.empty:
+        st.caption("Bu çalıştırmada ölçülen adım yok (tümü cache'ten geldi).")
+    else:
+        fig = go.Figure(go.Bar(
+            y=spans["op"], x=spans["ms"], base=spans["baslangic_ms"],
+            orientation="h",
+            marker_color=spans["kategori"].map(
+                {"ağ": "#F59E0B", "pandas": "#3B82F6", "grafik": "#10B981"}
+            ),
+            hovertemplate="%{y}<br>%{base:,.0f} ms → +%{x:,.0f} ms<extra></extra>",
+        ))
+        fig.update_layout(
+            height=max(220, 40 + 22 * len(spans)),
+            margin=dict(l=10, r=10, t=10, b=30),
+            xaxis_title="ms (sayfa başından)",
+            yaxis=dict(autorange="reversed"),
+            plot_bgcolor="rgba(0,0,0,0)",
+            paper_bgcolor="rgba(0,0,0,0)",
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    sb_fmt = {"Satır": "{:,.0f}", "Bayt": "{:,.0f}"}
+    uc1, uc2 = st.columns(2)
+    with uc1:
+        st.markdown("**Supabase — bu çalıştırma**")
+        usage = utils.supabase_usage(run_no)
+        if usage.empty:
+            st.caption("Supabase isteği yok.")
+        else:
+            st.dataframe(usage.style.format(sb_fmt), hide_index=True, use_container_width=True)
+    with uc2:
+        st.markdown("**Supabase — bu oturum (tüm sayfalar)**")
+        usage = utils.supabase_usage()
+        if usage.empty:
+            st.caption("Supabase isteği yok.")
+        else:
+            st.dataframe(usage.style.format(sb_fmt), hide_index=True, use_container_width=True)
+
+    st.markdown("**İşlem bazında dağılım**")
+    stats = utils.perf_op_stats()
+    st.dataframe(
+        stats.style.format({
+            "p50 (ms)": "{:,.1f}", "p95 (ms)": "{:,.1f}", "Maks (ms)": "{:,.1f}",
+            "Ort. satır": "{:,.0f}", "Ort. bayt": "{:,.0f}",
+        }, na_rep="—"),
+        hide_index=True, use_container_width=True,
+    )
+
+st.markdown("#### 🔁 Arka plan yenileme")
+refresh = utils.refresh_status()
+if refresh.empty:
+    st.caption("Arka plan yenileme kapalı (`[refresh] etkin = false`).")
+else:
+    rc1, rc2 = st.columns([4, 1])
+    rc1.caption(
+        "Tahminler, katılımcılar ve piyasa verisi TTL dolmadan arka planda tazelenir; "
+        "sayfalar her zaman sıcak veriyi okur."
+    )
+    if rc2.button("🔁 Şimdi yenile", use_container_width=True):
+        utils.refresh_now()
+        st.toast("Yenileme sıraya alındı.")
+    st.dataframe(
+        refresh.style.format({"Süre (ms)": "{:,.0f}", "Sonraki (sn)": "{:,.0f}"}, na_rep="—"),
+        hide_index=True, use_container_width=True,
+    )
+
+kanal = utils.change_listener_status()
+if kanal is None:
+    st.caption("Değişiklik kanalı kapalı (`[degisiklik] kanal = \"kapali\"`).")
+else:
+    son = kanal["son"].strftime("%H:%M:%S") if kanal["son"] else "—"
+    st.caption(
+        f"📣 Değişiklik kanalı: **{kanal['kanal']}** • alınan {kanal['alinan']} • "
+        f"uygulanan {kanal['uygulanan']} • delta {kanal['delta']} / tam yükleme {kanal['tam']} • "
+        f"son olay {son}"
+        + (f" • ⚠️ {kanal['hata']}" if kanal["hata"] else "")
+    )
+
+st.markdown("#### 🧊 Paylaşılan çerçeve cache'i")
+frames = utils.frame_cache_stats()
+st.caption(
+    f"Büyük tablolar süreç genelinde tek kopya tutulur: {len(frames)} girdi, "
+    f"{frames['MB'].sum():,.1f} / {utils.FRAME_CACHE_MAX_MB:,} MB."
+)
+if not frames.empty:
+    st.dataframe(
+        frames.iloc[::-1].style.format({"MB": "{:,.1f}", "Yaş (sn)": "{:,.0f}"}, na_rep="—"),
+        hide_index=True, use_container_width=True,
+    )
+
+st.markdown("#### 🔬 Profiller")
+st.caption(
+    "Herhangi bir sayfada kenar çubuğundaki **Sonraki çalıştırmayı profille** anahtarını açın; "
+    "o çalıştırma fonksiyon düzeyinde örneklenir ve burada listelenir."
+)
+
+profiles = utils.profile_list()
+if profiles.empty:
+    st.info("Henüz profil yok.")
+else:
+    qc1, qc2 = st.columns([3, 1])
+    prof_no = qc1.selectbox(
+        "Profil",
+        profiles["no"].tolist(),
+        format_func=lambda k: (
+            lambda r: f"{r['Zaman']} — {r['Sayfa']} ({r['Süre (ms)']:,.0f} ms, {r['Örnek']} örnek)"
+        )(profiles.set_index("no").loc[k]),
+        key="profil_no",
+    )
+    top_n = qc2.number_input("İlk N", min_value=10, max_value=200, value=30, step=10)
+
+    top = utils.profile_top(prof_no, int(top_n))
+    if top.empty:
+        st.caption("Profil boş — çalıştırma örnekleme aralığından kısa sürmüş.")
+    else:
+        st.dataframe(
+            top.style.format({
+                "Kümülatif (ms)": "{:,.1f}", "Öz (ms)": "{:,.1f}", "Kümülatif %": "{:.1f}",
+            }),
+            hide_index=True, use_container_width=True, height=420,
+        )
+        row = profiles.set_index("no").loc[prof_no]
+        st.download_button(
+            "📥 Profili indir (katlanmış yığın)",
+            utils.profile_collapsed(prof_no),
+            file_name=f"profil_{row['Sayfa']}_{row['Zaman'].replace(':', '')}.txt",
+            mime="text/plain",
+            help="speedscope.app veya flamegraph.pl ile açılabilir.",
+        )
@@ -3,39 +3,96 @@ import utils
 
 st.set_page_config(page_title="Veri Havuzu", layout="wide")
 utils.apply_theme()
+utils.start_background_refresh()
 
 utils.require_login_page()
+utils.perf_start_run("Veri_Havuzu")
+utils.profile_controls("Veri_Havuzu")
 
 utils.page_header("🗃️ Veri Havuzu", "Tüm tahminleri görüntüle, filtrele ve sil")
 
-df = utils.get_all_forecasts()
+data_version = utils.get_data_version()
 
-if df.empty:
-    st.warning("Veri bulunamadı.")
-    st.stop()
-
-# ---- Filtreler ----
+# ---- Filtreler (sunucuda uygulanır) ----
 with st.container():
     st.markdown("#### 🔍 Filtreler")
     fc1, fc2, fc3 = st.columns(3)
-    cats = sorted(df["kategori"].dropna().unique().tolist()) if "kategori" in df.columns else []
-    sel_cats = fc1.multiselect("Kategori", cats, default=cats)
+    sel_cats = fc1.multiselect("Kategori", utils.KATEGORILER, default=utils.KATEGORILER)
 
-    users = sorted(df["kullanici_adi"].dropna().unique().tolist())
-    sel_users = fc2.multiselect("Katılımcı", users)
+    df_k = utils.get_participants()
+    users = sorted(df_k["ad_soyad"].dropna().tolist()) if not df_k.empty else []
+    sel_users = fc2.multiselect(
+        "Katılımcı", users,
+        help="Katılımcı listesinden gelir; eksik isim varsa Sistem Yönetimi → Senkronize Et.",
+    )
 
-    periods = sorted(df["hedef_donemi"].dropna().unique().tolist())
+    periods = utils.get_period_list(yil_geri=5, yil_ileri=3)
     sel_periods = fc3.multiselect("Hedef Dönem", periods)
 
-df_view = df.copy()
-if sel_cats:
-    df_view = df_view[df_view["kategori"].isin(sel_cats)]
-if sel_users:
-    df_view = df_view[df_view["kullanici_adi"].isin(sel_users)]
-if sel_periods:
-    df_view = df_view[df_view["hedef_donemi"].isin(sel_periods)]
+# Tüm kategoriler seçiliyse filtre göndermeye gerek yok
+filters = (
+    tuple(sel_cats) if set(sel_cats) != set(utils.KATEGORILER) else (),
+    tuple(sel_users),
+    tuple(sel_periods),
+)
+
+total_all = utils.count_forecasts(data_version)
+if total_all == 0:
+    st.warning("Veri bulunamadı.")
+    st.stop()
 
-st.caption(f"📊 Gösterilen: **{len(df_view):,}** / {len(df):,} kayıt")
+total = utils.count_forecasts(data_version, *filters) if any(filters) else total_all
+
+# ---- Sıralama & sayfa ----
+sc1, sc2, sc3, sc4 = st.columns([2, 1, 1, 2])
+sort_label = sc1.selectbox("Sırala", list(utils.SIRALANABILIR_KOLONLAR))
+sort_desc = sc2.toggle("Azalan", value=True)
+page_size = sc3.selectbox(
+    "Sayfa boyu", utils.VERI_HAVUZU_SAYFA_BOYLARI,
+    index=utils.VERI_HAVUZU_SAYFA_BOYLARI.index(utils.VERI_HAVUZU_PAGE_SIZE),
+)
+n_pages = max(1, -(-total // page_size))
+page = int(sc4.number_input("Sayfa", min_value=1, value=1, step=1, key="havuz_page"))
+page = min(page, n_pages)
+
+df_view = utils.query_forecasts(
+    data_version, *filters,
+    order_by=utils.SIRALANABILIR_KOLONLAR[sort_label], desc=sort_desc,
+    page=page, page_size=page_size,
+)
+
+first = (page - 1) * page_size + 1 if total else 0
+st.caption(
+    f"📊 Filtreye uyan: **{total:,}** / {total_all:,} kayıt • "
+    f"Gösterilen: {first:,}–{min(page * page_size, total):,} (sayfa {page}/{n_pages})"
+)
+
+with st.expander("⬇️ Filtreye uyanları dışa aktar", expanded=False):
+    ec1, ec2 = st.columns([1, 2])
+    exp_fmt = ec1.selectbox("Format", list(utils.EXPORT_FORMATLARI), key="havuz_exp_fmt")
+    ext, mime = utils.EXPORT_FORMATLARI[exp_fmt]
+    if ec2.button(f"Hazırla ({total:,} kayıt)", disabled=(total == 0)):
+        with st.spinner("Dosya hazırlanıyor..."):
+            try:
+                path, n = utils.export_forecasts(ext, *filters)
+                previous = st.session_state.get("havuz_export")
+                if previous:
+                    utils.discard_export(previous[0])
+                st.session_state["havuz_export"] = (path, n, ext, mime)
+            except Exception as e:
+                st.error(f"Dışa aktarım hatası: {e}")
+
+    prepared = st.session_state.get("havuz_export")
+    if prepared and prepared[2] == ext:
+        path, n, _, _ = prepared
+        try:
+            with open(path, "rb") as fh:
+                st.download_button(
+                    f"📥 İndir ({n:,} satır)", fh,
+                    file_name=f"tahminler.{ext}", mime=mime,
+                )
+        except FileNotFoundError:
+            st.session_state.pop("havuz_export", None)
 
 col1, col2 = st.columns([4, 1])
 with col1:
@@ -51,6 +108,25 @@ with col2:
 if delete_mode:
     st.warning("⚠️ Seçilen satırlar kalıcı olarak silinir.")
 
+    with st.expander("🧹 Filtreye uyan tüm kayıtları sil", expanded=False):
+        if not any(filters):
+            st.info("Önce yukarıdan en az bir filtre seçin (kategori, katılımcı veya dönem).")
+        else:
+            st.markdown(f"Bu işlem filtreye uyan **{total:,}** kaydı tek seferde siler.")
+            bulk_confirm = st.text_input(
+                "Onaylamak için **SIL** yazınız", placeholder="SIL", key="bulk_confirm",
+            )
+            if st.button("🔥 Filtreye Uyanları Sil", type="primary",
+                         disabled=(bulk_confirm != "SIL" or total == 0)):
+                with st.spinner("Siliniyor..."):
+                    ok, msg = utils.delete_tahmin_by_filter(*filters)
+                if ok:
+                    st.success(msg)
+                    st.rerun()
+                else:
+                    st.error(f"Silme hatası: {msg}")
+
+    # Yalnızca bu sayfanın satırları editöre gider
     df_sel = df_view.copy()
     df_sel.insert(0, "Sec", False)
 
@@ -0,0 +1,30 @@
+"""
+Ortak test düzeni: utils ve benchmarks import yolunda, Supabase yerine
+load_apptest'teki bellek içi taklit. Testler secrets veya ağ gerektirmez.
+"""
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+
+# load_apptest anlık görüntü dizinini utils'ten önce ayarlar
+import load_apptest  # noqa: E402
+import utils  # noqa: E402
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Tohumlanmış FakeSupabase; get_supabase bu istemciyi sarar."""
+    fake = load_apptest.seed_backend(300)
+    monkeypatch.setattr(utils, "_supabase_client", lambda: fake)
+    utils.get_supabase.clear()
+    yield fake
+    utils.get_supabase.clear()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(load_apptest._SNAP_DIR, ignore_errors=True)
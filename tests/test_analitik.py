@@ -0,0 +1,144 @@
+"""Revizyon momentumu, konsensüs ağırlıkları ve grafik seyreltme — elle hesaplanmış beklentiler."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils
+
+
+def _rev(rows):
+    return pd.DataFrame(rows, columns=["metrik", "tahmin_tarihi", "revizyon"]).assign(
+        tahmin_tarihi=lambda d: pd.to_datetime(d["tahmin_tarihi"])
+    )
+
+
+def test_momentum_bos_aylari_takvime_acar():
+    # Ocak +3, Şubat–Mart revizyon yok, Nisan −1; ilk tahmin (NaN) sayılmaz
+    rev = _rev([
+        ("tahmin_ppk_faiz", "2024-01-05", np.nan),
+        ("tahmin_ppk_faiz", "2024-01-20", 3.0),
+        ("tahmin_ppk_faiz", "2024-04-10", -1.0),
+    ])
+    out = utils._revision_momentum(rev)
+
+    assert out["ay"].tolist() == ["2024-01", "2024-02", "2024-03", "2024-04"]
+    assert out["revizyon_sayisi"].tolist() == [1, 0, 0, 1]
+    np.testing.assert_allclose(out["ort_revizyon"], [3.0, np.nan, np.nan, -1.0])
+    np.testing.assert_allclose(out["yayilma_endeksi"], [100.0, np.nan, np.nan, -100.0])
+    # Nisan penceresi Şubat–Nisan: yalnız −1; boşluk atlansaydı (3 − 1) / 2 = 1 olurdu
+    np.testing.assert_allclose(out["momentum_3a"], [3.0, 3.0, 3.0, -1.0])
+
+
+def test_momentum_bos_girdi():
+    out = utils._revision_momentum(_rev([]))
+    assert out.empty
+    assert "momentum_3a" in out.columns
+
+
+def _toy_forecasts():
+    """
+    3 katılımcı × 3 as-of ay, tek hedef (2024-03). Küp:
+        a: 2, 2, 1   (Ocak'taki iki tahminden sonuncusu; Mart'ta revize)
+        b: 2, 2, 2   (Ocak tahmini ileri taşınır)
+        c: —, 9, 9   (Şubat'ta katılır)
+    """
+    rows = [
+        ("a", "Bireysel", "2024-01-03", 5.0),
+        ("a", "Bireysel", "2024-01-25", 2.0),
+        ("a", "Bireysel", "2024-03-10", 1.0),
+        ("b", "Bireysel", "2024-01-15", 2.0),
+        ("c", "Kurumsal", "2024-02-12", 9.0),
+    ]
+    df = pd.DataFrame(rows, columns=["kullanici_adi", "kategori", "tahmin_tarihi", "tahmin_ppk_faiz"])
+    return df.assign(tahmin_tarihi=pd.to_datetime(df["tahmin_tarihi"]), hedef_donemi="2024-03")
+
+
+def test_beklenti_kupu_son_tahmini_ileri_tasir():
+    cube = utils._expectation_cube(_toy_forecasts(), "tahmin_ppk_faiz")
+    assert cube.columns.tolist() == ["2024-01", "2024-02", "2024-03"]
+    np.testing.assert_allclose(cube.loc[("a", "2024-03")], [2.0, 2.0, 1.0])
+    np.testing.assert_allclose(cube.loc[("b", "2024-03")], [2.0, 2.0, 2.0])
+    np.testing.assert_allclose(cube.loc[("c", "2024-03")], [np.nan, 9.0, 9.0])
+
+
+def test_konsensus_budanmis_ve_kategori(monkeypatch):
+    # n = 3'te her uçtan floor(3 × 0.34) = 1 değer atılır
+    monkeypatch.setattr(utils, "KONSENSUS_TRIM", 0.34)
+    out = utils._consensus_frame(_toy_forecasts(), None, "tahmin_ppk_faiz").set_index("ay")
+
+    assert out["N"].tolist() == [2, 3, 3]
+    np.testing.assert_allclose(out["Eşit Ağırlık"], [2.0, 13 / 3, 4.0])
+    np.testing.assert_allclose(out["Piyasa Medyanı"], [2.0, 2.0, 2.0])
+    # Ocak: n = 2 → floor(0.68) = 0, budama yok
+    np.testing.assert_allclose(out["Budanmış Ort."], [2.0, 2.0, 2.0])
+    # Mart: Bireysel (1 + 2) / 2 = 1.5, Kurumsal 9 → (1.5 + 9) / 2
+    np.testing.assert_allclose(out["Kategori Ağırlıklı"], [2.0, 5.5, 5.25])
+    # Gerçekleşme yok → ağırlıklar eşit
+    np.testing.assert_allclose(out["Ters-MSE"], out["Eşit Ağırlık"])
+
+
+def test_konsensus_ters_mse_agirliklari(monkeypatch):
+    # Mart'ta a: mse 1 → w 1, b: mse 0.5 → w 2, c: geçmiş yok → medyan 1.5
+    mse = pd.DataFrame(
+        {"2024-03": [1.0, 0.5]}, index=pd.Index(["a", "b"], name="kullanici_adi"),
+    ).reindex(columns=["2024-01", "2024-02", "2024-03"])
+    monkeypatch.setattr(utils, "_trailing_mse", lambda *a, **k: mse)
+    realized = pd.DataFrame({"Donem": ["2024-01"], "PPK Faizi": [45.0]})
+
+    out = utils._consensus_frame(_toy_forecasts(), realized, "tahmin_ppk_faiz").set_index("ay")
+    assert out.loc["2024-03", "Ters-MSE"] == pytest.approx((1 * 1 + 2 * 2 + 1.5 * 9) / 4.5)
+    # Hiç ağırlığı olmayan ayda eşit ağırlık
+    assert out.loc["2024-02", "Ters-MSE"] == pytest.approx(13 / 3)
+
+
+def _long(rows):
+    return pd.DataFrame(rows, columns=["kullanici_adi", "hedef_donemi", "ay", "deger"])
+
+
+def test_trailing_mse_bir_ay_gecikmeli(monkeypatch):
+    monkeypatch.setattr(utils, "KONSENSUS_MIN_HATA", 1)
+    long = _long([
+        ("a", "2024-01", "2024-01", 11.0),   # gerçekleşen 10 → hata² 1
+        ("a", "2024-02", "2024-02", 10.0),   # gerçekleşen 12 → hata² 4
+        ("a", "2024-02", "2024-01", 99.0),   # hedef ayı sonundaki tahmin değil → sayılmaz
+        ("b", "2024-01", "2024-01", 13.0),   # hata² 9
+        ("b", "2024-02", "2024-02", 12.0),   # hata² 0
+    ])
+    realized = pd.DataFrame({"Donem": ["2024-01", "2024-02"], "PPK Faizi": [10.0, 12.0]})
+    months = pd.Index(["2024-01", "2024-02", "2024-03"])
+
+    mse = utils._trailing_mse(long, months, realized, "tahmin_ppk_faiz")
+    np.testing.assert_allclose(mse.loc["a"], [np.nan, 1.0, 2.5])
+    np.testing.assert_allclose(mse.loc["b"], [np.nan, 9.0, 4.5])
+
+
+def test_trailing_mse_yil_sonu_araliga_yazilir(monkeypatch):
+    monkeypatch.setattr(utils, "KONSENSUS_MIN_HATA", 1)
+    # 2024-03 hedefli yıl sonu tahmini Aralık 2024 yıllık TÜFE'siyle ölçülür
+    long = _long([("a", "2024-03", "2024-03", 40.0)])
+    realized = pd.DataFrame({"Donem": ["2024-03", "2024-12"], "Yıllık TÜFE": [70.0, 44.0]})
+    months = pd.Index(["2024-03", "2024-11", "2024-12", "2025-01"])
+
+    mse = utils._trailing_mse(long, months, realized, "tahmin_yilsonu_enf")
+    np.testing.assert_allclose(mse.loc["a"], [np.nan, np.nan, np.nan, 16.0])
+
+
+def test_downsample_minmax_uc_degerleri_korur():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=5000)
+    y[1234], y[4321] = 50.0, -50.0
+    x = np.arange(len(y))
+
+    xs, ys = utils.downsample_minmax(x, y, max_points=80)
+    assert len(ys) <= 80
+    assert ys.max() == 50.0 and ys.min() == -50.0
+    assert xs[0] == 0 and xs[-1] == len(y) - 1
+    assert np.all(np.diff(xs) > 0)
+    np.testing.assert_array_equal(ys, y[xs])
+
+
+def test_downsample_minmax_kisa_seriye_dokunmaz():
+    x, y = np.arange(10), np.linspace(0, 1, 10)
+    xs, ys = utils.downsample_minmax(x, y, max_points=80)
+    np.testing.assert_array_equal(xs, x)
+    np.testing.assert_array_equal(ys, y)
@@ -0,0 +1,73 @@
+"""Değişiklik birleştirme ve keyset sayfalama — FakeSupabase üzerinde tam yüklemeyle karşılaştırma."""
+import io
+
+import pandas as pd
+import pytest
+
+import utils
+
+TAHMIN = utils.TABLE_TAHMIN
+_full_load = utils.get_all_forecasts.__wrapped__
+
+
+def _by_id(df):
+    return df.sort_values("id").reset_index(drop=True)
+
+
+def _ids(backend, n, start=0):
+    return backend.tables[TAHMIN]["id"].iloc[start:start + n].tolist()
+
+
+def test_silme_birlesimi_tam_yuklemeye_esit(backend):
+    df = _full_load()
+    gone = _ids(backend, 5, start=10)
+    backend.table(TAHMIN).delete().in_("id", gone).execute()
+
+    merged = utils._merge_forecast_rows(df, utils._degisiklik(TAHMIN, gone, "sil"), {"limit": 20000})
+    pd.testing.assert_frame_equal(_by_id(merged), _by_id(_full_load()))
+
+
+def test_yazma_birlesimi_tam_yuklemeye_esit(backend):
+    df = _full_load()
+    # Biri güncellenen, biri yeni eklenen satır
+    changed = _ids(backend, 1, start=42)
+    backend.table(TAHMIN).update({"tahmin_ppk_faiz": 1.25}).eq("id", changed[0]).execute()
+    row = backend.tables[TAHMIN].iloc[0].drop("id").to_dict()
+    new = backend.table(TAHMIN).insert({**row, "tahmin_tarihi": "2026-01-15"}).execute().data
+    keys = changed + [r["id"] for r in new]
+
+    merged = utils._merge_forecast_rows(df, utils._degisiklik(TAHMIN, keys), {"limit": 20000})
+    full = _full_load()
+    pd.testing.assert_frame_equal(_by_id(merged), _by_id(full))
+    # Sıra da sorgununki: tahmin_tarihi azalan
+    assert merged["tahmin_tarihi"].is_monotonic_decreasing
+    assert merged["id"].iloc[0] == new[0]["id"]
+
+
+def test_limite_dayanan_tablo_birlestirilmez(backend):
+    df = _full_load()
+    assert utils._merge_forecast_rows(df, utils._degisiklik(TAHMIN, _ids(backend, 1)), {"limit": len(df)}) is None
+
+
+@pytest.mark.parametrize("filtre", [{}, {"kategoriler": ("Bireysel",)}])
+def test_keyset_sayfalama_eksiksiz_ve_tekrarsiz(backend, filtre):
+    pages = list(utils.iter_forecast_pages(page_size=7, **filtre))
+    ids = pd.concat(pages)["id"]
+
+    table = backend.tables[TAHMIN]
+    if filtre:
+        table = table[table["kategori"].isin(filtre["kategoriler"])]
+    assert len(pages) > 1
+    assert all(len(p) == 7 for p in pages[:-1])
+    assert ids.is_unique
+    assert set(ids) == set(table["id"])
+
+
+def test_sayfalar_csv_ye_eksiksiz_yazilir(backend):
+    out = io.BytesIO()
+    n = utils._write_frames(utils.iter_forecast_pages(page_size=11), "csv", out)
+
+    back = pd.read_csv(io.BytesIO(out.getvalue()), encoding="utf-8-sig")
+    assert n == len(back) == len(backend.tables[TAHMIN])
+    assert back["id"].is_unique
+    assert list(back.columns) == utils.TAHMIN_KOLONLARI
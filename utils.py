@@ -4,15 +4,35 @@ utils.py — Finansal Tahmin Terminali ortak yardımcıları.
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import importlib.util
+import inspect
 import io
-import random
-from datetime import date, datetime, timedelta
-from typing import Optional, Tuple
+import json
+import logging
+import math
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from datetime import date, datetime
+from typing import Callable, Optional, Tuple
+from urllib.parse import urlsplit
 
 import numpy as np
 import pandas as pd
+import plotly.graph_objects as go
 import requests
 import streamlit as st
+from postgrest.types import ReturnMethod
 from supabase import Client, create_client
 
 # ---------------------------------------------------------------------------
@@ -24,12 +44,501 @@ TABLE_KATILIMCI = "katilimcilar"
 KATEGORILER = ["Bireysel", "Kurumsal", "Anket"]
 MINMAX_KATEGORI = {"Anket"}
 
+# Dashboard'da seçilebilen tahmin metrikleri (etiket → kolon)
+TAHMIN_METRIKLERI = {
+    "PPK Faizi": "tahmin_ppk_faiz",
+    "Yıl Sonu Enflasyon": "tahmin_yilsonu_enf",
+    "Aylık Enflasyon": "tahmin_aylik_enf",
+    "Yıl Sonu Faiz": "tahmin_yilsonu_faiz",
+}
+
+# beklentiler_takip kolonları (schema.sql ile aynı sırada)
+TAHMIN_METIN_KOLONLARI = [
+    "id", "kullanici_adi", "kategori", "anket_donemi", "hedef_donemi", "kaynak_link",
+]
+TAHMIN_SAYISAL_KOLONLARI = [
+    "tahmin_ppk_faiz", "min_ppk_faiz", "max_ppk_faiz",
+    "tahmin_yilsonu_faiz", "min_yilsonu_faiz", "max_yilsonu_faiz",
+    "tahmin_aylik_enf", "min_aylik_enf", "max_aylik_enf",
+    "tahmin_yilsonu_enf", "min_yilsonu_enf", "max_yilsonu_enf",
+    "katilimci_sayisi",
+]
+TAHMIN_TARIH_KOLONLARI = ["tahmin_tarihi", "created_at"]
+TAHMIN_KOLONLARI = [
+    "id", "kullanici_adi", "kategori", "anket_donemi", "hedef_donemi", "tahmin_tarihi",
+    *TAHMIN_SAYISAL_KOLONLARI, "kaynak_link", "created_at",
+]
+
 # TÜFE serileri: hibrit yapı
 EVDS_TUFE_OLD = "TP.FE.OKTG01"          # 2003=100, geçmiş
 EVDS_TUFE_NEW = "TP.TUKFIY2025.GENEL"   # 2025=100, 2026+
 # PPK faizi BIS'ten çekilir (EVDS yerine daha temiz seri)
 BIS_PPK_URL = "https://stats.bis.org/api/v1/data/WS_CBPOL/D.TR?format=csv&startPeriod={start}&endPeriod={end}"
 
+_log = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Performans ölçümü — sayfa çalıştırmaları ve işlem bazında süre kayıtları
+# ---------------------------------------------------------------------------
+PERF_RUNS_MAX = 50             # Sistem Yönetimi'nde gösterilen son sayfa çalıştırmaları
+PERF_OPS_WINDOW = 500          # işlem başına p50/p95 için tutulan son ölçüm
+PERF_KATEGORILER = ("ağ", "pandas", "grafik")
+SUPABASE_ISTEK_UYARI = 20      # bir rerun'da bunu aşan istek sayısı N+1 şüphesi sayılır
+
+# O anki script çalıştırmasının kaydı; her rerun yeni thread'de başladığı için
+# sayfa başında perf_start_run çağrılmazsa None kalır (yalnızca toplu istatistik).
+_perf_run: ContextVar[Optional[dict]] = ContextVar("perf_run", default=None)
+# Açık span'lerin zinciri; kategori toplamları iç içe span'leri iki kez saymasın
+_perf_parent: ContextVar[Optional[dict]] = ContextVar("perf_parent", default=None)
+
+
+@st.cache_resource
+def _perf_store() -> dict:
+    return {"lock": threading.Lock(), "runs": deque(maxlen=PERF_RUNS_MAX), "ops": {}}
+
+
+def perf_start_run(page: str) -> None:
+    """Sayfa script'inin başında çağrılır; bu rerun'daki span'ler bu kayda düşer."""
+    run = {
+        "sayfa": page,
+        "zaman": datetime.now(),
+        "t0": time.perf_counter(),
+        "spans": [],
+        # (tablo, işlem) → [istek, satır, bayt]; oturum sözlüğü tüm rerun'larda ortak
+        "supabase": {},
+        "_oturum_sb": st.session_state.setdefault("_supabase_sayac", {}),
+    }
+    _warn_previous_run(st.session_state.get("_perf_son_run"))
+    st.session_state["_perf_son_run"] = run
+    _perf_run.set(run)
+    store = _perf_store()
+    with store["lock"]:
+        store["runs"].append(run)
+
+
+def _sb_account(table: str, islem: str, satir: Optional[int], bayt: Optional[int]) -> None:
+    """Supabase isteğini o anki rerun'a ve oturuma yazar (rerun yoksa yalnızca p50/p95)."""
+    run = _perf_run.get()
+    if run is None:
+        return
+    with _perf_store()["lock"]:
+        for counts in (run["supabase"], run["_oturum_sb"]):
+            rec = counts.setdefault((table, islem), [0, 0, 0])
+            rec[0] += 1
+            rec[1] += satir or 0
+            rec[2] += bayt or 0
+
+
+def _sb_total(counts: dict) -> int:
+    return sum(rec[0] for rec in counts.values())
+
+
+def _warn_previous_run(prev: Optional[dict]) -> None:
+    """
+    Rerun'ın sonu yakalanamadığı için eşik bir sonraki çalıştırmada kontrol
+    edilir; uyarı kenar çubuğunda, hangi tablo/işlemin baskın olduğuyla çıkar.
+    """
+    if not prev or _sb_total(prev["supabase"]) <= SUPABASE_ISTEK_UYARI:
+        return
+    (table, islem), rec = max(prev["supabase"].items(), key=lambda kv: kv[1][0])
+    st.sidebar.warning(
+        f"⚠️ Önceki çalıştırma ({prev['sayfa']}) Supabase'e "
+        f"**{_sb_total(prev['supabase'])}** istek yaptı (eşik {SUPABASE_ISTEK_UYARI}). "
+        f"En çok: `{table}.{islem}` ×{rec[0]}"
+    )
+
+
+def _perf_record(span: dict, t0: float) -> None:
+    t1 = time.perf_counter()
+    span["ms"] = (t1 - t0) * 1000
+    store = _perf_store()
+    with store["lock"]:
+        # Eşzamanlı çocuklar (load_parallel) toplamda ebeveynden uzun sürebilir
+        span["oz_ms"] = max(span["ms"] - span.pop("_cocuk_ms", 0.0), 0.0)
+        parent = span.pop("_ust", None)
+        if parent is not None:
+            parent["_cocuk_ms"] = parent.get("_cocuk_ms", 0.0) + span["ms"]
+    run = _perf_run.get()
+    if run is not None:
+        span["baslangic_ms"] = (t0 - run["t0"]) * 1000
+        run["spans"].append(span)
+    with store["lock"]:
+        ops = store["ops"].get(span["op"])
+        if ops is None:
+            ops = store["ops"][span["op"]] = deque(maxlen=PERF_OPS_WINDOW)
+        ops.append((span["kategori"], span["ms"], span.get("satir"), span.get("bayt")))
+
+
+@contextmanager
+def perf_span(op: str, kategori: str = "pandas", **meta):
+    """
+    Süre ölçümü. Dönen sözlüğe `satir` / `bayt` yazılabilir:
+
+        with utils.perf_span("bis.ppk", "ağ") as sp:
+            r = requests.get(...)
+            sp["bayt"] = len(r.content)
+    """
+    span = {"op": op, "kategori": kategori, "satir": None, "bayt": None, **meta}
+    span["_ust"] = _perf_parent.get()
+    token = _perf_parent.set(span)
+    t0 = time.perf_counter()
+    try:
+        yield span
+    finally:
+        _perf_parent.reset(token)
+        _perf_record(span, t0)
+
+
+def _frame_rows(obj) -> Optional[int]:
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return len(obj)
+    if isinstance(obj, tuple) and obj and isinstance(obj[0], (pd.DataFrame, pd.Series)):
+        return len(obj[0])
+    return None
+
+
+def perf_timed(op: Optional[str] = None, kategori: str = "pandas"):
+    """
+    Fonksiyon dekoratörü; sonuç DataFrame ise satır sayısını da yazar.
+    `@st.cache_data`'nın altına konur — yalnızca cache ıskalamaları ölçülür.
+    """
+    def deco(fn):
+        name = op or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with perf_span(name, kategori) as sp:
+                out = fn(*args, **kwargs)
+                sp["satir"] = _frame_rows(out)
+                return out
+        return wrapper
+    return deco
+
+
+def _approx_bytes(data) -> Optional[int]:
+    """JSON yük boyutu tahmini: ilk 50 kaydın boyutundan ölçekleme."""
+    if not data:
+        return 0
+    if not isinstance(data, list):
+        data = [data]
+    sample = data[:50]
+    try:
+        size = len(json.dumps(sample, default=str))
+    except (TypeError, ValueError):
+        return None
+    return int(size * len(data) / len(sample))
+
+
+def _percentile(values: list, q: float) -> float:
+    return float(np.percentile(values, q)) if values else float("nan")
+
+
+def perf_runs(limit: int = PERF_RUNS_MAX) -> pd.DataFrame:
+    """Son sayfa çalıştırmaları: kategori bazında toplam süreler (yeniden eskiye)."""
+    store = _perf_store()
+    with store["lock"]:
+        runs = list(store["runs"])[-limit:][::-1]
+    rows = []
+    for i, run in enumerate(runs):
+        spans = list(run["spans"])
+        end = max((s["baslangic_ms"] + s["ms"] for s in spans), default=0.0)
+        row = {
+            "no": i,
+            "Sayfa": run["sayfa"],
+            "Zaman": run["zaman"].strftime("%H:%M:%S"),
+            "Toplam (ms)": end,
+            "Span": len(spans),
+            "Supabase istek": _sb_total(run["supabase"]),
+        }
+        # Öz süre: iç içe span'lerde her milisaniye tek kategoriye yazılır
+        for kat in PERF_KATEGORILER:
+            row[f"{kat} (ms)"] = sum(s["oz_ms"] for s in spans if s["kategori"] == kat)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def perf_run_spans(no: int) -> pd.DataFrame:
+    """perf_runs satırındaki `no` için span dökümü (başlangıç sırasıyla)."""
+    store = _perf_store()
+    with store["lock"]:
+        runs = list(store["runs"])[::-1]
+    if not 0 <= no < len(runs):
+        return pd.DataFrame()
+    df = pd.DataFrame(list(runs[no]["spans"]))
+    if df.empty:
+        return df
+    return df.sort_values("baslangic_ms").reset_index(drop=True)
+
+
+def _sb_frame(counts: dict) -> pd.DataFrame:
+    rows = [
+        {"Tablo": table, "İşlem": islem, "İstek": rec[0], "Satır": rec[1], "Bayt": rec[2]}
+        for (table, islem), rec in counts.items()
+    ]
+    out = pd.DataFrame(rows, columns=["Tablo", "İşlem", "İstek", "Satır", "Bayt"])
+    return out.sort_values("İstek", ascending=False).reset_index(drop=True)
+
+
+def supabase_usage(no: Optional[int] = None) -> pd.DataFrame:
+    """
+    Tablo/işlem bazında istek, satır ve yaklaşık yanıt baytı. `no` verilirse
+    perf_runs'taki o çalıştırma, verilmezse bu oturumun tüm çalıştırmaları.
+    """
+    store = _perf_store()
+    with store["lock"]:
+        if no is None:
+            counts = dict(st.session_state.get("_supabase_sayac", {}))
+        else:
+            runs = list(store["runs"])[::-1]
+            counts = dict(runs[no]["supabase"]) if 0 <= no < len(runs) else {}
+        counts = {k: list(v) for k, v in counts.items()}
+    return _sb_frame(counts)
+
+
+def perf_op_stats() -> pd.DataFrame:
+    """İşlem başına son PERF_OPS_WINDOW ölçümün p50/p95'i, satır ve bayt ortalaması."""
+    store = _perf_store()
+    with store["lock"]:
+        ops = {k: list(v) for k, v in store["ops"].items()}
+    rows = []
+    for op, vals in ops.items():
+        ms = [v[1] for v in vals]
+        satir = [v[2] for v in vals if v[2] is not None]
+        bayt = [v[3] for v in vals if v[3] is not None]
+        rows.append({
+            "İşlem": op,
+            "Kategori": vals[-1][0],
+            "N": len(vals),
+            "p50 (ms)": _percentile(ms, 50),
+            "p95 (ms)": _percentile(ms, 95),
+            "Maks (ms)": max(ms),
+            "Ort. satır": float(np.mean(satir)) if satir else None,
+            "Ort. bayt": float(np.mean(bayt)) if bayt else None,
+        })
+    out = pd.DataFrame(rows)
+    return out.sort_values("p95 (ms)", ascending=False).reset_index(drop=True) if rows else out
+
+
+def perf_reset() -> None:
+    store = _perf_store()
+    with store["lock"]:
+        store["runs"].clear()
+        store["ops"].clear()
+
+
+# ---------------------------------------------------------------------------
+# Örnekleyici profil — tek bir sayfa çalıştırmasının fonksiyon dökümü
+# ---------------------------------------------------------------------------
+PROFIL_ARALIK_S = 0.005        # örnekleme aralığı
+PROFIL_MAKS_S = 120.0          # bitmeyen çalıştırmada örnekleyici bu süre sonra durur
+PROFIL_SAKLA = 10              # bellekte tutulan son profil sayısı
+
+_APP_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+@st.cache_resource
+def _profile_store() -> dict:
+    return {"lock": threading.Lock(), "profiles": OrderedDict(), "seq": 0}
+
+
+def _frame_label(code) -> str:
+    path = code.co_filename
+    if "site-packages" + os.sep in path:
+        path = path.split("site-packages" + os.sep, 1)[1]
+    elif path.startswith(_APP_ROOT):
+        path = os.path.relpath(path, _APP_ROOT)
+    else:
+        path = os.path.basename(path)
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+class _PageSampler(threading.Thread):
+    """
+    Sayfa script'ini çalıştıran thread'in ve o çalıştırmanın havuz işçilerinin
+    (load_parallel, toplu silme) yığınlarını düzenli aralıklarla okur. Yığında
+    sayfa dosyası kalmadığında (script bitti / st.stop) kendiliğinden durur;
+    sonuç _profile_store'a yazılır. cProfile yerine örnekleme: aynı anda birden
+    çok oturum profillenebilir ve ölçülen sayfa yavaşlamaz.
+    """
+
+    def __init__(self, store: dict, page: str, script_file: str):
+        super().__init__(name=f"profil-{page}", daemon=True)
+        self.store = store
+        self.page = page
+        self.script_file = script_file
+        self.target_id = threading.get_ident()
+        # thread id → havuz etiketi; _pool_run kaydeder ve siler
+        self.workers: dict = {}
+        self._workers_lock = threading.Lock()
+
+    def attach(self) -> None:
+        name = threading.current_thread().name.rsplit("_", 1)[0]
+        with self._workers_lock:
+            self.workers[threading.get_ident()] = f"⇢ {name}"
+
+    def detach(self) -> None:
+        with self._workers_lock:
+            self.workers.pop(threading.get_ident(), None)
+
+    @staticmethod
+    def _codes(frame) -> list:
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def _sample(self) -> Optional[list]:
+        frames = sys._current_frames()
+        stack = self._codes(frames.get(self.target_id))
+        # Streamlit'in script çalıştırıcısı kesilir; kök sayfa dosyasıdır
+        for i, code in enumerate(stack):
+            if code.co_filename == self.script_file:
+                root = tuple(_frame_label(c) for c in stack[i:])
+                break
+        else:
+            return None
+        out = [root]
+        with self._workers_lock:
+            workers = list(self.workers.items())
+        # İşçi yığınları _pool_run'dan sonrası; sayfa kökü + havuz adı altında toplanır
+        for ident, label in workers:
+            codes = self._codes(frames.get(ident))
+            for i, code in enumerate(codes):
+                if code is _pool_run.__code__:
+                    out.append((root[0], label) + tuple(_frame_label(c) for c in codes[i + 1:]))
+                    break
+        return out
+
+    def run(self) -> None:
+        stacks: Counter = Counter()
+        tur = 0
+        zaman = datetime.now()
+        t0 = time.perf_counter()
+        while time.perf_counter() - t0 < PROFIL_MAKS_S:
+            sample = self._sample()
+            if sample is None:
+                break
+            tur += 1
+            stacks.update(sample)
+            time.sleep(PROFIL_ARALIK_S)
+        sure = time.perf_counter() - t0
+        with self.store["lock"]:
+            self.store["seq"] += 1
+            key = self.store["seq"]
+            self.store["profiles"][key] = {
+                "sayfa": self.page,
+                "zaman": zaman,
+                "sure_s": sure,
+                "tur": tur,
+                "ornek": sum(stacks.values()),
+                "stacks": stacks,
+            }
+            while len(self.store["profiles"]) > PROFIL_SAKLA:
+                self.store["profiles"].popitem(last=False)
+
+
+# Profillenen çalıştırmanın örnekleyicisi; havuzlar copy_context().run ile taşır
+_profil_aktif: ContextVar[Optional[_PageSampler]] = ContextVar("profil_aktif", default=None)
+
+
+def _pool_run(fn: Callable, *args):
+    """
+    Havuz işçisinde fn(*args). Çalıştırma profilleniyorsa işçi thread'i
+    örnekleyiciye kaydedilir; süresi sayfanın profiline düşer.
+    """
+    sampler = _profil_aktif.get()
+    if sampler is None:
+        return fn(*args)
+    sampler.attach()
+    try:
+        return fn(*args)
+    finally:
+        sampler.detach()
+
+
+def profile_controls(page: str) -> None:
+    """
+    Kenar çubuğundaki profil anahtarı; sayfa script'inden perf_start_run'dan
+    sonra çağrılır. Açıldığında bir sonraki çalıştırma (anahtarın tetiklediği
+    rerun) örneklenir ve anahtar kendiliğinden kapanır.
+    """
+    script_file = sys._getframe(1).f_code.co_filename
+    if st.session_state.get("profil_sonraki"):
+        st.session_state["profil_sonraki"] = False
+        sampler = _PageSampler(_profile_store(), page, script_file)
+        _profil_aktif.set(sampler)
+        sampler.start()
+        st.sidebar.caption("🔬 Bu çalıştırma profilleniyor → Sistem Yönetimi › Profiller")
+    else:
+        _profil_aktif.set(None)
+    st.sidebar.toggle(
+        "🔬 Sonraki çalıştırmayı profille", key="profil_sonraki",
+        help="Sayfanın bir sonraki yeniden çalıştırmasını fonksiyon düzeyinde örnekler.",
+    )
+
+
+def profile_list() -> pd.DataFrame:
+    """Saklanan profiller (yeniden eskiye)."""
+    store = _profile_store()
+    with store["lock"]:
+        items = list(store["profiles"].items())[::-1]
+    return pd.DataFrame([
+        {
+            "no": key,
+            "Sayfa": p["sayfa"],
+            "Zaman": p["zaman"].strftime("%H:%M:%S"),
+            "Süre (ms)": p["sure_s"] * 1000,
+            "Örnek": p["ornek"],
+        }
+        for key, p in items
+    ])
+
+
+def _get_profile(no: int) -> Optional[dict]:
+    store = _profile_store()
+    with store["lock"]:
+        return store["profiles"].get(no)
+
+
+def profile_top(no: int, n: int = 30) -> pd.DataFrame:
+    """
+    Kümülatif süreye göre ilk n fonksiyon. Kümülatif: fonksiyonun yığında
+    bulunduğu örnekler; öz: yığının tepesinde olduğu örnekler. Süreler thread
+    başınadır; paralel işçilerle sayfa kökü %100'ü aşabilir.
+    """
+    prof = _get_profile(no)
+    if prof is None or not prof["ornek"]:
+        return pd.DataFrame()
+    cum: Counter = Counter()
+    own: Counter = Counter()
+    for stack, count in prof["stacks"].items():
+        for label in set(stack):  # özyinelemede iki kez sayılmasın
+            cum[label] += count
+        own[stack[-1]] += count
+    tur = prof["tur"] or 1
+    ms_per = prof["sure_s"] * 1000 / tur
+    df = pd.DataFrame({"Fonksiyon": list(cum)})
+    df["Kümülatif (ms)"] = df["Fonksiyon"].map(cum) * ms_per
+    df["Öz (ms)"] = df["Fonksiyon"].map(own).fillna(0) * ms_per
+    df["Kümülatif %"] = df["Fonksiyon"].map(cum) / tur * 100
+    return (
+        df.sort_values(["Kümülatif (ms)", "Öz (ms)"], ascending=False)
+        .head(n)
+        .reset_index(drop=True)
+    )
+
+
+def profile_collapsed(no: int) -> bytes:
+    """Katlanmış yığınlar (`a;b;c adet`) — speedscope / flamegraph.pl ile açılır."""
+    prof = _get_profile(no)
+    if prof is None:
+        return b""
+    lines = [f"{';'.join(stack)} {count}" for stack, count in prof["stacks"].items()]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
 
 # ---------------------------------------------------------------------------
 # Secrets & Supabase
@@ -42,12 +551,70 @@ def _get_secrets():
     return url, key, app_password, evds_key
 
 
-@st.cache_resource
-def get_supabase() -> Client:
+def _supabase_client() -> Client:
     url, key, _, _ = _get_secrets()
     return create_client(url, key)
 
 
+class _TimedQuery:
+    """
+    PostgREST sorgu zinciri sarmalayıcısı: zincir aynen kurulur, yalnızca
+    `execute()` ölçülür (op: `supabase.<tablo>.<işlem>`, satır ve yaklaşık bayt)
+    ve istek rerun / oturum sayaçlarına yazılır.
+    """
+    _ISLEMLER = {"select", "insert", "update", "upsert", "delete"}
+
+    def __init__(self, builder, table: str, islem: str = "select"):
+        self._builder, self._table, self._islem = builder, table, islem
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            # `.not_` gibi özellikler de zincir döndürür
+            return _TimedQuery(attr, self._table, self._islem) if hasattr(attr, "execute") else attr
+        islem = name if name in self._ISLEMLER else self._islem
+
+        def call(*args, **kwargs):
+            out = attr(*args, **kwargs)
+            return _TimedQuery(out, self._table, islem) if hasattr(out, "execute") else out
+        return call
+
+    def execute(self):
+        with perf_span(f"supabase.{self._table}.{self._islem}", "ağ") as sp:
+            try:
+                res = self._builder.execute()
+            except Exception:
+                _sb_account(self._table, self._islem, None, None)
+                raise
+            data = getattr(res, "data", None)
+            if isinstance(data, str):
+                # `.csv()` yanıtı: başlık satırı hariç satır sayısı
+                sp["satir"] = max(data.count("\n") + (not data.endswith("\n")) - 1, 0)
+                sp["bayt"] = len(data)
+            else:
+                sp["satir"] = len(data) if isinstance(data, list) else None
+                sp["bayt"] = _approx_bytes(data)
+            _sb_account(self._table, self._islem, sp["satir"], sp["bayt"])
+            return res
+
+
+class _TimedClient:
+    def __init__(self, client: Client):
+        self._client = client
+
+    def table(self, name: str) -> _TimedQuery:
+        return _TimedQuery(self._client.table(name), name)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+@st.cache_resource
+def get_supabase() -> Client:
+    """Süre ölçümlü Supabase istemcisi (bağlantı ve sarmalayıcı süreç genelinde tek)."""
+    return _TimedClient(_supabase_client())
+
+
 def get_app_password() -> str:
     return _get_secrets()[2]
 
@@ -64,6 +631,150 @@ class _SupabaseProxy:
 supabase = _SupabaseProxy()
 
 
+# ---------------------------------------------------------------------------
+# Veri sürümü — her yazma işleminde artar, türetilmiş cache'lerin anahtarı
+# ---------------------------------------------------------------------------
+# Sürüm SNAPSHOT_DIR/VERSION dosyasında tutulur: aynı kurulumun tüm
+# Streamlit süreçleri (replika / işçi) aynı sürümü görür, birinin yazması
+# diğerlerinin cache'ini de geçersiz kılar. Dizin yazılamazsa süreç içi
+# sayaca düşülür.
+def _default_snapshot_dir() -> str:
+    """
+    Kurulum başına dizin: Supabase projesi + uygulama yolu. Aynı makinedeki
+    farklı kurulumlar (dev / prod) birbirinin anlık görüntüsünü okumaz ve
+    veri sürümünü artırmaz; aynı kurulumun replikaları dizini paylaşır.
+    """
+    url = ""
+    try:
+        # load_if_toml_exists: secrets dosyası yoksa sayfaya hata basılmaz
+        if st.secrets.load_if_toml_exists():
+            url = str(st.secrets.get("SUPABASE_URL", ""))
+    except Exception:
+        pass
+    kimlik = f"{url}|{os.path.dirname(os.path.abspath(__file__))}"
+    tag = hashlib.sha1(kimlik.encode()).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"ekonomi_snapshot_{tag}")
+
+
+SNAPSHOT_DIR = os.environ.get("TAHMIN_SNAPSHOT_DIR") or _default_snapshot_dir()
+_VERSION_FILE = os.path.join(SNAPSHOT_DIR, "VERSION")
+
+
+@st.cache_resource
+def _data_version_state() -> dict:
+    return {"version": 0, "lock": threading.Lock(), "stat": None, "dosya": True}
+
+
+@contextmanager
+def _version_file_lock():
+    """Süreçler arası kilit (fcntl yoksa — Windows — yalnızca thread kilidi)."""
+    state = _data_version_state()
+    with state["lock"]:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+        with open(_VERSION_FILE + ".lock", "a") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _write_version(version: int) -> None:
+    tmp = f"{_VERSION_FILE}.{os.getpid()}.tmp"
+    with open(tmp, "w") as fh:
+        fh.write(str(version))
+    os.replace(tmp, _VERSION_FILE)
+
+
+def _read_version_file(state: dict) -> int:
+    """Dosya değişmediyse (stat aynı) okumadan son değeri döner."""
+    st_ = os.stat(_VERSION_FILE)
+    stamp = (st_.st_mtime_ns, st_.st_size, st_.st_ino)
+    if stamp != state["stat"]:
+        with open(_VERSION_FILE) as fh:
+            state["version"] = int(fh.read().strip() or 0)
+        state["stat"] = stamp
+    return state["version"]
+
+
+def _next_version(state: dict) -> int:
+    try:
+        return _read_version_file(state) + 1
+    except FileNotFoundError:
+        # Zaman tabanlı başlangıç: dizin silinip yeniden oluşturulsa bile
+        # sürüm geri gitmez, eski sürüm anahtarlı cache girdileri eşleşmez
+        return int(time.time() * 1000)
+
+
+def get_data_version() -> int:
+    state = _data_version_state()
+    if state["dosya"]:
+        try:
+            try:
+                return _read_version_file(state)
+            except FileNotFoundError:
+                with _version_file_lock():
+                    if not os.path.exists(_VERSION_FILE):
+                        _write_version(_next_version(state))
+                return _read_version_file(state)
+        except (OSError, ValueError):
+            state["dosya"] = False
+    return state["version"]
+
+
+def _bump_data_version(on_bump: Optional[Callable[[int, int], None]] = None) -> int:
+    """
+    Sürümü artırır. `on_bump(eski, yeni)` yeni sürüm yazılmadan, kilit
+    altında çağrılır: yeni sürüm anahtarlı cache girdileri sürüm görünür
+    olmadan hazırlanır.
+    """
+    state = _data_version_state()
+    if state["dosya"]:
+        try:
+            with _version_file_lock():
+                new = _next_version(state)
+                if on_bump is not None:
+                    on_bump(new - 1, new)
+                _write_version(new)
+            return _read_version_file(state)
+        except (OSError, ValueError):
+            state["dosya"] = False
+    with state["lock"]:
+        new = state["version"] + 1
+        if on_bump is not None:
+            on_bump(new - 1, new)
+        state["version"] = new
+        return new
+
+
+def _adopt_data_version(version: int) -> bool:
+    """Başka makineden gelen sürümü, yereldekinden büyükse benimser."""
+    state = _data_version_state()
+    if state["dosya"]:
+        try:
+            with _version_file_lock():
+                try:
+                    current = _read_version_file(state)
+                except FileNotFoundError:
+                    current = 0
+                if version <= current:
+                    return False
+                _write_version(version)
+            return True
+        except (OSError, ValueError):
+            state["dosya"] = False
+    with state["lock"]:
+        if version <= state["version"]:
+            return False
+        state["version"] = version
+        return True
+
+
 # ---------------------------------------------------------------------------
 # Oturum
 # ---------------------------------------------------------------------------
@@ -110,31 +821,803 @@ def is_minmax_allowed(kategori: str) -> bool:
     return kategori in MINMAX_KATEGORI
 
 
+@perf_timed()
 def clean_numeric_and_dates(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
         return df
 
-    numeric_cols = [
-        "tahmin_ppk_faiz", "min_ppk_faiz", "max_ppk_faiz",
-        "tahmin_yilsonu_faiz", "min_yilsonu_faiz", "max_yilsonu_faiz",
-        "tahmin_aylik_enf", "min_aylik_enf", "max_aylik_enf",
-        "tahmin_yilsonu_enf", "min_yilsonu_enf", "max_yilsonu_enf",
-        "katilimci_sayisi",
-    ]
-    for col in numeric_cols:
+    for col in TAHMIN_SAYISAL_KOLONLARI:
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors="coerce")
 
-    for dcol in ("tahmin_tarihi", "created_at"):
+    for dcol in TAHMIN_TARIH_KOLONLARI:
         if dcol in df.columns:
             df[dcol] = pd.to_datetime(df[dcol], errors="coerce")
 
     return df
 
 
+@perf_timed()
+def read_forecasts_csv(text) -> pd.DataFrame:
+    """
+    PostgREST `text/csv` yanıtını (`.csv()` ile istenir) tahmin şemasıyla
+    doğrudan tipli kolonlara okur: satır başına dict kurulmaz, sayılar ve
+    tarihler clean_numeric_and_dates'ten ikinci kez geçmez. Postgres CSV'de
+    tırnaksız boş alan NULL, `""` boş metindir.
+    """
+    if not isinstance(text, str) or not text.strip():
+        return pd.DataFrame()
+    try:
+        import pyarrow.csv as pacsv
+    except ImportError:
+        df = pd.read_csv(
+            io.StringIO(text), keep_default_na=False, na_values=[""],
+            dtype={c: "float64" for c in TAHMIN_SAYISAL_KOLONLARI}
+            | {c: str for c in TAHMIN_METIN_KOLONLARI},
+        )
+        return clean_numeric_and_dates(df)
+
+    table = pacsv.read_csv(
+        io.BytesIO(text.encode("utf-8")),
+        convert_options=pacsv.ConvertOptions(
+            column_types=_forecast_arrow_types(),
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=False,
+        ),
+    )
+    return table.to_pandas()
+
+
+# ---------------------------------------------------------------------------
+# Paylaşılan çerçeve cache'i — büyük tablolar süreç genelinde tek kopya
+# ---------------------------------------------------------------------------
+# st.cache_data her isabette sonucu pickle'dan yeniden kurar: tam tahmin
+# tablosu her rerun'da ve her oturum için ayrı kopyalanır. Buradaki
+# girdiler tek örnek olarak tutulur, çağırana sığ kopya verilir. Girdinin
+# dizileri salt okunurdur: kolon eklemek / değiştirmek yalnızca çağıranın
+# kopyasını etkiler, yerinde yazma (df.loc[...] = ...) paylaşılan tabloyu
+# sessizce bozmak yerine hata verir. Süreç geneli pandas ayarlarına
+# dokunulmaz. Bütçe bayt bazında (LRU).
+FRAME_CACHE_MAX_MB = 1024
+
+
+@st.cache_resource
+def _frame_cache() -> dict:
+    return {"lock": threading.Lock(), "items": OrderedDict(), "bayt": 0}
+
+
+def _frame_nbytes(value) -> int:
+    """Bellek tahmini; büyük tablolarda metin kolonları örneklemle ölçülür."""
+    if isinstance(value, tuple):
+        return sum(_frame_nbytes(v) for v in value)
+    if not isinstance(value, pd.DataFrame):
+        return 0
+    if len(value) <= 5000:
+        return int(value.memory_usage(deep=True).sum())
+    sample = value.sample(n=2000, random_state=0)
+    per_row = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+    return int(per_row * len(value) + value.index.memory_usage())
+
+
+def _freeze(value):
+    """Girdinin numpy dizilerini salt okunur yapar (Arrow mmap dizileri zaten öyle)."""
+    if isinstance(value, tuple):
+        for v in value:
+            _freeze(v)
+    elif isinstance(value, pd.DataFrame):
+        for blk in value._mgr.blocks:
+            if isinstance(blk.values, np.ndarray):
+                blk.values.flags.writeable = False
+    return value
+
+
+def _shallow(value):
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=False)
+    if isinstance(value, tuple):
+        return tuple(_shallow(v) for v in value)
+    return value
+
+
+def _frame_cache_put(
+    key: tuple, value, nbytes: int, age: float = 0.0, kaynak: str = "bellek",
+) -> None:
+    cache = _frame_cache()
+    budget = FRAME_CACHE_MAX_MB * 2**20
+    with cache["lock"]:
+        old = cache["items"].pop(key, None)
+        if old is not None:
+            cache["bayt"] -= old["bayt"]
+        # age: dosyadan gelen girdide TTL dosyanın yazıldığı andan sayılır
+        cache["items"][key] = {
+            "deger": _freeze(value), "bayt": nbytes, "t": time.monotonic() - age,
+            "isabet": 0, "kaynak": kaynak,
+        }
+        cache["bayt"] += nbytes
+        # En son eklenen bütçeden büyük olsa bile tutulur
+        while cache["bayt"] > budget and len(cache["items"]) > 1:
+            _, ev = cache["items"].popitem(last=False)
+            cache["bayt"] -= ev["bayt"]
+
+
+def frame_cache_clear(namespace: Optional[str] = None) -> None:
+    """Ad alanındaki (fonksiyon adı) ya da tüm girdileri bırakır."""
+    cache = _frame_cache()
+    with cache["lock"]:
+        for key in [k for k in cache["items"] if namespace is None or k[0] == namespace]:
+            cache["bayt"] -= cache["items"].pop(key)["bayt"]
+
+
+SINGLE_FLIGHT_BEKLEME_S = 120.0  # lider bu sürede bitmezse bekleyen kendisi çeker
+
+
+@st.cache_resource
+def _inflight() -> dict:
+    return {"lock": threading.Lock(), "futures": {}}
+
+
+def _single_flight(key, fn: Callable[[], object]):
+    """
+    Aynı anahtar için eşzamanlı çağrıları birleştirir: ilk gelen (lider)
+    `fn`'i çalıştırır, diğerleri onun Future'ını bekleyip aynı sonucu (ya da
+    aynı hatayı) alır. TTL dolduğunda Dashboard'u aynı anda açan oturumlar
+    Supabase / EVDS / BIS'e tek istek gönderir.
+    """
+    store = _inflight()
+    with store["lock"]:
+        fut = store["futures"].get(key)
+        leader = fut is None
+        if leader:
+            fut = store["futures"][key] = Future()
+    if not leader:
+        with perf_span(f"bekle.{key[0] if isinstance(key, tuple) else key}", "ağ"):
+            try:
+                return fut.result(timeout=SINGLE_FLIGHT_BEKLEME_S)
+            except FutureTimeout:
+                return fn()
+    try:
+        result = fn()
+    except BaseException as e:
+        fut.set_exception(e)
+        raise
+    else:
+        fut.set_result(result)
+        return result
+    finally:
+        with store["lock"]:
+            store["futures"].pop(key, None)
+
+
+# ad → {"tablo", "ttl", "snapshot"}: değişiklik olayları hangi girdilere dokunur
+_FRAME_TABLOLARI: dict = {}
+
+
+def shared_frame_cache(
+    ttl: float = 600, surumlu: bool = False, snapshot: bool = False,
+    tablo: Optional[str] = None,
+):
+    """
+    st.cache_data yerine kullanılan dekoratör (argümanlar hash'lenebilir
+    olmalı). `surumlu=True` anahtara get_data_version() ekler: her veri
+    sürümü için tek örnek. `snapshot=True` sonucu SNAPSHOT_DIR'deki Arrow
+    dosyasıyla diğer süreçlerle paylaşır. `tablo` sonucun bağlı olduğu
+    tablodur: başka tablonun değişikliği girdiyi yeni sürüme taşır (bkz.
+    Değişiklik kanalı). `.clear()` st.cache_data'daki gibi çalışır;
+    `.refresh(...)` girdiyi süresi dolmadan yeniler, `.stamp(...)` girdinin
+    yüklenme anını döner.
+    """
+    def deco(fn):
+        name = fn.__name__
+        sig = inspect.signature(fn)
+        if tablo is not None:
+            _FRAME_TABLOLARI[name] = {"tablo": tablo, "ttl": ttl, "snapshot": snapshot}
+
+        def make_key(args, kwargs) -> tuple:
+            # f(20000) ile f(limit=20000) aynı girdiye düşsün
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return (name, get_data_version() if surumlu else None,
+                    tuple(bound.arguments.items()))
+
+        def load(key, args, kwargs, max_age: float):
+            if snapshot:
+                hit = snapshot_read(key, max_age)
+                if hit is None:
+                    value = fn(*args, **kwargs)
+                    # Yazan süreç de dosyadan okur: bellekte özel kopya kalmaz
+                    if snapshot_write(key, value):
+                        hit = snapshot_read(key, ttl)
+                    if hit is None:
+                        _frame_cache_put(key, value, _frame_nbytes(value))
+                        return value
+                value, age, nbytes = hit
+                _frame_cache_put(key, value, nbytes, age=age, kaynak="mmap")
+                return value
+            value = fn(*args, **kwargs)
+            _frame_cache_put(key, value, _frame_nbytes(value))
+            return value
+
+        def lookup(key):
+            cache = _frame_cache()
+            with cache["lock"]:
+                ent = cache["items"].get(key)
+                if ent is not None and time.monotonic() - ent["t"] < ttl:
+                    cache["items"].move_to_end(key)
+                    ent["isabet"] += 1
+                    return ent
+            return None
+
+        def load_once(key, args, kwargs):
+            # Lider olunca tekrar bak: önceki lider az önce yazmış olabilir
+            ent = lookup(key)
+            return ent["deger"] if ent is not None else load(key, args, kwargs, ttl)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            ent = lookup(key)
+            if ent is not None:
+                return _shallow(ent["deger"])
+            return _shallow(_single_flight(key, lambda: load_once(key, args, kwargs)))
+
+        def refresh(*args, max_age: float = 0.0, **kwargs) -> None:
+            """
+            Kaynağı yeniden okuyup girdiyi değiştirir. `max_age` verilirse
+            bellekteki girdi ya da başka bir sürecin anlık görüntüsü o kadar
+            yeniyse kaynağa gidilmez (`inf` → yalnızca eksikse yükle).
+            Aynı anda ıskalayan oturumlar bu yenilemeyi bekler.
+            """
+            key = make_key(args, kwargs)
+            max_age = min(max_age, ttl)
+            if max_age > 0:
+                cache = _frame_cache()
+                with cache["lock"]:
+                    ent = cache["items"].get(key)
+                    if ent is not None and time.monotonic() - ent["t"] < max_age:
+                        return
+            _single_flight(key, lambda: load(key, args, kwargs, max_age))
+
+        def stamp(*args, **kwargs) -> Optional[float]:
+            """Girdinin yüklenme anı (monotonic) ya da None; ucuz sürüm anahtarı."""
+            cache = _frame_cache()
+            with cache["lock"]:
+                ent = cache["items"].get(make_key(args, kwargs))
+                return None if ent is None else ent["t"]
+
+        wrapper.clear = lambda: frame_cache_clear(name)
+        wrapper.refresh = refresh
+        wrapper.stamp = stamp
+        return wrapper
+    return deco
+
+
+def frame_cache_args(name: str) -> list:
+    """Cache'te bulunan `name` girdilerinin argümanları (sözlük listesi)."""
+    cache = _frame_cache()
+    with cache["lock"]:
+        return [dict(key[2]) for key in cache["items"] if key[0] == name]
+
+
+def frame_cache_stats() -> pd.DataFrame:
+    """Sistem Yönetimi için: girdi başına boyut, yaş ve isabet sayısı (LRU sırası)."""
+    cache = _frame_cache()
+    now = time.monotonic()
+    with cache["lock"]:
+        items = list(cache["items"].items())
+    return pd.DataFrame([
+        {
+            "Fonksiyon": key[0],
+            "Sürüm": key[1],
+            "Argümanlar": ", ".join(f"{k}={v}" for k, v in key[2]),
+            "Kaynak": ent["kaynak"],
+            "MB": ent["bayt"] / 2**20,
+            "Yaş (sn)": now - ent["t"],
+            "İsabet": ent["isabet"],
+        }
+        for key, ent in items
+    ], columns=["Fonksiyon", "Sürüm", "Argümanlar", "Kaynak", "MB", "Yaş (sn)", "İsabet"])
+
+
+# ---------------------------------------------------------------------------
+# Arrow anlık görüntüsü — süreçler arası paylaşılan, anahtar başına tek dosya
+# ---------------------------------------------------------------------------
+# Bir süreç tabloyu Supabase'den çekip SNAPSHOT_DIR'e Arrow IPC dosyası
+# olarak yazar; diğerleri dosyayı memory-map eder. Tek parça (chunk) ve
+# null'suz sayısal kolonlar pandas'a kopyasız geçer, sayfalar işletim
+# sisteminin sayfa önbelleğinde paylaşılır: replika eklemek belleği
+# katlamaz, yeni replika ilk isteğinde Supabase'e gitmez.
+SNAPSHOT_SAKLA = 3             # (ad, argümanlar) başına tutulan son sürüm dosyası
+
+
+def _snapshot_prefix(key: tuple) -> str:
+    """Sürümden bağımsız (ad, argümanlar) öneki: budama bu grup içinde yapılır."""
+    digest = hashlib.sha1(repr((key[0], key[2])).encode()).hexdigest()[:12]
+    return f"{key[0]}_{digest}_"
+
+
+def _snapshot_path(key: tuple) -> str:
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+    return os.path.join(SNAPSHOT_DIR, f"{_snapshot_prefix(key)}{digest}.arrow")
+
+
+def _snapshot_table(df: pd.DataFrame):
+    import pyarrow as pa
+
+    arrays = {}
+    for col in df.columns:
+        s = df[col]
+        if s.dtype.kind == "f":
+            # NaN değer olarak kalır (null değil): okumada kopyasız
+            arrays[col] = pa.array(s.to_numpy(), from_pandas=False)
+        else:
+            arrays[col] = pa.array(s, from_pandas=True)
+    return pa.table(arrays).combine_chunks()
+
+
+def snapshot_write(key: tuple, value) -> bool:
+    """
+    `value` DataFrame ya da (DataFrame, hata) ise dosyaya yazar. Hata dolu
+    sonuçlar ve varsayılan olmayan index'li tablolar paylaşılmaz.
+    """
+    df, extra = (value[0], list(value[1:])) if isinstance(value, tuple) else (value, None)
+    if not isinstance(df, pd.DataFrame) or (extra and any(e is not None for e in extra)):
+        return False
+    if not df.index.equals(pd.RangeIndex(len(df))):
+        return False
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        with perf_span(f"snapshot.{key[0]}.yaz", "pandas") as sp:
+            table = _snapshot_table(df)
+            meta = {b"ekler": json.dumps(extra).encode()} if extra is not None else {}
+            table = table.replace_schema_metadata(meta)
+            os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+            path = _snapshot_path(key)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with pa.OSFile(tmp, "wb") as fh:
+                with ipc.new_file(fh, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp, path)
+            sp["satir"], sp["bayt"] = len(df), os.path.getsize(path)
+    except (ImportError, OSError, ValueError, TypeError, NotImplementedError):
+        # pyarrow yok, disk dolu ya da kolon Arrow'a çevrilemiyor (Arrow
+        # hataları bu türlerden türer): süreç içi cache yeter
+        return False
+    _snapshot_prune(key, keep=path)
+    return True
+
+
+def _snapshot_prune(key: tuple, keep: str) -> None:
+    """
+    Aynı (ad, argümanlar) için en yeni SNAPSHOT_SAKLA sürümü bırakır; farklı
+    argümanlı canlı dosyalar birbirini silmez.
+    """
+    prefix = _snapshot_prefix(key)
+    try:
+        files = [
+            os.path.join(SNAPSHOT_DIR, f) for f in os.listdir(SNAPSHOT_DIR)
+            if f.startswith(prefix) and f.endswith(".arrow")
+        ]
+        files.sort(key=os.path.getmtime, reverse=True)
+        for path in files[SNAPSHOT_SAKLA:]:
+            if path != keep:
+                # Linux'ta açık mmap'ler dosya silinse de geçerli kalır
+                os.remove(path)
+    except OSError:
+        pass
+
+
+def snapshot_read(key: tuple, ttl: float) -> Optional[tuple]:
+    """Taze dosya varsa (değer, yaş_sn, özel_bellek_bayt) — yoksa None."""
+    path = _snapshot_path(key)
+    try:
+        age = time.time() - os.path.getmtime(path)
+    except OSError:
+        return None
+    if age >= ttl:
+        return None
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        with perf_span(f"snapshot.{key[0]}.oku", "pandas") as sp:
+            before = pa.total_allocated_bytes()
+            reader = ipc.open_file(pa.memory_map(path, "r"))
+            table = reader.read_all()
+            df = table.to_pandas(split_blocks=True)
+            # Yalnızca kopyalanan kolonlar (null'lu tarih vb.) özel bellek tutar
+            nbytes = max(pa.total_allocated_bytes() - before, 0)
+            sp["satir"], sp["bayt"] = len(df), nbytes
+    except (ImportError, OSError, ValueError):
+        return None
+    meta = table.schema.metadata or {}
+    if b"ekler" in meta:
+        return (df, *json.loads(meta[b"ekler"])), age, nbytes
+    return df, age, nbytes
+
+
+# ---------------------------------------------------------------------------
+# Değişiklik kanalı — yazmalar (tablo, anahtarlar, sürüm) yayınlar
+# ---------------------------------------------------------------------------
+# Her yazma bir olay yayınlar; her süreç (yazan dahil) olayı kendi
+# cache'ine uygular. Değişen tabloya bağlı girdiler için yalnızca değişen
+# satırlar çekilip eski tabloyla birleştirilir (delta) — birleştirilemiyorsa
+# girdi bırakılır ve ilk istekte yeniden yüklenir. Diğer tablolara bağlı
+# girdiler yeniden yüklenmeden yeni sürüme taşınır: katılımcı eklemek tahmin
+# tablosunu, tek satırlık düzeltme tüm tabloyu yeniden çektirmez.
+#
+# Varsayılan kanal SNAPSHOT_DIR/changes.jsonl'dir (aynı makinedeki süreçler).
+# Farklı makinelerdeki replikalar için Postgres LISTEN/NOTIFY (psycopg2):
+#
+#     [degisiklik]
+#     kanal = "postgres"     # "dosya" (varsayılan) | "postgres" | "kapali"
+#     dsn = "postgresql://postgres:<şifre>@db.<proje>.supabase.co:5432/postgres"
+#
+# Kaçırılan olay (dosya döndürme, bağlantı kopması) yalnızca delta'yı
+# kaybettirir: sürüm yine değişir, girdi TTL / arka plan yenilemeyle tazelenir.
+# Uygulanamayan delta loglanır ve girdi tam geçersiz kılınır (ilk istekte
+# kaynaktan yüklenir). psycopg2 opsiyoneldir; yoksa dosya kanalı kullanılır.
+DEGISIKLIK_KANALI = "tahmin_degisiklik"
+DEGISIKLIK_MAKS_ANAHTAR = 100    # daha fazlası → anahtarsız olay (NOTIFY ≤ 8000 bayt)
+DEGISIKLIK_DOSYA_MAKS_MB = 4     # aşınca dosya baştan başlar
+DEGISIKLIK_POLL_S = 1.0
+_CHANGES_FILE = os.path.join(SNAPSHOT_DIR, "changes.jsonl")
+_SUREC = f"{socket.gethostname()}:{os.getpid()}"
+
+# ad → birleştirici(df, değişiklik, argümanlar) → yeni df ya da None (birleştirilemez)
+_DELTA_BIRLESTIRICILER: dict = {}
+
+
+@st.cache_resource
+def _change_stats() -> dict:
+    """Süreç içi sayaçlar: delta ile taşınan / tam geçersiz kılınan girdiler, son hata."""
+    return {"lock": threading.Lock(), "delta": 0, "tam": 0, "hata": None, "uyarilar": set()}
+
+
+def _change_warn_once(msg: str) -> None:
+    stats = _change_stats()
+    with stats["lock"]:
+        if msg in stats["uyarilar"]:
+            return
+        stats["uyarilar"].add(msg)
+    _log.warning(msg)
+
+
+def _change_config() -> dict:
+    try:
+        conf = dict(st.secrets.get("degisiklik", {}))
+    except Exception:
+        conf = {}
+    kanal = str(conf.get("kanal", "dosya"))
+    if kanal == "postgres" and not conf.get("dsn"):
+        _change_warn_once("degisiklik.kanal = postgres ama dsn yok; dosya kanalı kullanılıyor")
+        kanal = "dosya"
+    if kanal == "postgres" and importlib.util.find_spec("psycopg2") is None:
+        _change_warn_once(
+            "degisiklik.kanal = postgres ama psycopg2 yüklü değil "
+            "(pip install psycopg2-binary); dosya kanalı kullanılıyor"
+        )
+        kanal = "dosya"
+    return {"kanal": kanal, "dsn": conf.get("dsn")}
+
+
+def _degisiklik(tablo: str, anahtarlar=None, islem: str = "yaz") -> dict:
+    """Olay parçası. `anahtarlar` None → tablonun tamamı değişmiş sayılır."""
+    if anahtarlar is not None:
+        anahtarlar = [k for k in dict.fromkeys(anahtarlar) if k is not None]
+        if not anahtarlar or len(anahtarlar) > DEGISIKLIK_MAKS_ANAHTAR:
+            anahtarlar = None
+    return {"tablo": tablo, "anahtarlar": anahtarlar, "islem": islem}
+
+
+def _key_version(key: tuple) -> Optional[int]:
+    """Sürümlü girdide anahtardaki, görünümlerde `version` argümanındaki sürüm."""
+    if key[1] is not None:
+        return key[1]
+    return dict(key[2]).get("version")
+
+
+def _with_version(key: tuple, version: int) -> tuple:
+    if key[1] is not None:
+        return (key[0], version, key[2])
+    return (key[0], None, tuple((k, version if k == "version" else v) for k, v in key[2]))
+
+
+def _frame_cache_pop(key: tuple) -> Optional[dict]:
+    cache = _frame_cache()
+    with cache["lock"]:
+        ent = cache["items"].pop(key, None)
+        if ent is not None:
+            cache["bayt"] -= ent["bayt"]
+    return ent
+
+
+def _invalidate_full(key: tuple, neden: str, exc: Optional[BaseException] = None) -> None:
+    """Delta uygulanamadı: yeni sürüm girdisi bırakılır, ilk istekte kaynaktan yüklenir."""
+    _frame_cache_pop(key)
+    stats = _change_stats()
+    with stats["lock"]:
+        stats["tam"] += 1
+        if exc is not None:
+            stats["hata"] = f"{key[0]}: {exc}"
+    if exc is not None:
+        _log.warning("Delta uygulanamadı (%s, %s); tam yeniden yüklenecek", key[0], neden,
+                     exc_info=exc)
+    else:
+        _log.info("Delta yok (%s, %s); tam yeniden yüklenecek", key[0], neden)
+
+
+def _apply_change(event: dict, yayinci: bool = False) -> None:
+    """
+    Olayı süreç içi cache'e uygular: eski sürümün girdilerinden yeni sürüm
+    anahtarlı girdiler kurar. Yayıncı süreç sonuçları anlık görüntü olarak
+    da yazar; aynı makinedeki diğer süreçler kaynağa gitmeden dosyadan okur.
+    """
+    old_v, new_v = event["onceki"], event["surum"]
+    degisen = {}
+    for d in event["degisiklikler"]:
+        # Anahtarsız ya da aynı tabloda birden fazla parça → tablo bütünüyle değişmiş
+        degisen[d["tablo"]] = None if d["tablo"] in degisen or d["anahtarlar"] is None else d
+
+    cache = _frame_cache()
+    with cache["lock"]:
+        keys = [k for k in cache["items"] if k[0] in _FRAME_TABLOLARI]
+    for key in keys:
+        v = _key_version(key)
+        if v is None or v >= new_v:
+            continue
+        ent = _frame_cache_pop(key)
+        if ent is None or v != old_v:
+            # Erişilemeyen eski sürüm: belleği bırak
+            continue
+        meta = _FRAME_TABLOLARI[key[0]]
+        new_key = _with_version(key, new_v)
+        age = time.monotonic() - ent["t"]
+        if age >= meta["ttl"]:
+            continue
+        try:
+            if meta["tablo"] not in degisen:
+                _frame_cache_put(new_key, ent["deger"], ent["bayt"], age=age, kaynak=ent["kaynak"])
+                if yayinci and meta["snapshot"]:
+                    _snapshot_link(key, new_key)
+                continue
+            hit = None if yayinci or not meta["snapshot"] else snapshot_read(new_key, meta["ttl"])
+            if hit is not None:
+                value, age, nbytes = hit
+                _frame_cache_put(new_key, value, nbytes, age=age, kaynak="mmap")
+                continue
+            d = degisen[meta["tablo"]]
+            merge = _DELTA_BIRLESTIRICILER.get(key[0])
+            if d is None or merge is None:
+                _invalidate_full(new_key, "tablo bütünüyle değişti" if d is None else "birleştirici yok")
+                continue
+            with perf_span(f"delta.{key[0]}", "ağ"):
+                value = merge(ent["deger"], d, dict(key[2]))
+            if value is None:
+                _invalidate_full(new_key, "birleştirici reddetti")
+                continue
+            if meta["snapshot"] and snapshot_write(new_key, value):
+                hit = snapshot_read(new_key, meta["ttl"])
+            if hit is not None:
+                value, _, nbytes = hit
+                _frame_cache_put(new_key, value, nbytes, kaynak="mmap")
+            else:
+                _frame_cache_put(new_key, value, _frame_nbytes(value), kaynak="delta")
+            stats = _change_stats()
+            with stats["lock"]:
+                stats["delta"] += 1
+        except Exception as e:
+            _invalidate_full(new_key, f"v{old_v}→v{new_v}", e)
+
+
+def _snapshot_link(old_key: tuple, new_key: tuple) -> None:
+    """Taşınan girdinin dosyası yeni anahtarla da erişilebilir olur (kopyasız)."""
+    src, dst = _snapshot_path(old_key), _snapshot_path(new_key)
+    tmp = f"{dst}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.link(src, tmp)
+        os.replace(tmp, dst)
+    except OSError:
+        return
+    _snapshot_prune(new_key, keep=dst)
+
+
+def _append_change_file(event: dict) -> None:
+    """Sürüm kilidi altında çağrılır: dosyadaki sıra sürüm sırasıdır."""
+    try:
+        if os.path.getsize(_CHANGES_FILE) > DEGISIKLIK_DOSYA_MAKS_MB * 2**20:
+            os.replace(_CHANGES_FILE, _CHANGES_FILE + ".1")
+    except OSError:
+        pass
+    with open(_CHANGES_FILE, "ab") as fh:
+        fh.write(json.dumps(event).encode() + b"\n")
+
+
+def _notify_postgres(dsn: str, event: dict) -> None:
+    import psycopg2
+
+    conn = psycopg2.connect(dsn)
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_notify(%s, %s)", (DEGISIKLIK_KANALI, json.dumps(event)))
+    finally:
+        conn.close()
+
+
+def _publish_change(*degisiklikler: dict) -> int:
+    """
+    Yazma işlemlerinden sonra çağrılır: sürümü artırır, olayı bu sürecin
+    cache'ine uygular ve kanala yayınlar. Yeni sürümü döner.
+    """
+    conf = _change_config()
+    event = {
+        "id": f"{_SUREC}:{time.time_ns()}", "kaynak": _SUREC,
+        "degisiklikler": list(degisiklikler),
+    }
+
+    def on_bump(old: int, new: int) -> None:
+        event.update(onceki=old, surum=new)
+        _apply_change(event, yayinci=True)
+        if conf["kanal"] == "dosya":
+            try:
+                _append_change_file(event)
+            except OSError as e:
+                _log.warning("Değişiklik dosyasına yazılamadı: %s", e)
+
+    version = _bump_data_version(on_bump)
+    if conf["kanal"] == "postgres":
+        try:
+            _notify_postgres(conf["dsn"], event)
+        except Exception as e:
+            # Diğer replikalar TTL / arka plan yenilemeyle yetişir
+            _log.warning("Postgres NOTIFY gönderilemedi: %s", e)
+    return version
+
+
+class _ChangeListener(threading.Thread):
+    """Kanaldaki olayları bu sürece uygular (süreç başına tek thread)."""
+
+    def __init__(self, kanal: str, dsn: Optional[str]):
+        super().__init__(name="degisiklik-dinleyici", daemon=True)
+        self.kanal, self.dsn = kanal, dsn
+        self.durum = {"kanal": kanal, "alinan": 0, "uygulanan": 0, "son": None, "hata": None}
+        self._seen = deque(maxlen=256)
+        try:
+            # Geçmiş olaylar atlanır: açılışta cache boş
+            st_ = os.stat(_CHANGES_FILE)
+            self._inode, self._pos = st_.st_ino, st_.st_size
+        except OSError:
+            self._inode, self._pos = None, 0
+
+    def run(self) -> None:
+        if self.kanal == "postgres":
+            try:
+                self._listen_postgres()
+            except ImportError as e:
+                self.durum["hata"] = f"{e} — dosya kanalına geçildi"
+                self.durum["kanal"] = "dosya"
+                _log.warning("psycopg2 yüklenemedi (%s); dosya kanalına geçildi", e)
+        while True:
+            self._poll_file()
+            time.sleep(DEGISIKLIK_POLL_S)
+
+    def _poll_file(self) -> None:
+        try:
+            st_ = os.stat(_CHANGES_FILE)
+        except FileNotFoundError:
+            self._inode, self._pos = None, 0
+            return
+        except OSError as e:
+            self.durum["hata"] = str(e)
+            return
+        if st_.st_ino != self._inode or st_.st_size < self._pos:
+            # Dosya döndürüldü: yeni dosya baştan okunur
+            self._inode, self._pos = st_.st_ino, 0
+        if st_.st_size <= self._pos:
+            return
+        try:
+            with open(_CHANGES_FILE, "rb") as fh:
+                fh.seek(self._pos)
+                data = fh.read()
+        except OSError as e:
+            self.durum["hata"] = str(e)
+            return
+        end = data.rfind(b"\n") + 1     # yarım yazılmış satır bir sonraki tura
+        self._pos += end
+        for line in data[:end].splitlines():
+            try:
+                event = json.loads(line)
+            except ValueError as e:
+                self.durum["hata"] = str(e)
+                _log.warning("Okunamayan değişiklik satırı atlandı: %s", e)
+                continue
+            self.handle(event)
+
+    def _listen_postgres(self) -> None:
+        import select
+
+        import psycopg2
+
+        first = True
+        while True:
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {DEGISIKLIK_KANALI}")
+                if not first:
+                    # Kopukken gelen olaylar kaçmış olabilir: yerel sürüm
+                    # artar, sürümlü girdiler kaynaktan yeniden okunur
+                    _bump_data_version()
+                first, self.durum["hata"] = False, None
+                while True:
+                    if select.select([conn], [], [], 30)[0]:
+                        conn.poll()
+                        while conn.notifies:
+                            self.handle(json.loads(conn.notifies.pop(0).payload))
+            except Exception as e:
+                self.durum["hata"] = str(e)
+                _log.warning("Postgres LISTEN bağlantısı koptu: %s; 5 sn sonra yeniden", e)
+                time.sleep(5)
+
+    def handle(self, event: dict) -> None:
+        self.durum["alinan"] += 1
+        if event.get("kaynak") == _SUREC or event.get("id") in self._seen:
+            return
+        self._seen.append(event.get("id"))
+        try:
+            # Olaylar sırayla uygulanır (her biri `onceki` sürümün girdisinden
+            # kurar). Dosya kanalında yayıncı sürümü zaten yazdı; başka makineden
+            # gelen olayda girdiler önce kurulur, sonra sürüm benimsenir.
+            _apply_change(event)
+        except Exception as e:
+            # Olay uygulanamadı: tablo bağlı tüm girdiler bırakılır, sürüm
+            # yine ilerler; süreç eski sürümde kalmaz
+            self.durum["hata"] = f"olay uygulanamadı: {e}"
+            _log.warning("Değişiklik olayı uygulanamadı; tam geçersiz kılınıyor", exc_info=e)
+            for name in _FRAME_TABLOLARI:
+                frame_cache_clear(name)
+        surum = event.get("surum")
+        if surum is not None:
+            _adopt_data_version(surum)
+        else:
+            _bump_data_version()
+        self.durum["uygulanan"] += 1
+        self.durum["son"] = datetime.now()
+
+
+@st.cache_resource
+def _change_listener() -> Optional[_ChangeListener]:
+    conf = _change_config()
+    if conf["kanal"] == "kapali":
+        return None
+    listener = _ChangeListener(conf["kanal"], conf["dsn"])
+    listener.start()
+    return listener
+
+
+def change_listener_status() -> Optional[dict]:
+    """
+    Sistem Yönetimi için: kanal, alınan / uygulanan olay sayısı, delta ile
+    taşınan / tam geçersiz kılınan girdi sayısı, son hata.
+    """
+    listener = _change_listener()
+    if listener is None:
+        return None
+    stats = _change_stats()
+    with stats["lock"]:
+        return {
+            **listener.durum, "delta": stats["delta"], "tam": stats["tam"],
+            "hata": listener.durum["hata"] or stats["hata"],
+        }
+
+
 # ---------------------------------------------------------------------------
 # Katılımcı CRUD
 # ---------------------------------------------------------------------------
+@shared_frame_cache(ttl=600, surumlu=True, snapshot=True, tablo=TABLE_KATILIMCI)
 def get_participants() -> pd.DataFrame:
     sb = get_supabase()
     res = sb.table(TABLE_KATILIMCI).select("*").order("ad_soyad").execute()
@@ -148,9 +1631,10 @@ def add_participant(ad_soyad: str, kategori: str) -> Tuple[bool, str]:
     if kategori not in KATEGORILER:
         return False, f"Geçersiz kategori: {kategori}"
     try:
-        get_supabase().table(TABLE_KATILIMCI).insert(
+        res = get_supabase().table(TABLE_KATILIMCI).insert(
             {"ad_soyad": ad_soyad, "kategori": kategori}
         ).execute()
+        _publish_change(_degisiklik(TABLE_KATILIMCI, [r.get("id") for r in res.data or []]))
         return True, "Eklendi."
     except Exception as e:
         return False, str(e)
@@ -175,6 +1659,11 @@ def update_participant(
             sb.table(TABLE_TAHMIN).update(
                 {"kullanici_adi": new_name, "kategori": new_category}
             ).eq("kullanici_adi", old_name).execute()
+            _publish_change(
+                _degisiklik(TABLE_KATILIMCI, [row_id]), _degisiklik(TABLE_TAHMIN),
+            )
+        else:
+            _publish_change(_degisiklik(TABLE_KATILIMCI, [row_id]))
 
         return True, "Güncellendi."
     except Exception as e:
@@ -184,6 +1673,7 @@ def update_participant(
 def delete_participant(row_id: str) -> Tuple[bool, str]:
     try:
         get_supabase().table(TABLE_KATILIMCI).delete().eq("id", row_id).execute()
+        _publish_change(_degisiklik(TABLE_KATILIMCI, [row_id], "sil"))
         return True, "Silindi."
     except Exception as e:
         return False, str(e)
@@ -222,20 +1712,49 @@ def sync_participants_from_forecasts() -> Tuple[int, str]:
         except Exception:
             pass
 
+    if added:
+        _publish_change(_degisiklik(TABLE_KATILIMCI))
     return added, f"{added} yeni kişi eklendi."
 
 
 # ---------------------------------------------------------------------------
 # Tahmin CRUD
 # ---------------------------------------------------------------------------
-@st.cache_data(ttl=600)
+@shared_frame_cache(ttl=600, surumlu=True, snapshot=True, tablo=TABLE_TAHMIN)
 def get_all_forecasts(limit: int = 20000) -> pd.DataFrame:
     sb = get_supabase()
     res = (
         sb.table(TABLE_TAHMIN).select("*")
-        .order("tahmin_tarihi", desc=True).limit(limit).execute()
+        .order("tahmin_tarihi", desc=True).limit(limit).csv().execute()
     )
-    return clean_numeric_and_dates(pd.DataFrame(res.data or []))
+    return read_forecasts_csv(res.data)
+
+
+def _merge_forecast_rows(df: pd.DataFrame, degisiklik: dict, args: dict) -> Optional[pd.DataFrame]:
+    """
+    Değişen id'leri tablodan çıkarır, yazılanları kaynaktan çekip ekler ve
+    sorgunun sırasını korur. Tablo `limit`'e dayanmışsa (dışarıda kalan
+    satırlar bilinmiyor) birleştirilmez.
+    """
+    if df is None or "id" not in df.columns or len(df) >= args["limit"]:
+        return None
+    ids = [str(k) for k in degisiklik["anahtarlar"]]
+    kept = df[~df["id"].astype(str).isin(ids)]
+    if degisiklik["islem"] == "sil":
+        return kept.reset_index(drop=True)
+    res = (
+        get_supabase().table(TABLE_TAHMIN).select("*")
+        .in_("id", ids).csv().execute()
+    )
+    new = read_forecasts_csv(res.data)
+    out = pd.concat([kept, new], ignore_index=True) if len(new) else kept
+    # Postgres DESC sıralamasında NULL'lar başa gelir
+    return out.sort_values(
+        "tahmin_tarihi", ascending=False, kind="mergesort", na_position="first",
+    ).head(args["limit"]).reset_index(drop=True)
+
+
+_DELTA_BIRLESTIRICILER["get_all_forecasts"] = _merge_forecast_rows
 
 
 def get_latest_per_user_period(df: pd.DataFrame) -> pd.DataFrame:
@@ -269,6 +1788,59 @@ def get_latest_as_of(df: pd.DataFrame, as_of: str) -> pd.DataFrame:
     )
 
 
+# ---------------------------------------------------------------------------
+# Türetilmiş görünümler — (veri sürümü, parametreler) anahtarlı, LRU sınırlı
+# ---------------------------------------------------------------------------
+DERIVED_CACHE_MAX = 32
+
+
+@shared_frame_cache(ttl=600, tablo=TABLE_TAHMIN)
+@perf_timed()
+def get_forecasts_view(version: int) -> pd.DataFrame:
+    """Dashboard taban tablosu: tarihe göre sıralı + `gorunen_isim`."""
+    df = get_all_forecasts()
+    if df is None or df.empty:
+        return df
+    # Kaynak paylaşılan (salt okunur) girdi: yeni kolon kopyaya eklenir
+    df = df.sort_values("tahmin_tarihi", kind="mergesort").reset_index(drop=True)
+    return df.assign(gorunen_isim=df["kullanici_adi"])
+
+
+@shared_frame_cache(ttl=600, tablo=TABLE_TAHMIN)
+@perf_timed()
+def get_latest_view(version: int, as_of: Optional[str] = None) -> pd.DataFrame:
+    """as_of verilmezse en güncel, verilirse o ay sonundaki son tahminler."""
+    df = get_forecasts_view(version)
+    if as_of:
+        return get_latest_as_of(df, as_of)
+    return get_latest_per_user_period(df)
+
+
+@st.cache_data(ttl=600, max_entries=4)
+@perf_timed()
+def get_forecast_meta(version: int) -> Tuple[list, list, list]:
+    """(tahmin ayları — yeniden eskiye, hedef dönemler, görünen isimler)."""
+    df = get_forecasts_view(version)
+    if df is None or df.empty:
+        return [], [], []
+    months = sorted(
+        df["tahmin_tarihi"].dropna().dt.strftime("%Y-%m").unique(), reverse=True
+    )
+    periods = sorted(df["hedef_donemi"].dropna().unique().tolist())
+    names = sorted(df["gorunen_isim"].dropna().unique().tolist())
+    return months, periods, names
+
+
+@st.cache_data(ttl=600, max_entries=DERIVED_CACHE_MAX)
+@perf_timed()
+def get_period_slice(version: int, as_of: Optional[str], periods: tuple) -> pd.DataFrame:
+    """get_latest_view'in seçili hedef dönemlere indirgenmiş hali."""
+    df = get_latest_view(version, as_of)
+    if df is None or df.empty:
+        return df
+    return df[df["hedef_donemi"].isin(periods)]
+
+
 def _strip_minmax_if_not_allowed(kategori: str, data: dict) -> dict:
     if is_minmax_allowed(kategori):
         return data
@@ -310,61 +1882,530 @@ def upsert_tahmin(
     if link:
         payload["kaynak_link"] = link
 
-    try:
-        existing = (
-            sb.table(TABLE_TAHMIN).select("id")
-            .eq("kullanici_adi", user)
-            .eq("hedef_donemi", hedef_donemi)
-            .eq("tahmin_tarihi", tahmin_tarihi)
-            .limit(1).execute()
+    try:
+        existing = (
+            sb.table(TABLE_TAHMIN).select("id")
+            .eq("kullanici_adi", user)
+            .eq("hedef_donemi", hedef_donemi)
+            .eq("tahmin_tarihi", tahmin_tarihi)
+            .limit(1).execute()
+        )
+        if existing.data:
+            row_id = existing.data[0]["id"]
+            sb.table(TABLE_TAHMIN).update(payload).eq("id", row_id).execute()
+            msg = "Aynı tarih için güncellendi."
+        else:
+            res = sb.table(TABLE_TAHMIN).insert(payload).execute()
+            row_id = res.data[0].get("id") if res.data else None
+            msg = "Yeni kayıt eklendi."
+
+        _publish_change(_degisiklik(TABLE_TAHMIN, [row_id]))
+        return True, msg
+    except Exception as e:
+        return False, str(e)
+
+
+def update_tahmin_by_id(row_id: str, updates: dict) -> Tuple[bool, str]:
+    sb = get_supabase()
+    clean = {k: v for k, v in updates.items() if v is not None}
+    try:
+        sb.table(TABLE_TAHMIN).update(clean).eq("id", row_id).execute()
+        _publish_change(_degisiklik(TABLE_TAHMIN, [row_id]))
+        return True, "Güncellendi"
+    except Exception as e:
+        return False, str(e)
+
+
+DELETE_CHUNK = 150     # tek in_() filtresindeki en fazla id (URL uzunluğu sınırı)
+DELETE_WORKERS = 4
+
+
+def _chunks(seq: list, size: int):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+def delete_tahmin_by_ids(ids: list) -> Tuple[bool, str]:
+    """id listesini DELETE_CHUNK'lık gruplara bölüp eşzamanlı siler."""
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return False, "Silinecek kayıt seçilmedi."
+
+    sb = get_supabase()
+
+    def _delete(chunk: list) -> list:
+        sb.table(TABLE_TAHMIN).delete(returning=ReturnMethod.minimal).in_("id", chunk).execute()
+        return chunk
+
+    deleted, errors = [], []
+    with ThreadPoolExecutor(max_workers=DELETE_WORKERS, thread_name_prefix="silme") as ex:
+        futures = [
+            ex.submit(copy_context().run, _pool_run, _delete, c)
+            for c in _chunks(ids, DELETE_CHUNK)
+        ]
+        for f in as_completed(futures):
+            try:
+                deleted += f.result()
+            except Exception as e:
+                errors.append(str(e)[:100])
+
+    if deleted:
+        _publish_change(_degisiklik(TABLE_TAHMIN, deleted, "sil"))
+    deleted = len(deleted)
+    if errors:
+        return False, f"{deleted} kayıt silindi, {len(errors)} grup başarısız (örn: {errors[0]})"
+    return True, f"{deleted} kayıt silindi."
+
+
+def delete_tahmin_by_filter(
+    kategoriler: tuple = (), kullanicilar: tuple = (), donemler: tuple = ()
+) -> Tuple[bool, str]:
+    """
+    Filtreye uyan tüm tahminleri tek sunucu tarafı DELETE ile siler.
+    Filtresiz çağrı reddedilir — tüm veri için reset_all_data kullanılır.
+    """
+    if not (kategoriler or kullanicilar or donemler):
+        return False, "En az bir filtre gerekli. Tüm veriyi silmek için Sistem Yönetimi → Sıfırlama."
+    try:
+        q = get_supabase().table(TABLE_TAHMIN).delete(
+            count="exact", returning=ReturnMethod.minimal
+        )
+        res = _apply_forecast_filters(q, kategoriler, kullanicilar, donemler).execute()
+        _publish_change(_degisiklik(TABLE_TAHMIN))
+        return True, f"{res.count or 0} kayıt silindi."
+    except Exception as e:
+        return False, str(e)
+
+
+def reset_all_data(participants_too: bool = True) -> Tuple[bool, str]:
+    """Tüm tahminleri (ve isteğe bağlı katılımcıları) siler."""
+    sb = get_supabase()
+    try:
+        sb.table(TABLE_TAHMIN).delete().not_.is_("id", "null").execute()
+        msg = "Tüm tahminler silindi."
+        if participants_too:
+            sb.table(TABLE_KATILIMCI).delete().not_.is_("id", "null").execute()
+            msg += " Katılımcılar da silindi."
+        _publish_change(
+            _degisiklik(TABLE_TAHMIN),
+            *([_degisiklik(TABLE_KATILIMCI)] if participants_too else []),
+        )
+        return True, msg
+    except Exception as e:
+        return False, str(e)
+
+
+# ---------------------------------------------------------------------------
+# Veri havuzu — sunucu tarafında filtre, sıralama ve sayfalama
+# ---------------------------------------------------------------------------
+VERI_HAVUZU_PAGE_SIZE = 100
+VERI_HAVUZU_SAYFA_BOYLARI = (50, 100, 250, 500)
+SIRALANABILIR_KOLONLAR = {
+    "Tahmin Tarihi": "tahmin_tarihi",
+    "Hedef Dönem": "hedef_donemi",
+    "Katılımcı": "kullanici_adi",
+    "Kategori": "kategori",
+    "Eklenme": "created_at",
+}
+
+
+def _apply_forecast_filters(query, kategoriler=(), kullanicilar=(), donemler=()):
+    """Boş filtre = kısıt yok. PostgREST `in.(...)` filtresine çevrilir."""
+    if kategoriler:
+        query = query.in_("kategori", list(kategoriler))
+    if kullanicilar:
+        query = query.in_("kullanici_adi", list(kullanicilar))
+    if donemler:
+        query = query.in_("hedef_donemi", list(donemler))
+    return query
+
+
+@st.cache_data(ttl=600, max_entries=DERIVED_CACHE_MAX)
+def count_forecasts(
+    version: int, kategoriler: tuple = (), kullanicilar: tuple = (), donemler: tuple = ()
+) -> int:
+    """Filtreye uyan satır sayısı (`count=exact`, satır taşımadan)."""
+    q = get_supabase().table(TABLE_TAHMIN).select("id", count="exact", head=True)
+    res = _apply_forecast_filters(q, kategoriler, kullanicilar, donemler).execute()
+    return int(res.count or 0)
+
+
+@st.cache_data(ttl=600, max_entries=DERIVED_CACHE_MAX)
+def query_forecasts(
+    version: int,
+    kategoriler: tuple = (),
+    kullanicilar: tuple = (),
+    donemler: tuple = (),
+    order_by: str = "tahmin_tarihi",
+    desc: bool = True,
+    page: int = 1,
+    page_size: int = VERI_HAVUZU_PAGE_SIZE,
+) -> pd.DataFrame:
+    """
+    Tek sayfa tahmin. Filtre, sıralama ve `range` sunucuda uygulanır; `id`
+    ikincil sıralama ile sayfalar kararlıdır. Toplam için count_forecasts
+    (sayfa değiştikçe yeniden sayılmaz).
+    """
+    start = (max(1, page) - 1) * page_size
+    q = get_supabase().table(TABLE_TAHMIN).select("*")
+    q = _apply_forecast_filters(q, kategoriler, kullanicilar, donemler)
+    res = (
+        q.order(order_by, desc=desc).order("id")
+        .range(start, start + page_size - 1).execute()
+    )
+    return clean_numeric_and_dates(pd.DataFrame(res.data or []))
+
+
+# ---------------------------------------------------------------------------
+# Dışa aktarım — CSV / Parquet / Excel, sayfa sayfa
+# ---------------------------------------------------------------------------
+EXPORT_PAGE_SIZE = 1000        # PostgREST varsayılan max-rows
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "ekonomi_exports")
+EXPORT_FORMATLARI = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+_EXCEL_MAX_ROWS = 1_048_576
+EXPORT_SAKLA = 8               # tutulan en fazla dışa aktarım dosyası
+EXPORT_MAKS_YAS_S = 3600       # bundan eski dosyalar silinir (indirme bağlantısı düşer)
+
+
+def iter_forecast_pages(
+    kategoriler: tuple = (), kullanicilar: tuple = (), donemler: tuple = (),
+    page_size: int = EXPORT_PAGE_SIZE,
+):
+    """
+    Filtreye uyan tahminleri DataFrame sayfaları olarak üretir. OFFSET yerine
+    `id > son_id` (keyset) sayfalama: büyük tablolarda her sayfa aynı hızda gelir.
+    """
+    sb = get_supabase()
+    last_id = None
+    while True:
+        q = _apply_forecast_filters(
+            sb.table(TABLE_TAHMIN).select("*"), kategoriler, kullanicilar, donemler
+        )
+        if last_id is not None:
+            q = q.gt("id", last_id)
+        page = read_forecasts_csv(q.order("id").limit(page_size).csv().execute().data)
+        if page.empty:
+            return
+        yield _conform_forecasts(page)
+        if len(page) < page_size:
+            return
+        last_id = page["id"].iloc[-1]
+
+
+def _conform_forecasts(df: pd.DataFrame) -> pd.DataFrame:
+    """Sayfalar arası tutarlı kolon sırası ve tipleri (Parquet şeması için)."""
+    out = df.reindex(columns=TAHMIN_KOLONLARI)
+    for c in TAHMIN_SAYISAL_KOLONLARI:
+        out[c] = out[c].astype("float64")
+    out["tahmin_tarihi"] = pd.to_datetime(out["tahmin_tarihi"], errors="coerce")
+    out["created_at"] = pd.to_datetime(out["created_at"], errors="coerce", utc=True)
+    for c in TAHMIN_METIN_KOLONLARI:
+        out[c] = out[c].astype(object).where(out[c].notna(), None)
+    return out
+
+
+def _forecast_arrow_schema(columns):
+    """
+    Tahmin kolonları için sabit Arrow şeması; ilk sayfada tamamen boş olan
+    bir kolon `null` tipine düşüp sonraki sayfaları reddetmesin. Tahmin
+    tablosu dışındaki kolonlarda (pivotlar) None döner → şema çıkarımı.
+    """
+    import pyarrow as pa
+
+    if not set(columns) <= set(TAHMIN_KOLONLARI):
+        return None
+    tipler = _forecast_arrow_types()
+    return pa.schema([(c, tipler.get(c, pa.string())) for c in columns])
+
+
+def _forecast_arrow_types() -> dict:
+    """Tahmin kolonlarının Arrow tipleri (dışa aktarım ve CSV okuma ortak)."""
+    import pyarrow as pa
+
+    tipler = {c: pa.string() for c in TAHMIN_METIN_KOLONLARI}
+    tipler.update({c: pa.float64() for c in TAHMIN_SAYISAL_KOLONLARI})
+    tipler.update({"tahmin_tarihi": pa.timestamp("ns"),
+                   "created_at": pa.timestamp("ns", tz="UTC")})
+    return tipler
+
+
+def _write_frames(frames, fmt: str, fh) -> int:
+    """
+    DataFrame akışını ikili dosyaya yazar; bellekte yalnızca o anki sayfa
+    tutulur. Excel `constant_memory` ile satır satır yazılır. Satır sayısı döner.
+    """
+    n = 0
+    if fmt == "csv":
+        fh.write(b"\xef\xbb\xbf")  # Excel'de Türkçe karakterler için BOM
+        for i, frame in enumerate(frames):
+            fh.write(frame.to_csv(index=False, header=(i == 0)).encode("utf-8"))
+            n += len(frame)
+
+    elif fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for frame in frames:
+                if writer is None:
+                    schema = _forecast_arrow_schema(frame.columns)
+                table = pa.Table.from_pandas(frame, preserve_index=False, schema=schema)
+                if writer is None:
+                    writer = pq.ParquetWriter(fh, table.schema, compression="zstd")
+                writer.write_table(table)
+                n += len(frame)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    elif fmt == "xlsx":
+        import xlsxwriter
+
+        wb = xlsxwriter.Workbook(fh, {
+            "constant_memory": True,
+            "remove_timezone": True,
+            "default_date_format": "yyyy-mm-dd",
+        })
+        ws, row, header, sheet_no = None, 0, None, 0
+        for frame in frames:
+            if header is None:
+                header = [str(c) for c in frame.columns]
+            values = frame.astype(object).where(frame.notna(), None)
+            for rec in values.itertuples(index=False, name=None):
+                if ws is None or row >= _EXCEL_MAX_ROWS:
+                    sheet_no += 1
+                    ws = wb.add_worksheet(f"Veri_{sheet_no}")
+                    ws.write_row(0, 0, header)
+                    row = 1
+                ws.write_row(row, 0, rec)
+                row += 1
+            n += len(frame)
+        if ws is None:
+            wb.add_worksheet("Veri_1").write_row(0, 0, header or [])
+        wb.close()
+
+    else:
+        raise ValueError(f"Desteklenmeyen format: {fmt}")
+    return n
+
+
+def _prune_exports(keep: int = EXPORT_SAKLA) -> None:
+    """En yeni `keep` dışa aktarımı tutar, EXPORT_MAKS_YAS_S'den eskileri siler."""
+    try:
+        files = [
+            os.path.join(EXPORT_DIR, f) for f in os.listdir(EXPORT_DIR)
+            if f.startswith("tahminler_")
+        ]
+        files.sort(key=os.path.getmtime, reverse=True)
+        now = time.time()
+        for i, path in enumerate(files):
+            if i >= keep or now - os.path.getmtime(path) > EXPORT_MAKS_YAS_S:
+                os.remove(path)
+    except OSError:
+        pass
+
+
+def discard_export(path: Optional[str]) -> None:
+    """Oturumun artık kullanmadığı dışa aktarım dosyasını siler."""
+    if path and os.path.dirname(os.path.abspath(path)) == os.path.abspath(EXPORT_DIR):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def export_forecasts(
+    fmt: str, kategoriler: tuple = (), kullanicilar: tuple = (), donemler: tuple = ()
+) -> Tuple[str, int]:
+    """
+    Filtreye uyan tahminleri veritabanından sayfa sayfa okuyup diske yazar.
+    Dönüş: (dosya yolu, satır sayısı).
+    """
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    _prune_exports(keep=EXPORT_SAKLA - 1)
+    fd, path = tempfile.mkstemp(prefix="tahminler_", suffix=f".{fmt}", dir=EXPORT_DIR)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            n = _write_frames(
+                iter_forecast_pages(kategoriler, kullanicilar, donemler), fmt, fh
+            )
+    except Exception:
+        os.remove(path)
+        raise
+    return path, n
+
+
+def export_frame(df: pd.DataFrame, fmt: str, index: bool = True) -> bytes:
+    """Bellekteki küçük tablolar (ör. Dashboard pivotları) için aynı yazıcılar."""
+    frame = df.reset_index() if index else df
+    out = io.BytesIO()
+    _write_frames([frame], fmt, out)
+    return out.getvalue()
+
+
+@st.cache_data(show_spinner=False, max_entries=DERIVED_CACHE_MAX)
+@perf_timed()
+def export_heatmap_matrix(
+    version: int, as_of: Optional[str], metric: str, kategoriler: tuple, fmt: str
+) -> bytes:
+    """Isı haritası matrisinin indirilebilir hâli; veri sürümü değişmedikçe yeniden yazılmaz."""
+    pivot = build_heatmap_matrix(version, as_of, metric, kategoriler)
+    pivot.columns = [str(c) for c in pivot.columns]
+    return export_frame(pivot.rename_axis("Katılımcı"), fmt)
+
+
+# ---------------------------------------------------------------------------
+# HTTP istemcisi — piyasa kaynakları için ortak, havuzlu oturum
+# ---------------------------------------------------------------------------
+# Tüm dış kaynaklar (EVDS, BIS ve eklenecek seriler) tek requests.Session
+# kullanır: host başına keep-alive bağlantı havuzu, jitter'lı üstel geri
+# çekilmeyle sınırlı yeniden deneme (bağlantı hatası, 429, 5xx; Retry-After'a
+# uyulur), host başına eşzamanlı istek sınırı ve ETag / Last-Modified veren
+# kaynaklarda koşullu istek (304 → saklanan gövde, yeniden indirme yok).
+HTTP_HAVUZ = 8                  # host başına tutulan bağlantı
+HTTP_HOST_ESZAMANLI = 4         # host başına aynı anda en fazla istek
+HTTP_DENEME = 3
+HTTP_GERI_CEKILME_S = 0.5       # 0.5, 1, 2 sn (+ en çok bu kadar jitter)
+HTTP_ZAMAN_ASIMI = (5, 20)      # (bağlanma, okuma) sn — çağıran vermezse
+HTTP_KOSULLU_MAKS = 64          # doğrulayıcısı saklanan en fazla URL
+
+
+def _retry_policy():
+    from urllib3.util import Retry
+
+    kwargs = dict(
+        total=HTTP_DENEME, connect=HTTP_DENEME, read=HTTP_DENEME, status=HTTP_DENEME,
+        backoff_factor=HTTP_GERI_CEKILME_S,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        # Denemeler bitince son yanıt döner; durum kodunu çağıran değerlendirir
+        raise_on_status=False,
+    )
+    try:
+        return Retry(backoff_jitter=HTTP_GERI_CEKILME_S, **kwargs)
+    except TypeError:
+        # urllib3 < 2: jitter yok
+        return Retry(**kwargs)
+
+
+@st.cache_resource
+def _http_store() -> dict:
+    return {"lock": threading.Lock(), "hostlar": {}, "kosullu": OrderedDict()}
+
+
+def _host_semaphore(host: str) -> threading.BoundedSemaphore:
+    store = _http_store()
+    with store["lock"]:
+        sem = store["hostlar"].get(host)
+        if sem is None:
+            sem = store["hostlar"][host] = threading.BoundedSemaphore(HTTP_HOST_ESZAMANLI)
+    return sem
+
+
+def _replay_response(ent: dict, request, not_modified) -> requests.Response:
+    """304 yanıtını saklanan 200 gövdesiyle değiştirir."""
+    out = requests.Response()
+    out.status_code, out.reason = 200, "OK"
+    out.headers = requests.structures.CaseInsensitiveDict(ent["basliklar"])
+    out._content = ent["govde"]
+    out.encoding = ent["kodlama"]
+    out.url, out.request = request.url, request
+    out.connection, out.elapsed = not_modified.connection, not_modified.elapsed
+    out.onbellekten = True
+    return out
+
+
+class _PooledAdapter(requests.adapters.HTTPAdapter):
+    def __init__(self, ssl_context=None):
+        self.ssl_context = ssl_context
+        super().__init__(
+            pool_connections=HTTP_HAVUZ, pool_maxsize=HTTP_HAVUZ, max_retries=_retry_policy(),
         )
-        if existing.data:
-            row_id = existing.data[0]["id"]
-            sb.table(TABLE_TAHMIN).update(payload).eq("id", row_id).execute()
-            msg = "Aynı tarih için güncellendi."
-        else:
-            sb.table(TABLE_TAHMIN).insert(payload).execute()
-            msg = "Yeni kayıt eklendi."
 
-        get_all_forecasts.clear()
-        return True, msg
-    except Exception as e:
-        return False, str(e)
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self.ssl_context is not None:
+            pool_kwargs["ssl_context"] = self.ssl_context
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        store = _http_store()
+        conditional = request.method == "GET" and not stream
+        ent = None
+        if conditional:
+            with store["lock"]:
+                ent = store["kosullu"].get(request.url)
+            if ent is not None:
+                if ent["etag"]:
+                    request.headers.setdefault("If-None-Match", ent["etag"])
+                if ent["degisim"]:
+                    request.headers.setdefault("If-Modified-Since", ent["degisim"])
+
+        with _host_semaphore(urlsplit(request.url).netloc):
+            resp = super().send(request, stream=stream, timeout=timeout or HTTP_ZAMAN_ASIMI, **kwargs)
+
+        if not conditional:
+            return resp
+        if resp.status_code == 304 and ent is not None:
+            return _replay_response(ent, request, resp)
+        etag, modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        if resp.status_code == 200 and (etag or modified):
+            with store["lock"]:
+                store["kosullu"][request.url] = {
+                    "etag": etag, "degisim": modified, "govde": resp.content,
+                    "basliklar": dict(resp.headers), "kodlama": resp.encoding,
+                }
+                store["kosullu"].move_to_end(request.url)
+                while len(store["kosullu"]) > HTTP_KOSULLU_MAKS:
+                    store["kosullu"].popitem(last=False)
+        return resp
+
+
+class _SharedSession(requests.Session):
+    """Süreç boyunca açık kalır: close() (ör. evds her istekten sonra çağırır) havuzu boşaltmaz."""
+
+    def close(self) -> None:
+        pass
 
 
-def update_tahmin_by_id(row_id: str, updates: dict) -> Tuple[bool, str]:
-    sb = get_supabase()
-    clean = {k: v for k, v in updates.items() if v is not None}
-    try:
-        sb.table(TABLE_TAHMIN).update(clean).eq("id", row_id).execute()
-        get_all_forecasts.clear()
-        return True, "Güncellendi"
-    except Exception as e:
-        return False, str(e)
+@st.cache_resource
+def _http_session() -> requests.Session:
+    sess = _SharedSession()
+    adapter = _PooledAdapter()
+    sess.mount("https://", adapter)
+    sess.mount("http://", adapter)
+    return sess
 
 
-def delete_tahmin_by_ids(ids: list) -> Tuple[bool, str]:
-    try:
-        get_supabase().table(TABLE_TAHMIN).delete().in_("id", ids).execute()
-        get_all_forecasts.clear()
-        return True, f"{len(ids)} kayıt silindi."
-    except Exception as e:
-        return False, str(e)
+def http_get(url: str, **kwargs) -> requests.Response:
+    """Piyasa kaynakları için GET; havuz, yeniden deneme ve koşullu istek ortak."""
+    return _http_session().get(url, **kwargs)
 
 
-def reset_all_data(participants_too: bool = True) -> Tuple[bool, str]:
-    """Tüm tahminleri (ve isteğe bağlı katılımcıları) siler."""
-    sb = get_supabase()
-    try:
-        sb.table(TABLE_TAHMIN).delete().not_.is_("id", "null").execute()
-        msg = "Tüm tahminler silindi."
-        if participants_too:
-            sb.table(TABLE_KATILIMCI).delete().not_.is_("id", "null").execute()
-            msg += " Katılımcılar da silindi."
-        get_all_forecasts.clear()
-        return True, msg
-    except Exception as e:
-        return False, str(e)
+@st.cache_resource
+def _evds_client(api_key: str):
+    """
+    evdsAPI kurulurken kategori listesini çeker; istemci anahtar başına bir
+    kez kurulur ve ortak oturuma bağlanır.
+    """
+    import ssl
+
+    from evds import evdsAPI
+
+    client = evdsAPI(api_key)
+    base = urlsplit(getattr(client, "base_url", "") or "")
+    if base.scheme == "https" and getattr(client, "legacySSL", False):
+        # evds paketinin kendi oturumundaki ayar: sunucu eski TLS yeniden anlaşması ister
+        ctx = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
+        ctx.options |= getattr(ssl, "OP_LEGACY_SERVER_CONNECT", 0x4)
+        _http_session().mount(f"https://{base.netloc}/", _PooledAdapter(ssl_context=ctx))
+    client.session = _http_session()
+    return client
 
 
 # ---------------------------------------------------------------------------
@@ -372,12 +2413,14 @@ def reset_all_data(participants_too: bool = True) -> Tuple[bool, str]:
 # ---------------------------------------------------------------------------
 def _evds_to_pct(evds_client, series_code: str, fetch_start: str, fetch_end: str) -> pd.DataFrame:
     try:
-        raw = evds_client.get_data(
-            [series_code],
-            startdate=fetch_start,
-            enddate=fetch_end,
-            frequency=5,
-        )
+        with perf_span("evds.get_data", "ağ", seri=series_code) as sp:
+            raw = evds_client.get_data(
+                [series_code],
+                startdate=fetch_start,
+                enddate=fetch_end,
+                frequency=5,
+            )
+            sp["satir"] = _frame_rows(raw)
         if raw is None or raw.empty:
             return pd.DataFrame()
 
@@ -396,7 +2439,8 @@ def _evds_to_pct(evds_client, series_code: str, fetch_start: str, fetch_end: str
         return pd.DataFrame()
 
 
-@st.cache_data(ttl=600)
+@shared_frame_cache(ttl=600, snapshot=True)
+@perf_timed()
 def fetch_market_data_adapter(start_date, end_date) -> Tuple[pd.DataFrame, Optional[str]]:
     """TÜFE (EVDS hibrit) + PPK Faizi (BIS) → aylık master tablo."""
     empty_df = pd.DataFrame(columns=["Donem", "Aylık TÜFE", "Yıllık TÜFE", "PPK Faizi", "SortDate"])
@@ -408,8 +2452,7 @@ def fetch_market_data_adapter(start_date, end_date) -> Tuple[pd.DataFrame, Optio
     # --- TÜFE (hibrit) ---
     df_inf = pd.DataFrame()
     try:
-        from evds import evdsAPI
-        evds_client = evdsAPI(api_key)
+        evds_client = _evds_client(api_key)
         ts_start = pd.Timestamp(start_date)
         ts_end = pd.Timestamp(end_date)
 
@@ -442,7 +2485,10 @@ def fetch_market_data_adapter(start_date, end_date) -> Tuple[pd.DataFrame, Optio
     try:
         s = pd.Timestamp(start_date).strftime("%Y-%m-%d")
         e = pd.Timestamp(end_date).strftime("%Y-%m-%d")
-        r = requests.get(BIS_PPK_URL.format(start=s, end=e), timeout=20)
+        with perf_span("bis.ppk", "ağ") as sp:
+            r = http_get(BIS_PPK_URL.format(start=s, end=e))
+            sp["bayt"] = len(r.content)
+            sp["kosullu"] = getattr(r, "onbellekten", False)
         if r.status_code == 200:
             tmp = pd.read_csv(
                 io.StringIO(r.content.decode("utf-8")),
@@ -476,6 +2522,923 @@ def fetch_market_data_adapter(start_date, end_date) -> Tuple[pd.DataFrame, Optio
     return master.sort_values("SortDate").reset_index(drop=True), None
 
 
+def market_data_key(start_date, end_date) -> tuple:
+    """
+    Gerçekleşme verisinin cache anahtarı: aralık + fetch_market_data_adapter
+    girdisinin yüklenme anı. Girdi yenilenince anahtar değişir; türetilmiş
+    tablolar DataFrame'i her çağrıda hash'lemez.
+    """
+    return (start_date, end_date, fetch_market_data_adapter.stamp(start_date, end_date))
+
+
+def _market_frame(market_key: Optional[tuple]) -> Optional[pd.DataFrame]:
+    """market_data_key'in gösterdiği gerçekleşme tablosu (paylaşılan cache'ten)."""
+    if market_key is None:
+        return None
+    df, _ = fetch_market_data_adapter(*market_key[:2])
+    return df
+
+
+# ---------------------------------------------------------------------------
+# Sayfa verisi — bağımsız kaynaklar eşzamanlı yüklenir
+# ---------------------------------------------------------------------------
+# Tahminler (Supabase), katılımcılar (Supabase) ve piyasa verisi (EVDS + BIS)
+# birbirinden bağımsızdır; sırayla çağrıldığında soğuk sayfa gecikmelerin
+# toplamını bekler, burada en yavaş kaynağı. Her iş çağıranın bağlamının
+# kopyasında çalışır: span'ler ve Supabase sayaçları sayfanın kaydına düşer.
+def load_parallel(isler: dict) -> dict:
+    """
+    `isler`: ad → argümansız fonksiyon. Dönüş:
+    {"veri": {ad: sonuç ya da None}, "sure_ms": {ad: ms}, "hata": {ad: mesaj}}.
+    Bir kaynağın hatası diğerlerini durdurmaz.
+    """
+    out = {"veri": {}, "sure_ms": {}, "hata": {}}
+
+    def run_one(ad: str, fn: Callable[[], object]) -> None:
+        t0 = time.perf_counter()
+        try:
+            with perf_span(f"yukle.{ad}", "ağ"):
+                out["veri"][ad] = fn()
+        except Exception as e:
+            out["veri"][ad] = None
+            out["hata"][ad] = str(e)
+        out["sure_ms"][ad] = (time.perf_counter() - t0) * 1000
+
+    with perf_span("yukle.paralel", "ağ", kaynak=len(isler)):
+        if len(isler) <= 1:
+            for ad, fn in isler.items():
+                run_one(ad, fn)
+            return out
+        with ThreadPoolExecutor(max_workers=len(isler), thread_name_prefix="sayfa-veri") as ex:
+            # Her iş kendi bağlam kopyasında: aynı Context iki thread'de açılamaz
+            futures = [
+                ex.submit(copy_context().run, _pool_run, run_one, ad, fn)
+                for ad, fn in isler.items()
+            ]
+            for f in futures:
+                f.result()
+    return out
+
+
+def load_page_data(
+    tahmin: bool = False, katilimci: bool = False,
+    piyasa: Optional[Tuple[date, date]] = None,
+) -> dict:
+    """
+    Sayfaların ortak yükleyicisi; seçilen kaynaklar load_parallel ile gelir.
+    `veri["tahmin"]` get_all_forecasts(), `veri["katilimci"]` get_participants(),
+    `veri["piyasa"]` fetch_market_data_adapter(*piyasa) sonucudur.
+    """
+    isler = {}
+    if tahmin:
+        isler["tahmin"] = get_all_forecasts
+    if katilimci:
+        isler["katilimci"] = get_participants
+    if piyasa is not None:
+        isler["piyasa"] = lambda: fetch_market_data_adapter(*piyasa)
+    return load_parallel(isler)
+
+
+# ---------------------------------------------------------------------------
+# Analitik — Isı haritası matrisi
+# ---------------------------------------------------------------------------
+HEATMAP_PAGE_SIZE = 50            # Plotly modunda sayfa başına satır
+HEATMAP_STYLER_MAX_CELLS = 2000   # Bunun üstünde Styler (hücre başı CSS) kullanılmaz
+
+
+@st.cache_data(ttl=600, max_entries=DERIVED_CACHE_MAX)
+@perf_timed()
+def build_heatmap_matrix(
+    version: int, as_of: Optional[str], metric: str, kategoriler: tuple
+) -> pd.DataFrame:
+    """
+    Katılımcı × hedef dönem matrisi. Satırlar alfabetik, sütunlar kronolojik.
+    `pivot_table(aggfunc="last")` yerine dedupe + `pivot` kullanır.
+    """
+    df_latest = get_latest_view(version, as_of)
+    if df_latest is None or df_latest.empty or metric not in df_latest.columns:
+        return pd.DataFrame()
+
+    d = df_latest.loc[
+        df_latest["kategori"].isin(kategoriler),
+        ["gorunen_isim", "hedef_donemi", metric],
+    ].dropna(subset=[metric])
+    if d.empty:
+        return pd.DataFrame()
+
+    d = d.drop_duplicates(subset=["gorunen_isim", "hedef_donemi"], keep="last")
+    pivot = d.pivot(index="gorunen_isim", columns="hedef_donemi", values=metric)
+    return pivot.sort_index().reindex(columns=sorted(pivot.columns))
+
+
+# ---------------------------------------------------------------------------
+# Analitik — Tahmin revizyonları
+# ---------------------------------------------------------------------------
+def _revision_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Uzun formatta revizyon tablosu: her (metrik, kullanıcı, hedef dönem)
+    serisi tarihe göre sıralanır; ardışık tahminler arası fark ve gün sayısı.
+    """
+    metric_cols = [c for c in TAHMIN_METRIKLERI.values() if c in df.columns]
+    id_cols = [
+        c for c in ("kullanici_adi", "gorunen_isim", "kategori", "hedef_donemi",
+                    "tahmin_tarihi", "kaynak_link")
+        if c in df.columns
+    ]
+    long = (
+        df.melt(id_vars=id_cols, value_vars=metric_cols,
+                var_name="metrik", value_name="deger")
+        .dropna(subset=["deger", "tahmin_tarihi"])
+        .sort_values(["metrik", "kullanici_adi", "hedef_donemi", "tahmin_tarihi"],
+                     kind="mergesort")
+        .reset_index(drop=True)
+    )
+    g = long.groupby(["metrik", "kullanici_adi", "hedef_donemi"], sort=False)
+    long["revizyon"] = g["deger"].diff()
+    long["gun_arasi"] = g["tahmin_tarihi"].diff().dt.days
+    long["revizyon_no"] = g.cumcount()
+    return long
+
+
+def _revision_summary(rev: pd.DataFrame) -> pd.DataFrame:
+    """Katılımcı × metrik bazında revizyon sayısı, ortalama büyüklük ve yön."""
+    r = rev.assign(
+        mutlak=rev["revizyon"].abs(),
+        yukari=(rev["revizyon"] > 0).astype(float).where(rev["revizyon"].notna()),
+    )
+    out = r.groupby(["metrik", "kullanici_adi", "kategori"], sort=False).agg(
+        tahmin_sayisi=("deger", "size"),
+        revizyon_sayisi=("revizyon", "count"),
+        ort_mutlak_revizyon=("mutlak", "mean"),
+        ort_revizyon=("revizyon", "mean"),
+        yukari_orani=("yukari", "mean"),
+        ort_gun_arasi=("gun_arasi", "mean"),
+    )
+    return out.reset_index()
+
+
+def _revision_momentum(rev: pd.DataFrame) -> pd.DataFrame:
+    """
+    Piyasa geneli aylık revizyon momentumu. Yayılma endeksi:
+    (yukarı − aşağı) / toplam revizyon × 100. Aylar her metrik için kesintisiz
+    takvim aralığına açılır; revizyonsuz ay 0 sayım / NaN ortalama olarak kalır,
+    böylece 3 aylık pencere boşlukların üzerinden atlamaz.
+    """
+    cols = [
+        "metrik", "ay", "revizyon_sayisi", "ort_revizyon", "medyan_revizyon",
+        "yayilma_endeksi", "momentum_3a",
+    ]
+    r = rev.dropna(subset=["revizyon"]) if not rev.empty else rev
+    if r.empty:
+        return pd.DataFrame(columns=cols)
+    sign = np.sign(r["revizyon"])
+    tarih = r["tahmin_tarihi"]
+    if tarih.dt.tz is not None:
+        tarih = tarih.dt.tz_localize(None)
+    r = r.assign(ay=tarih.dt.to_period("M"), yon=sign)
+    agg = r.groupby(["metrik", "ay"]).agg(
+        revizyon_sayisi=("revizyon", "size"),
+        ort_revizyon=("revizyon", "mean"),
+        medyan_revizyon=("revizyon", "median"),
+        yayilma_endeksi=("yon", "mean"),
+    )
+    parts = []
+    for metrik, g in agg.groupby(level="metrik"):
+        g = g.droplevel("metrik")
+        g = g.reindex(pd.period_range(g.index.min(), g.index.max(), freq="M"))
+        g["revizyon_sayisi"] = g["revizyon_sayisi"].fillna(0).astype(int)
+        g["momentum_3a"] = g["ort_revizyon"].rolling(3, min_periods=1).mean()
+        parts.append(g.rename_axis("ay").reset_index().assign(metrik=metrik))
+    out = pd.concat(parts, ignore_index=True)
+    out["ay"] = out["ay"].dt.strftime("%Y-%m")
+    out["yayilma_endeksi"] = out["yayilma_endeksi"] * 100
+    return out[cols]
+
+
+@st.cache_data(ttl=600, max_entries=4)
+@perf_timed()
+def compute_revision_analytics(
+    version: int,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Tüm katılımcı ve hedefler için tek geçişte revizyon analitiği.
+    Dönüş: (revizyon satırları, katılımcı özeti, aylık momentum).
+    """
+    df = get_forecasts_view(version)
+    if df is None or df.empty:
+        empty = pd.DataFrame()
+        return empty, empty, empty
+    rev = _revision_frame(df)
+    return rev, _revision_summary(rev), _revision_momentum(rev)
+
+
+@st.cache_data(ttl=600, max_entries=32)
+@perf_timed()
+def compute_revision_momentum(
+    version: int, metric: str, kategoriler: Tuple[str, ...],
+) -> pd.DataFrame:
+    """
+    Seçili kategorilerdeki katılımcılarla sınırlı aylık momentum. Ortalama ve
+    medyanlar kategori bazında birleştirilemediği için satırlar önce süzülür.
+    """
+    rev, _, _ = compute_revision_analytics(version)
+    if rev.empty:
+        return _revision_momentum(rev)
+    return _revision_momentum(
+        rev[(rev["metrik"] == metric) & rev["kategori"].isin(kategoriler)]
+    )
+
+
+# ---------------------------------------------------------------------------
+# Analitik — Konsensüs birleştirici
+# ---------------------------------------------------------------------------
+KONSENSUS_YONTEMLERI = ["Eşit Ağırlık", "Ters-MSE", "Budanmış Ort.", "Kategori Ağırlıklı"]
+KONSENSUS_TRIM = 0.10          # budanmış ortalamada her uçtan atılan oran
+KONSENSUS_MSE_PENCERE = 12     # ters-MSE için geriye dönük hedef ay sayısı
+KONSENSUS_MIN_HATA = 3         # ağırlık için gereken en az gerçekleşmiş hedef
+
+# Tahmin kolonu → fetch_market_data_adapter kolonu
+GERCEKLESEN_KOLONLARI = {
+    "tahmin_ppk_faiz": "PPK Faizi",
+    "tahmin_aylik_enf": "Aylık TÜFE",
+    "tahmin_yilsonu_enf": "Yıllık TÜFE",
+}
+# Hedef yılının sonunu tahmin eden metrikler: her hedef ayındaki tahmin o
+# yılın Aralık gerçekleşmesiyle ölçülür (2025-03 satırı → 2025-12 yıllık TÜFE)
+YIL_SONU_METRIKLERI = {"tahmin_yilsonu_enf"}
+
+
+def _olcum_donemi(hedef: pd.Series, metric: str) -> pd.Series:
+    """Tahminin karşılaştırıldığı gerçekleşme dönemi (YYYY-MM)."""
+    if metric in YIL_SONU_METRIKLERI:
+        return hedef.str[:4] + "-12"
+    return hedef
+
+
+def realized_for_targets(
+    realized_df: Optional[pd.DataFrame], metric: str, hedef: pd.Series
+) -> pd.Series:
+    """`hedef` dönemlerine hizalı gerçekleşen değerler; bilinmeyenler NaN."""
+    real_col = GERCEKLESEN_KOLONLARI.get(metric)
+    if real_col is None or realized_df is None or real_col not in realized_df.columns:
+        return pd.Series(np.nan, index=hedef.index)
+    real = realized_df.dropna(subset=[real_col]).set_index("Donem")[real_col]
+    return _olcum_donemi(hedef, metric).map(real)
+
+_KEYS = ["ay", "hedef_donemi"]
+
+
+def _expectation_cube(df: pd.DataFrame, metric: str) -> pd.DataFrame:
+    """
+    (kullanıcı, hedef) × as-of ay küpü: her hücre o ayın sonunda geçerli olan
+    en son tahmin (get_latest_as_of ile aynı mantık, tüm aylar için birden).
+    """
+    d = df.dropna(subset=[metric, "tahmin_tarihi"])
+    if d.empty:
+        return pd.DataFrame()
+    d = d.assign(ay=d["tahmin_tarihi"].dt.to_period("M"))
+    d = d.sort_values("tahmin_tarihi").drop_duplicates(
+        subset=["kullanici_adi", "hedef_donemi", "ay"], keep="last"
+    )
+    cube = d.pivot(index=["kullanici_adi", "hedef_donemi"], columns="ay", values=metric)
+    months = pd.period_range(cube.columns.min(), cube.columns.max(), freq="M")
+    cube = cube.reindex(columns=months).ffill(axis=1)
+    cube.columns = pd.Index(months.strftime("%Y-%m"), name="ay")
+    return cube
+
+
+def _trailing_mse(
+    long: pd.DataFrame, months: pd.Index, realized_df: Optional[pd.DataFrame], metric: str,
+) -> pd.DataFrame:
+    """
+    Kullanıcı × as-of ay: o aydan önce bilinen son KONSENSUS_MSE_PENCERE aydaki
+    karesel hataların ortalaması. Hata, hedef ayı sonundaki tahminle ölçülür ve
+    gerçekleşmenin dönemine (yıl sonu metriklerinde Aralık) yazılır.
+    """
+    fin = long[long["ay"] == long["hedef_donemi"]]
+    fin = fin.assign(
+        olcum=_olcum_donemi(fin["hedef_donemi"], metric),
+        hata2=(fin["deger"] - realized_for_targets(realized_df, metric, fin["hedef_donemi"])) ** 2,
+    )
+    fin = fin.dropna(subset=["hata2"])
+    if fin.empty:
+        return pd.DataFrame()
+
+    g = fin.groupby(["kullanici_adi", "olcum"])["hata2"]
+    sq_sum = g.sum().unstack().reindex(columns=months).fillna(0.0)
+    sq_n = g.size().unstack().reindex(columns=months).fillna(0)
+    total = sq_sum.T.rolling(KONSENSUS_MSE_PENCERE, min_periods=1).sum().T
+    count = sq_n.T.rolling(KONSENSUS_MSE_PENCERE, min_periods=1).sum().T
+    mse = (total / count).where(count >= KONSENSUS_MIN_HATA)
+    # As-of ayında yalnızca bir önceki aya kadarki gerçekleşmeler bilinir
+    mse = mse.shift(1, axis=1)
+    mse.columns = pd.Index(months, name="ay")
+    return mse
+
+
+@st.cache_data(ttl=600, max_entries=16)
+@perf_timed()
+def compute_consensus(version: int, market_key: Optional[tuple], metric: str) -> pd.DataFrame:
+    """
+    Her (as-of ay, hedef dönem) için alternatif konsensüs değerleri:
+    Piyasa Medyanı + KONSENSUS_YONTEMLERI + N. Uzun tablo döner.
+    `market_key` market_data_key() sonucudur (Ters-MSE ağırlıkları için).
+    """
+    return _consensus_frame(get_forecasts_view(version), _market_frame(market_key), metric)
+
+
+def _consensus_frame(
+    df: pd.DataFrame, realized_df: Optional[pd.DataFrame], metric: str
+) -> pd.DataFrame:
+    cols = ["ay", "hedef_donemi", "Piyasa Medyanı", *KONSENSUS_YONTEMLERI, "N"]
+    if df is None or df.empty or metric not in df.columns:
+        return pd.DataFrame(columns=cols)
+
+    cube = _expectation_cube(df, metric)
+    if cube.empty:
+        return pd.DataFrame(columns=cols)
+
+    long = (
+        cube.reset_index()
+        .melt(id_vars=["kullanici_adi", "hedef_donemi"], var_name="ay", value_name="deger")
+        .dropna(subset=["deger"])
+    )
+    g = long.groupby(_KEYS)["deger"]
+    out = pd.DataFrame({
+        "Piyasa Medyanı": g.median(),
+        "Eşit Ağırlık": g.mean(),
+        "N": g.size(),
+    })
+
+    # Budanmış ortalama: grup içi sıraya göre iki uçtan KONSENSUS_TRIM
+    n = g.transform("size")
+    rank = g.rank(method="first")
+    k = np.floor(n * KONSENSUS_TRIM)
+    out["Budanmış Ort."] = long[(rank > k) & (rank <= n - k)].groupby(_KEYS)["deger"].mean()
+
+    # Kategori ağırlıklı: önce kategori ortalamaları, sonra eşit ağırlık
+    kat_map = (
+        df.sort_values("tahmin_tarihi")
+        .drop_duplicates(subset=["kullanici_adi"], keep="last")
+        .set_index("kullanici_adi")["kategori"]
+    )
+    long["kategori"] = long["kullanici_adi"].map(kat_map)
+    out["Kategori Ağırlıklı"] = (
+        long.groupby(_KEYS + ["kategori"])["deger"].mean().groupby(level=[0, 1]).mean()
+    )
+
+    # Ters-MSE: geçmişi olmayan katılımcıya grubun medyan ağırlığı verilir
+    mse = pd.DataFrame()
+    if metric in GERCEKLESEN_KOLONLARI and realized_df is not None and not realized_df.empty:
+        mse = _trailing_mse(long, cube.columns, realized_df, metric)
+    if not mse.empty:
+        mse_long = mse.reset_index().melt(
+            id_vars="kullanici_adi", var_name="ay", value_name="mse"
+        )
+        long = long.merge(mse_long, on=["kullanici_adi", "ay"], how="left")
+        w = 1.0 / long["mse"].clip(lower=1e-4)
+    else:
+        w = pd.Series(np.nan, index=long.index)
+    w = w.fillna(w.groupby([long["ay"], long["hedef_donemi"]]).transform("median")).fillna(1.0)
+    wv = (w * long["deger"]).groupby([long["ay"], long["hedef_donemi"]]).sum()
+    out["Ters-MSE"] = wv / w.groupby([long["ay"], long["hedef_donemi"]]).sum()
+
+    return out.reset_index()[cols]
+
+
+# ---------------------------------------------------------------------------
+# Grafik yardımcıları — WebGL ve seyreltme
+# ---------------------------------------------------------------------------
+WEBGL_POINT_THRESHOLD = 2000   # figürdeki toplam nokta bunu aşarsa Scattergl
+MAX_POINTS_PER_TRACE = 400     # daha uzun seriler yerel uç değerler korunarak seyreltilir
+
+
+def downsample_minmax(x, y, max_points: int = MAX_POINTS_PER_TRACE):
+    """
+    Seriyi eşit kovalara böler; her kovanın ilk/son noktası ile min/max'ı
+    tutulur. Tepe ve dipler kaybolmaz, nokta sayısı ≤ max_points kalır.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max_points or max_points < 4:
+        return x, y
+
+    n_buckets = max_points // 4
+    bucket = (np.arange(n) * n_buckets) // n
+    starts = np.searchsorted(bucket, np.arange(n_buckets))
+    ends = np.r_[starts[1:], n] - 1
+    # Kova içinde değere göre sıralama; her kovanın ilk elemanı min (ya da max)
+    lo = np.lexsort((np.where(np.isnan(y), np.inf, y), bucket))
+    hi = np.lexsort((np.where(np.isnan(y), np.inf, -y), bucket))
+    keep = np.unique(np.concatenate([starts, ends, lo[starts], hi[starts]]))
+    return x[keep], y[keep]
+
+
+def fast_trace(x, y, n_total: Optional[int] = None, max_points: int = MAX_POINTS_PER_TRACE, **kwargs):
+    """
+    Tek seri için Scatter/Scattergl izi. `n_total` figürdeki toplam nokta
+    sayısıdır (verilmezse bu serinin uzunluğu); eşiği aşınca WebGL'e geçilir.
+    """
+    n_total = len(y) if n_total is None else n_total
+    cls = go.Scattergl if n_total > WEBGL_POINT_THRESHOLD else go.Scatter
+    x, y = downsample_minmax(x, y, max_points)
+    return cls(x=x, y=y, **kwargs)
+
+
+def build_group_traces(
+    df: pd.DataFrame, group_col: str, x_col: str, y_col: str,
+    groups: Optional[list] = None, max_points: int = MAX_POINTS_PER_TRACE, **kwargs,
+) -> list:
+    """
+    Her grup (ör. katılımcı) için bir iz — tek groupby geçişiyle. İzler
+    `groups` sırasında döner; toplam nokta eşiği aşarsa hepsi Scattergl olur.
+    """
+    if df is None or df.empty or y_col not in df.columns:
+        return []
+    d = df[[group_col, x_col, y_col]].dropna(subset=[y_col])
+    if groups:
+        d = d[d[group_col].isin(groups)]
+    d = d.sort_values([group_col, x_col], kind="mergesort")
+
+    n_total = len(d)
+    traces = {
+        name: fast_trace(
+            g[x_col].to_numpy(), g[y_col].to_numpy(),
+            n_total=n_total, max_points=max_points, name=str(name), **kwargs,
+        )
+        for name, g in d.groupby(group_col, sort=False)
+    }
+    order = groups or list(traces)
+    return [traces[g] for g in order if g in traces]
+
+
+# ---------------------------------------------------------------------------
+# Arka plan yenileme — cache'ler kullanıcı isteğinden önce tazelenir
+# ---------------------------------------------------------------------------
+# Süreç başına tek thread. Sunucu açılışında (ilk script çalıştırması) tüm
+# işler hemen çalışır, sonra her biri kendi aralığında; aralıklar TTL'den
+# (600 sn) kısa olduğundan kullanıcı süresi dolmuş girdiye denk gelmez.
+# Aynı iş süreç içinde thread kilidi, süreçler arasında flock ile tek
+# seferde çalışır; kilidi bekleyen süreç diğerinin az önce yazdığı anlık
+# görüntüyü kaynağa gitmeden yükler. secrets.toml'da ayarlanabilir:
+#
+#     [refresh]
+#     etkin = true
+#     tahmin = 300      # sn, 0 → kapalı
+#     katilimci = 300
+#     piyasa = 300
+REFRESH_ARALIKLARI = {"tahmin": 300, "katilimci": 300, "piyasa": 300}
+REFRESH_TICK_S = 5.0
+PIYASA_SAYFA_BASLANGIC = date(2023, 1, 1)
+
+
+def dashboard_market_range() -> Tuple[date, date]:
+    """Dashboard'un gerçekleşme verisi aralığı: son 3 yılın başından bugüne."""
+    today = date.today()
+    return date(today.year - 3, 1, 1), today
+
+
+def _refresh_config() -> dict:
+    try:
+        conf = dict(st.secrets.get("refresh", {}))
+    except Exception:
+        conf = {}
+    intervals = {job: float(conf.get(job, sec)) for job, sec in REFRESH_ARALIKLARI.items()}
+    return {"etkin": bool(conf.get("etkin", True)), "araliklar": intervals}
+
+
+def _refresh_tahmin(max_age: float) -> None:
+    get_all_forecasts.refresh(max_age=max_age)
+    version = get_data_version()
+    # Dashboard taban görünümleri de sıcak kalsın (yalnızca pandas). Periyodik
+    # turda taban yenilendiği için görünümler de yeniden kurulur; sürüm
+    # değişiminde yalnızca eksik olanlar
+    view_age = max_age if math.isinf(max_age) else 0.0
+    get_forecasts_view.refresh(version, max_age=view_age)
+    get_latest_view.refresh(version, None, max_age=view_age)
+
+
+def _refresh_katilimci(max_age: float) -> None:
+    get_participants.refresh(max_age=max_age)
+
+
+def _refresh_piyasa(max_age: float) -> None:
+    today = date.today()
+    ranges = {dashboard_market_range(), (PIYASA_SAYFA_BASLANGIC, today)}
+    # Kullanıcıların açtığı diğer aralıklar da (bugüne kadar olanlar) yenilenir
+    for args in frame_cache_args("fetch_market_data_adapter"):
+        if args["end_date"] == today:
+            ranges.add((args["start_date"], args["end_date"]))
+    for start, end in sorted(ranges):
+        fetch_market_data_adapter.refresh(start, end, max_age=max_age)
+
+
+_REFRESH_ISLERI = {
+    "tahmin": _refresh_tahmin,
+    "katilimci": _refresh_katilimci,
+    "piyasa": _refresh_piyasa,
+}
+
+
+@contextmanager
+def _refresh_job_lock(job: str, lock: threading.Lock):
+    with lock:
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+        try:
+            os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+            fh = open(os.path.join(SNAPSHOT_DIR, f"refresh_{job}.lock"), "a")
+        except OSError:
+            yield
+            return
+        with fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+class _RefreshScheduler(threading.Thread):
+    def __init__(self, intervals: dict):
+        super().__init__(name="arka-plan-yenileme", daemon=True)
+        self.intervals = {job: sec for job, sec in intervals.items() if sec > 0}
+        self.locks = {job: threading.Lock() for job in self.intervals}
+        self.durum = {
+            job: {"son": None, "sure_ms": None, "hata": None, "calisma": 0, "sonraki": 0.0}
+            for job in self.intervals
+        }
+        self.wake = threading.Event()
+        self._version = None
+        self._force = False
+
+    def run(self) -> None:
+        while True:
+            version = get_data_version()
+            changed = self._version is not None and version != self._version
+            self._version = version
+            force, self._force = self._force, False
+            for job in self.intervals:
+                due = time.monotonic() >= self.durum[job]["sonraki"]
+                if due:
+                    self.run_job(job, force=force)
+                elif changed and job != "piyasa":
+                    # Yazma sonrası: değişiklik kanalının taşımadığı / birleştiremediği
+                    # girdiler hemen ısıtılır, kurulmuş olanlara dokunulmaz
+                    self.run_job(job, max_age=math.inf)
+            self.wake.wait(REFRESH_TICK_S)
+            self.wake.clear()
+
+    def run_job(self, job: str, force: bool = False, max_age: Optional[float] = None) -> None:
+        rec = self.durum[job]
+        with _refresh_job_lock(job, self.locks[job]):
+            # Başka süreç aralığın yarısı içinde yenilediyse (ya da kilit
+            # beklenirken yeniledi) onun anlık görüntüsü kullanılır
+            if max_age is None:
+                max_age = 0.0 if force else self.intervals[job] / 2
+            t0 = time.perf_counter()
+            try:
+                with perf_span(f"yenile.{job}", "ağ"):
+                    _REFRESH_ISLERI[job](max_age)
+                rec["hata"] = None
+            except Exception as e:
+                rec["hata"] = str(e)
+            rec["sure_ms"] = (time.perf_counter() - t0) * 1000
+            rec["son"] = datetime.now()
+            rec["calisma"] += 1
+            rec["sonraki"] = time.monotonic() + self.intervals[job]
+
+    def trigger(self) -> None:
+        """Tüm işleri bir sonraki turda kaynaktan (anlık görüntüye bakmadan) yeniler."""
+        self._force = True
+        for rec in self.durum.values():
+            rec["sonraki"] = 0.0
+        self.wake.set()
+
+
+@st.cache_resource
+def _refresh_scheduler() -> Optional[_RefreshScheduler]:
+    conf = _refresh_config()
+    if not conf["etkin"]:
+        return None
+    sched = _RefreshScheduler(conf["araliklar"])
+    sched.start()
+    return sched
+
+
+def start_background_refresh() -> None:
+    """Her sayfanın başında çağrılır; thread'ler süreçte yalnızca bir kez başlar."""
+    _refresh_scheduler()
+    _change_listener()
+
+
+def refresh_now() -> bool:
+    sched = _refresh_scheduler()
+    if sched is None:
+        return False
+    sched.trigger()
+    return True
+
+
+def refresh_status() -> pd.DataFrame:
+    """Sistem Yönetimi için iş başına son çalışma, süre ve hata."""
+    sched = _refresh_scheduler()
+    if sched is None:
+        return pd.DataFrame()
+    now = time.monotonic()
+    return pd.DataFrame([
+        {
+            "İş": job,
+            "Aralık (sn)": sched.intervals[job],
+            "Son çalışma": rec["son"].strftime("%H:%M:%S") if rec["son"] else "—",
+            "Süre (ms)": rec["sure_ms"],
+            "Sonraki (sn)": max(rec["sonraki"] - now, 0.0) if rec["son"] else 0.0,
+            "Çalışma": rec["calisma"],
+            "Hata": rec["hata"] or "",
+        }
+        for job, rec in sched.durum.items()
+    ])
+
+
+# ---------------------------------------------------------------------------
+# Grafik cache'i — girdi parmak izi → go.Figure
+# ---------------------------------------------------------------------------
+# st.plotly_chart sözlük alırsa go.Figure(**spec) ile yeniden doğrular;
+# go.Figure alırsa yalnızca to_dict() + JSON yapar. Bu yüzden figür nesnesi
+# saklanır. Nesne süreç genelinde paylaşıldığı için dışarı verilmez:
+# çizim plotly_chart_cached içinde yapılır.
+FIGURE_CACHE_MAX = 64
+
+
+@st.cache_resource
+def _figure_cache() -> dict:
+    return {"lock": threading.Lock(), "items": OrderedDict()}
+
+
+def fingerprint(*parts) -> str:
+    """DataFrame/Series içerik hash'i + diğer parametrelerin repr'i."""
+    h = hashlib.sha1()
+    for p in parts:
+        if isinstance(p, pd.DataFrame):
+            h.update(repr(list(p.columns)).encode())
+            h.update(pd.util.hash_pandas_object(p, index=True).to_numpy().tobytes())
+        elif isinstance(p, pd.Series):
+            h.update(pd.util.hash_pandas_object(p, index=True).to_numpy().tobytes())
+        else:
+            h.update(repr(p).encode())
+        h.update(b"|")
+    return h.hexdigest()
+
+
+def _cached_figure(builder: Callable[[], go.Figure], *key_parts) -> go.Figure:
+    """`builder()` sonucunu girdilerin parmak izine göre saklar (LRU, FIGURE_CACHE_MAX)."""
+    key = fingerprint(*key_parts)
+    cache = _figure_cache()
+    with cache["lock"]:
+        fig = cache["items"].get(key)
+        if fig is not None:
+            cache["items"].move_to_end(key)
+            return fig
+
+    with perf_span(f"grafik.{key_parts[0] if key_parts else 'figur'}", "grafik"):
+        fig = builder()
+    with cache["lock"]:
+        cache["items"][key] = fig
+        while len(cache["items"]) > FIGURE_CACHE_MAX:
+            cache["items"].popitem(last=False)
+    return fig
+
+
+def plotly_chart_cached(builder: Callable[[], go.Figure], *key_parts, **chart_kwargs) -> None:
+    """
+    Figürü cache'ten (ıskalamada `builder()` ile) alıp `st.plotly_chart`
+    ile çizer. İsabette izler kurulmaz ve Plotly doğrulaması atlanır;
+    Streamlit'in to_dict() + JSON serileştirmesi her çizimde yine çalışır
+    (ölçüm: benchmarks/bench_utils.py `figur_*`). `key_parts[0]` span adıdır.
+    """
+    fig = _cached_figure(builder, *key_parts)
+    with perf_span(f"render.{key_parts[0] if key_parts else 'figur'}", "grafik"):
+        st.plotly_chart(fig, **chart_kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Rapor paketi — arka planda üretilen çok sayfalı Excel + grafik görselleri
+# ---------------------------------------------------------------------------
+REPORT_CACHE_MAX = 4
+_METRIK_ETIKET = {v: k for k, v in TAHMIN_METRIKLERI.items()}
+
+
+def compute_leaderboards(df_latest: pd.DataFrame, realized_df: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Gerçekleşmesi bilinen tüm dönemler için liderlik tablosu, tek birleştirmede.
+    Dashboard kartlarıyla aynı kural: her katılımcının o döneme son tahmini.
+    Yıl sonu metrikleri hedef yılının Aralık gerçekleşmesiyle ölçülür.
+    """
+    cols = ["hedef_donemi", "metrik", "sira", "gorunen_isim", "kategori",
+            "tahmin", "gerceklesen", "sapma"]
+    if df_latest is None or df_latest.empty or realized_df is None or realized_df.empty:
+        return pd.DataFrame(columns=cols)
+
+    frames = []
+    for metric in GERCEKLESEN_KOLONLARI:
+        if metric not in df_latest.columns:
+            continue
+        d = df_latest[["hedef_donemi", "gorunen_isim", "kategori", metric]].dropna(subset=[metric])
+        d = d.assign(gerceklesen=realized_for_targets(realized_df, metric, d["hedef_donemi"]))
+        d = d.dropna(subset=["gerceklesen"])
+        if d.empty:
+            continue
+        d = d.rename(columns={metric: "tahmin"}).assign(metrik=_METRIK_ETIKET.get(metric, metric))
+        d["sapma"] = (d["tahmin"] - d["gerceklesen"]).abs()
+        d["sira"] = d.groupby("hedef_donemi")["sapma"].rank(method="min").astype(int)
+        frames.append(d)
+    if not frames:
+        return pd.DataFrame(columns=cols)
+    out = pd.concat(frames, ignore_index=True)
+    return out.sort_values(["hedef_donemi", "metrik", "sira"], ascending=[False, True, True])[cols]
+
+
+def build_report_tables(version: int, market_key: Optional[tuple]) -> dict:
+    """Rapor sayfaları (ad → DataFrame); hepsi cache'li analitik tablolardan."""
+    df_latest = get_latest_view(version)
+    realized_df = _market_frame(market_key)
+    rev, rev_summary, momentum = compute_revision_analytics(version)
+
+    tables = {"Liderlik": compute_leaderboards(df_latest, realized_df)}
+    for label, metric in TAHMIN_METRIKLERI.items():
+        pivot = build_heatmap_matrix(version, None, metric, tuple(KATEGORILER))
+        if not pivot.empty:
+            pivot.columns = [str(c) for c in pivot.columns]
+            tables[f"Isı - {label}"[:31]] = pivot.rename_axis("Katılımcı").reset_index()
+    for metric in GERCEKLESEN_KOLONLARI:
+        cons = compute_consensus(version, market_key, metric)
+        if not cons.empty:
+            tables[f"Konsensüs - {_METRIK_ETIKET.get(metric, metric)}"[:31]] = cons
+    if not rev_summary.empty:
+        tables["Revizyon Özeti"] = rev_summary.assign(
+            metrik=rev_summary["metrik"].map(_METRIK_ETIKET).fillna(rev_summary["metrik"])
+        )
+    if not momentum.empty:
+        tables["Revizyon Momentumu"] = momentum.assign(
+            metrik=momentum["metrik"].map(_METRIK_ETIKET).fillna(momentum["metrik"])
+        )
+    return tables
+
+
+def _report_charts(tables: dict, realized_df: Optional[pd.DataFrame]) -> dict:
+    """Konsensüs patikaları, ısı haritaları ve revizyon momentumu için PNG'ler (ad → bytes)."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    def png(fig) -> bytes:
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", dpi=110, bbox_inches="tight")
+        plt.close(fig)
+        return buf.getvalue()
+
+    charts = {}
+    for metric in GERCEKLESEN_KOLONLARI:
+        label = _METRIK_ETIKET.get(metric, metric)
+        cons = tables.get(f"Konsensüs - {label}"[:31])
+        if cons is None or cons.empty:
+            continue
+        # En son as-of ayındaki konsensüs patikası
+        last = cons[cons["ay"] == cons["ay"].max()].sort_values("hedef_donemi")
+        fig, ax = plt.subplots(figsize=(10, 4))
+        ax.plot(last["hedef_donemi"], last["Piyasa Medyanı"], marker="o", lw=2.5, label="Piyasa Medyanı")
+        for method in KONSENSUS_YONTEMLERI:
+            ax.plot(last["hedef_donemi"], last[method], ls="--", lw=1.5, label=method)
+        real = realized_for_targets(realized_df, metric, last["hedef_donemi"])
+        if real.notna().any():
+            ax.plot(last["hedef_donemi"], real, "x:", color="#EF4444", ms=9, label="Gerçekleşen")
+        ax.set_title(f"{label} — konsensüs patikası ({last['ay'].iloc[0]})")
+        ax.tick_params(axis="x", rotation=45)
+        ax.grid(alpha=0.2)
+        ax.legend(fontsize=8, ncol=3)
+        charts[f"konsensus_{metric}"] = png(fig)
+
+    for label, metric in TAHMIN_METRIKLERI.items():
+        name = f"Isı - {label}"[:31]
+        if name not in tables:
+            continue
+        z = tables[name].set_index("Katılımcı")
+        fig, ax = plt.subplots(figsize=(max(6, 0.45 * z.shape[1]), max(3, 0.25 * z.shape[0])))
+        im = ax.imshow(z.to_numpy(dtype=float), aspect="auto", cmap="RdYlGn_r")
+        ax.set_xticks(range(z.shape[1]), z.columns, rotation=90, fontsize=7)
+        ax.set_yticks(range(z.shape[0]), z.index, fontsize=7)
+        ax.set_title(name)
+        fig.colorbar(im, ax=ax, shrink=0.8)
+        charts[f"isi_{metric}"] = png(fig)
+
+    momentum = tables.get("Revizyon Momentumu")
+    if momentum is not None and not momentum.empty:
+        fig, ax = plt.subplots(figsize=(10, 4))
+        for label, g in momentum.groupby("metrik"):
+            ax.plot(g["ay"], g["momentum_3a"], marker=".", label=label)
+        ax.axhline(0, color="#94A3B8", lw=0.8)
+        ax.set_title("Revizyon momentumu (3 aylık ort.)")
+        ax.tick_params(axis="x", rotation=45)
+        ax.grid(alpha=0.2)
+        ax.legend(fontsize=8)
+        charts["revizyon_momentumu"] = png(fig)
+    return charts
+
+
+def build_report(version: int, market_key: Optional[tuple], path_prefix: str) -> dict:
+    """
+    Rapor paketini diske yazar: `<prefix>.xlsx` (tablolar + "Grafikler" sayfası)
+    ve `<prefix>.zip` (aynı çalışma kitabı + PNG'ler).
+    """
+    import zipfile
+
+    tables = build_report_tables(version, market_key)
+    charts = _report_charts(tables, _market_frame(market_key))
+
+    xlsx_path, zip_path = f"{path_prefix}.xlsx", f"{path_prefix}.zip"
+    with pd.ExcelWriter(xlsx_path, engine="xlsxwriter") as writer:
+        for name, tbl in tables.items():
+            tbl.to_excel(writer, sheet_name=name, index=False)
+            writer.sheets[name].freeze_panes(1, 0)
+        if charts:
+            ws = writer.book.add_worksheet("Grafikler")
+            row = 0
+            for name, data in charts.items():
+                ws.insert_image(row, 0, f"{name}.png", {"image_data": io.BytesIO(data)})
+                row += 32
+
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.write(xlsx_path, "rapor.xlsx")
+        for name, data in charts.items():
+            zf.writestr(f"grafikler/{name}.png", data)
+
+    return {
+        "xlsx": xlsx_path, "zip": zip_path, "version": version,
+        "sayfalar": list(tables), "grafik_sayisi": len(charts),
+        "olusturma": datetime.now().strftime("%Y-%m-%d %H:%M"),
+    }
+
+
+@st.cache_resource
+def _report_jobs() -> dict:
+    """Süreç genelinde tek işçi: aynı anda tek rapor, sonuçlar (anahtar → Future) LRU."""
+    return {
+        "lock": threading.Lock(),
+        "executor": ThreadPoolExecutor(max_workers=1, thread_name_prefix="rapor"),
+        "jobs": OrderedDict(),
+    }
+
+
+def _drop_report_files(fut) -> None:
+    if fut.done() and fut.exception() is None:
+        for p in (fut.result()["xlsx"], fut.result()["zip"]):
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+
+
+def submit_report(version: int, market_key: Optional[tuple]) -> str:
+    """
+    Raporu arka plan işçisine verir ve iş anahtarını döner; sayfa beklemez.
+    Aynı (veri sürümü, market_data_key) için hazır ya da süren iş yeniden kullanılır.
+    """
+    key = fingerprint("rapor", version, market_key)
+    jobs = _report_jobs()
+    with jobs["lock"]:
+        fut = jobs["jobs"].get(key)
+        if fut is not None and not (fut.done() and fut.exception() is not None):
+            jobs["jobs"].move_to_end(key)
+            return key
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        prefix = os.path.join(EXPORT_DIR, f"rapor_v{version}_{key[:10]}")
+        jobs["jobs"][key] = jobs["executor"].submit(build_report, version, market_key, prefix)
+        while len(jobs["jobs"]) > REPORT_CACHE_MAX:
+            _, old = jobs["jobs"].popitem(last=False)
+            _drop_report_files(old)
+    return key
+
+
+def report_status(key: Optional[str]) -> Tuple[str, Optional[dict | str]]:
+    """("yok" | "hazırlanıyor" | "hazır" | "hata", sonuç sözlüğü ya da hata mesajı)."""
+    if not key:
+        return "yok", None
+    jobs = _report_jobs()
+    with jobs["lock"]:
+        fut = jobs["jobs"].get(key)
+    if fut is None:
+        return "yok", None
+    if not fut.done():
+        return "hazırlanıyor", None
+    if fut.exception() is not None:
+        return "hata", str(fut.exception())
+    return "hazır", fut.result()
+
+
 # ---------------------------------------------------------------------------
 # DEMO VERİ ÜRETİCİ
 # ---------------------------------------------------------------------------
@@ -499,14 +3462,245 @@ DEMO_KATILIMCILAR = [
 ]
 
 
-def _round_step(x: float, step: float = 0.25) -> float:
-    return round(round(x / step) * step, 2)
+DEMO_BIAS = {
+    "Goldman Sachs": -0.5, "HSBC": -0.3, "JP Morgan": -0.4,
+    "Haluk Bürümcekçi": 0.5, "Uğur Gürses": 0.3,
+}
+DEMO_UFUKLAR = (0, 1, 3)       # tahmin ayına göre hedef ay farkları (+ yıl sonu)
+SYNTH_CHUNK_MONTHS = 12        # akışlı üretimde bir parçadaki ay sayısı
+
+
+def _round_step(x, step: float = 0.25):
+    """Skaler ya da dizi: en yakın `step` katına yuvarlar."""
+    return np.round(np.round(np.asarray(x) / step) * step, 2)
+
+
+def _demo_participants(n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(isimler, kategoriler, sapmalar). İlk 16'sı sabit liste, fazlası sentetik."""
+    names = [p[0] for p in DEMO_KATILIMCILAR[:n]]
+    cats = [p[1] for p in DEMO_KATILIMCILAR[:n]]
+    pool = [c for _, c in DEMO_KATILIMCILAR]
+    for i in range(len(names), n):
+        names.append(f"Sentetik Katılımcı {i + 1:05d}")
+        cats.append(pool[i % len(pool)])
+    bias = [DEMO_BIAS.get(nm, 0.0) for nm in names]
+    return np.array(names, dtype=object), np.array(cats, dtype=object), np.array(bias)
+
+
+def iter_synthetic_forecasts(
+    n_participants: int = len(DEMO_KATILIMCILAR),
+    n_months: int = 12,
+    revizyon: int = 3,
+    ufuklar: tuple = DEMO_UFUKLAR,
+    yil_sonu: bool = True,
+    seed: int = 42,
+    end_month: Optional[str] = None,
+    chunk_months: int = SYNTH_CHUNK_MONTHS,
+):
+    """
+    Sentetik tahminleri ay blokları hâlinde DataFrame olarak üretir (NumPy,
+    döngüsüz). Her blok bellekte tek başına durur; milyonlarca satır Parquet'e
+    ya da veritabanına akıtılabilir.
+
+    - `revizyon`: bireysellerin bir ayda en fazla kaç tahmin verdiği
+      (2..revizyon arası); kurumsal ve anket katılımcıları ayda bir kez.
+    - `ufuklar`: tahmin ayından hedef aya uzaklıklar; `yil_sonu` o yılın
+      Aralık ayını da ekler.
+    - `end_month` (YYYY-MM) verilmezse son ay, içinde bulunulan aydan bir önceki ay.
+    Aynı parametre ve seed her zaman aynı satırları üretir.
+    """
+    rng = np.random.default_rng(seed)
+    names, cats, bias = _demo_participants(n_participants)
+    is_ind, is_survey = cats == "Bireysel", cats == "Anket"
+    kurumsal_gun = np.array([5, 10, 15, 20])
+
+    last = pd.Period(end_month, "M") if end_month else pd.Period(date.today(), "M") - 1
+    months = np.arange(last.ordinal - n_months + 1, last.ordinal + 1)
+
+    # Aylık taban değerler: dönem boyunca doğrusal düşüş + gürültü
+    t = np.arange(n_months) / max(1, n_months - 1)
+    base_ppk = 50 - 10 * t + rng.normal(0, 0.8, n_months)
+    base_aylik = 3.5 - 1.5 * t + rng.normal(0, 0.4, n_months)
+    base_ys_enf = 38 + rng.normal(0, 2, n_months)
+    base_ys_faiz = 32 + rng.normal(0, 1.5, n_months)
+
+    offsets = np.asarray(ufuklar, dtype=np.int64)
+    rev_max = max(1, int(revizyon))
+    rev_min = min(2, rev_max)
+
+    for m0 in range(0, n_months, max(1, chunk_months)):
+        mi = np.arange(m0, min(n_months, m0 + chunk_months))
+
+        # (katılımcı, ay) ızgarası
+        p_idx = np.tile(np.arange(n_participants), len(mi))
+        m_idx = np.repeat(mi, n_participants)
+        n_pm = len(p_idx)
+
+        # Ay içindeki tahmin sayısı ve günleri: bireyseller k farklı gün (sıralı),
+        # anket ayın 15'i, kurumsal 5/10/15/20'den biri
+        k = np.where(is_ind[p_idx], rng.integers(rev_min, rev_max + 1, n_pm), 1)
+        days = rng.random((n_pm, 27)).argsort(axis=1)[:, :rev_max] + 1
+        other = ~is_ind[p_idx]
+        days[other, 0] = np.where(
+            is_survey[p_idx[other]], 15, rng.choice(kurumsal_gun, int(other.sum()))
+        )
+        keep = np.arange(rev_max)[None, :] < k[:, None]
+        days = np.where(keep, days, 99)
+        days.sort(axis=1)
+        row = np.repeat(np.arange(n_pm), k)
+        day = days[keep]
+
+        # Hedef dönemler: ufuklar (+ yıl sonu), aynı ay tekrarı atılır
+        m_ord = months[m_idx[row]]
+        tgt = m_ord[:, None] + offsets[None, :]
+        if yil_sonu:
+            year_end = (m_ord // 12) * 12 + 11
+            tgt = np.column_stack([tgt, year_end])
+        r2 = np.repeat(np.arange(len(row)), tgt.shape[1])
+        tgt = tgt.ravel()
+        uniq = pd.DataFrame({"r": r2, "t": tgt}).duplicated().to_numpy()
+        r2, tgt = r2[~uniq], tgt[~uniq]
+
+        src = row[r2]
+        p, mm = p_idx[src], m_idx[src]
+        n = len(r2)
+        ahead = tgt - months[mm]
+        noise_scale = 1.0 + 0.3 * np.abs(ahead)
+        b = bias[p]
+
+        ppk = _round_step(base_ppk[mm] + b + rng.normal(0, 1.0, n) * noise_scale)
+        aylik = np.round(np.maximum(0.1, base_aylik[mm] + rng.normal(0, 0.5, n) * noise_scale), 2)
+        ys_enf = np.round(base_ys_enf[mm] + b * 2 + rng.normal(0, 2, n), 1)
+        ys_faiz = _round_step(base_ys_faiz[mm] + b + rng.normal(0, 1.5, n))
+
+        month_start = months[mm].astype("datetime64[M]").astype("datetime64[D]")
+        tarih = month_start + (day[r2] - 1).astype("timedelta64[D]")
+
+        out = pd.DataFrame({
+            "kullanici_adi": names[p],
+            "kategori": cats[p],
+            "anket_donemi": np.datetime_as_string(months[mm].astype("datetime64[M]")),
+            "hedef_donemi": np.datetime_as_string(tgt.astype("datetime64[M]")),
+            "tahmin_tarihi": tarih.astype("datetime64[ns]"),
+            "tahmin_ppk_faiz": ppk,
+            "tahmin_aylik_enf": aylik,
+            "tahmin_yilsonu_enf": ys_enf,
+            "tahmin_yilsonu_faiz": ys_faiz,
+        })
+
+        # Anket: min/max aralığı ve katılımcı sayısı; diğerlerinde boş
+        s = is_survey[p]
+        sp_ppk = np.abs(rng.normal(2, 0.5, n))
+        sp_enf = np.abs(rng.normal(3, 1, n))
+        sp_aylik = np.abs(rng.normal(0.8, 0.3, n))
+        ranges = {
+            "min_ppk_faiz": _round_step(ppk - sp_ppk),
+            "max_ppk_faiz": _round_step(ppk + sp_ppk),
+            "min_aylik_enf": np.round(np.maximum(0.1, aylik - sp_aylik), 2),
+            "max_aylik_enf": np.round(aylik + sp_aylik, 2),
+            "min_yilsonu_enf": np.round(ys_enf - sp_enf, 1),
+            "max_yilsonu_enf": np.round(ys_enf + sp_enf, 1),
+            "min_yilsonu_faiz": _round_step(ys_faiz - sp_ppk),
+            "max_yilsonu_faiz": _round_step(ys_faiz + sp_ppk),
+            "katilimci_sayisi": rng.integers(15, 30, n).astype(float),
+        }
+        for col, val in ranges.items():
+            out[col] = np.where(s, val, np.nan)
+
+        yield out
+
 
+def synthetic_forecasts(**kwargs) -> pd.DataFrame:
+    """iter_synthetic_forecasts'in tek DataFrame hâli (küçük hacimler için)."""
+    return pd.concat(list(iter_synthetic_forecasts(**kwargs)), ignore_index=True)
 
-def generate_demo_data(seed: int = 42) -> Tuple[int, int, str]:
-    """Son 12 ay için gerçekçi demo verisi üretir."""
-    rng = np.random.default_rng(seed)
-    random.seed(seed)
+
+def write_synthetic_parquet(path: str, **kwargs) -> int:
+    """Sentetik veriyi blok blok Parquet dosyasına yazar; satır sayısını döner."""
+    with open(path, "wb") as fh:
+        return _write_frames(iter_synthetic_forecasts(**kwargs), "parquet", fh)
+
+
+def _to_payloads(df: pd.DataFrame) -> list[dict]:
+    """DataFrame → Supabase insert kayıtları (tarih metin, NaN → None)."""
+    d = df.assign(tahmin_tarihi=df["tahmin_tarihi"].dt.strftime("%Y-%m-%d"))
+    d = d.astype(object).where(d.notna(), None)
+    if "katilimci_sayisi" in d.columns:
+        d["katilimci_sayisi"] = [None if v is None else int(v) for v in d["katilimci_sayisi"]]
+    return d.to_dict("records")
+
+
+def bulk_insert_tahmin(frames, batch: int = 500) -> Tuple[int, list]:
+    """
+    DataFrame akışını 500'lük gruplar hâlinde ekler. Grup başarısızsa satır
+    satır dener. Dönüş: (eklenen satır, hata mesajları). Sürüm en sonda bir kez artar.
+    """
+    sb = get_supabase()
+    added, errors = 0, []
+    try:
+        for frame in frames:
+            payloads = _to_payloads(frame)
+            for chunk in _chunks(payloads, batch):
+                try:
+                    sb.table(TABLE_TAHMIN).insert(chunk).execute()
+                    added += len(chunk)
+                except Exception as e:
+                    # Batch başarısızsa tek tek dene
+                    err_first = str(e)[:100]
+                    n_err = len(errors)
+                    for p in chunk:
+                        try:
+                            sb.table(TABLE_TAHMIN).insert(p).execute()
+                            added += 1
+                        except Exception as e2:
+                            errors.append(str(e2)[:100])
+                    if len(errors) == n_err:
+                        errors.append(f"batch hatası: {err_first}")
+    finally:
+        if added:
+            _publish_change(_degisiklik(TABLE_TAHMIN))
+    return added, errors
+
+
+def _bulk_insert_participants(rows: list, batch: int = 500) -> Tuple[int, list]:
+    """bulk_insert_tahmin'in katılımcı karşılığı: gruplar hâlinde ekler, sürüm bir kez artar."""
+    sb = get_supabase()
+    added, errors = 0, []
+    try:
+        for chunk in _chunks(rows, batch):
+            try:
+                sb.table(TABLE_KATILIMCI).insert(chunk).execute()
+                added += len(chunk)
+            except Exception as e:
+                err_first = str(e)[:100]
+                n_err = len(errors)
+                for r in chunk:
+                    try:
+                        sb.table(TABLE_KATILIMCI).insert(r).execute()
+                        added += 1
+                    except Exception as e2:
+                        errors.append(str(e2)[:100])
+                if len(errors) == n_err:
+                    errors.append(f"batch hatası: {err_first}")
+    finally:
+        if added:
+            _publish_change(_degisiklik(TABLE_KATILIMCI))
+    return added, errors
+
+
+def generate_demo_data(
+    seed: int = 42,
+    n_participants: int = len(DEMO_KATILIMCILAR),
+    n_months: int = 12,
+    revizyon: int = 3,
+    ufuklar: tuple = DEMO_UFUKLAR,
+) -> Tuple[int, int, str]:
+    """
+    Son `n_months` ay için `n_participants` katılımcılı demo verisi üretir ve
+    veritabanına yazar; eksik katılımcılar önce eklenir. `revizyon` ve
+    `ufuklar` iter_synthetic_forecasts'teki anlamıyla kullanılır.
+    """
+    names, cats, _ = _demo_participants(n_participants)
 
     existing = get_participants()
     existing_names = (
@@ -514,142 +3708,18 @@ def generate_demo_data(seed: int = 42) -> Tuple[int, int, str]:
         if not existing.empty else set()
     )
 
-    added_p = 0
-    for name, cat in DEMO_KATILIMCILAR:
-        if name.lower() in existing_names:
-            continue
-        ok, _ = add_participant(name, cat)
-        if ok:
-            added_p += 1
-
-    today = date.today()
-    months = []
-    for i in range(12, 0, -1):
-        d = today.replace(day=15) - timedelta(days=30 * i)
-        months.append(d.replace(day=15))
-
-    baselines = {}
-    for i, m in enumerate(months):
-        t = i / max(1, len(months) - 1)
-        baselines[m.strftime("%Y-%m")] = {
-            "ppk": 50 - 10 * t + rng.normal(0, 0.8),
-            "aylik_enf": 3.5 - 1.5 * t + rng.normal(0, 0.4),
-            "yillik_enf": 70 - 25 * t + rng.normal(0, 1.5),
-            "yilsonu_enf": 38 + rng.normal(0, 2),
-            "yilsonu_faiz": 32 + rng.normal(0, 1.5),
-        }
-
-    # Önce tüm payloadları hazırla, sonra batch halinde gönder
-    all_payloads = []
+    rows = [
+        {"ad_soyad": name, "kategori": cat}
+        for name, cat in zip(names, cats) if name.lower() not in existing_names
+    ]
+    added_p, errors_p = _bulk_insert_participants(rows)
 
-    for forecast_month in months:
-        month_key = forecast_month.strftime("%Y-%m")
-        base = baselines[month_key]
+    added_f, errors = bulk_insert_tahmin(iter_synthetic_forecasts(
+        n_participants=n_participants, n_months=n_months,
+        revizyon=revizyon, ufuklar=ufuklar, seed=seed,
+    ))
+    errors = errors_p + errors
 
-        target_periods = [
-            forecast_month.strftime("%Y-%m"),
-            (forecast_month + pd.DateOffset(months=1)).strftime("%Y-%m"),
-            (forecast_month + pd.DateOffset(months=3)).strftime("%Y-%m"),
-            f"{forecast_month.year}-12",
-        ]
-        target_periods = list(dict.fromkeys(target_periods))
-
-        for name, cat in DEMO_KATILIMCILAR:
-            bias = {
-                "Goldman Sachs": -0.5, "HSBC": -0.3, "JP Morgan": -0.4,
-                "Haluk Bürümcekçi": 0.5, "Uğur Gürses": 0.3,
-            }.get(name, 0.0)
-
-            if cat == "Bireysel":
-                n_updates = int(rng.integers(2, 4))
-                days = sorted(rng.choice(range(1, 28), size=n_updates, replace=False))
-                forecast_dates = [forecast_month.replace(day=int(d)) for d in days]
-            elif cat == "Anket":
-                forecast_dates = [forecast_month.replace(day=15)]
-            else:
-                forecast_dates = [forecast_month.replace(day=int(rng.choice([5, 10, 15, 20])))]
-
-            for fdate in forecast_dates:
-                for tp in target_periods:
-                    months_ahead = (
-                        pd.Timestamp(tp + "-01").to_period("M").ordinal
-                        - pd.Timestamp(month_key + "-01").to_period("M").ordinal
-                    )
-                    noise_scale = 1.0 + 0.3 * abs(months_ahead)
-
-                    ppk = _round_step(
-                        base["ppk"] + bias + rng.normal(0, 1.0) * noise_scale, 0.25
-                    )
-                    aylik = round(
-                        max(0.1, base["aylik_enf"] + rng.normal(0, 0.5) * noise_scale), 2
-                    )
-                    yilsonu_enf = round(
-                        base["yilsonu_enf"] + bias * 2 + rng.normal(0, 2), 1
-                    )
-                    yilsonu_faiz = _round_step(
-                        base["yilsonu_faiz"] + bias + rng.normal(0, 1.5), 0.25
-                    )
-
-                    payload = {
-                        "kullanici_adi": name,
-                        "kategori": cat,
-                        "anket_donemi": fdate.strftime("%Y-%m"),
-                        "hedef_donemi": tp,
-                        "tahmin_tarihi": fdate.strftime("%Y-%m-%d"),
-                        "tahmin_ppk_faiz": ppk,
-                        "tahmin_aylik_enf": aylik,
-                        "tahmin_yilsonu_enf": yilsonu_enf,
-                        "tahmin_yilsonu_faiz": yilsonu_faiz,
-                    }
-
-                    if cat == "Anket":
-                        spread_ppk = abs(rng.normal(2, 0.5))
-                        spread_enf = abs(rng.normal(3, 1))
-                        spread_aylik = abs(rng.normal(0.8, 0.3))
-                        payload.update({
-                            "min_ppk_faiz": _round_step(ppk - spread_ppk, 0.25),
-                            "max_ppk_faiz": _round_step(ppk + spread_ppk, 0.25),
-                            "min_aylik_enf": round(max(0.1, aylik - spread_aylik), 2),
-                            "max_aylik_enf": round(aylik + spread_aylik, 2),
-                            "min_yilsonu_enf": round(yilsonu_enf - spread_enf, 1),
-                            "max_yilsonu_enf": round(yilsonu_enf + spread_enf, 1),
-                            "min_yilsonu_faiz": _round_step(yilsonu_faiz - spread_ppk, 0.25),
-                            "max_yilsonu_faiz": _round_step(yilsonu_faiz + spread_ppk, 0.25),
-                            "katilimci_sayisi": int(rng.integers(15, 30)),
-                        })
-
-                    all_payloads.append(payload)
-
-    # Aynı (kullanici, hedef, tarih) varsa dedupe — sonuncuyu tut
-    seen = {}
-    for p in all_payloads:
-        k = (p["kullanici_adi"], p["hedef_donemi"], p["tahmin_tarihi"])
-        seen[k] = p
-    all_payloads = list(seen.values())
-
-    # Batch insert (Supabase 500'lük grup kabul ediyor)
-    sb = get_supabase()
-    added_f = 0
-    errors = []
-    BATCH = 500
-    for i in range(0, len(all_payloads), BATCH):
-        chunk = all_payloads[i:i + BATCH]
-        try:
-            sb.table(TABLE_TAHMIN).insert(chunk).execute()
-            added_f += len(chunk)
-        except Exception as e:
-            # Batch başarısızsa tek tek dene
-            err_first = str(e)[:100]
-            for p in chunk:
-                try:
-                    sb.table(TABLE_TAHMIN).insert(p).execute()
-                    added_f += 1
-                except Exception as e2:
-                    errors.append(str(e2)[:100])
-            if not errors:
-                errors.append(f"batch hatası: {err_first}")
-
-    get_all_forecasts.clear()
     msg = f"{added_p} katılımcı + {added_f} tahmin eklendi."
     if errors:
         msg += f" ({len(errors)} hata; örn: {errors[0]})"